@@ -1,10 +1,19 @@
+import json
 from datetime import datetime
-from typing import Optional
+from typing import AsyncIterator, Optional
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
-from app.services.report_service import get_report
-from app.domain.report_schema import ReportResponse
+from app.core.admission import Priority, priority_scope
+from app.core.config import settings
+from app.core.deadline import deadline_scope
+from app.core.http import upstream_clients
+from app.domain.sector_index import reload_sector_index
+from app.services.report_cache import report_cache
+from app.services.report_service import get_report, get_reports, stream_report
+from app.services.sector_percentiles import sector_percentiles
+from app.domain.report_schema import BatchReportResponse, ReportResponse
 
 router = APIRouter()
 
@@ -12,6 +21,28 @@ router = APIRouter()
 async def health_check():
     return {"status": "ok", "service": "gateway"}
 
+@router.get("/internal/metrics")
+async def metrics():
+    return {
+        "report_cache": report_cache.stats(),
+        "sector_percentiles": sector_percentiles.stats(),
+        "upstreams": {
+            client.name: {**client.stats.snapshot(), "admission": client.admission.snapshot()}
+            for client in upstream_clients
+        },
+    }
+
+@router.post("/internal/sector_index/reload")
+async def sector_index_reload():
+    try:
+        index = reload_sector_index()
+    except (OSError, KeyError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail=f"failed to load sector universe: {exc}")
+    # cached reports and return tables carry sectors from the old universe
+    report_cache.clear()
+    sector_percentiles.clear()
+    return {"tickers": len(index), "sectors": len(index.sectors)}
+
 @router.get("/report", response_model=ReportResponse)
 async def report(
     ticker: str = Query(..., description="Ticker symbol, e.g., TSM"),
@@ -19,4 +50,47 @@ async def report(
         None, description="ISO8601 datetime. If weekend/holiday, fallback to latest trading day"
     ),
 ):
-    return await get_report(ticker=ticker, as_of=as_of)
+    async def compute() -> ReportResponse:
+        # the budget starts when the report is computed, also for background cache refreshes
+        with deadline_scope(settings.REPORT_BUDGET_SECONDS):
+            return await get_report(ticker=ticker, as_of=as_of)
+
+    return await report_cache.get_or_compute(ticker, as_of, compute)
+
+
+@router.get("/report/stream")
+async def report_stream(
+    ticker: str = Query(..., description="Ticker symbol, e.g., TSM"),
+    as_of: Optional[datetime] = Query(
+        None, description="ISO8601 datetime. If weekend/holiday, fallback to latest trading day"
+    ),
+):
+    """Server-sent events: `price`, `peers` and `news` as each section is ready, then `report`."""
+
+    async def events() -> AsyncIterator[str]:
+        async for event, payload in stream_report(ticker, as_of, settings.REPORT_BUDGET_SECONDS):
+            yield f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/reports", response_model=BatchReportResponse)
+async def reports(
+    tickers: str = Query(..., description="Comma separated ticker symbols, e.g., TSM,AAPL"),
+    as_of: Optional[datetime] = Query(
+        None, description="ISO8601 datetime. If weekend/holiday, fallback to latest trading day"
+    ),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1),
+):
+    symbols = [t for t in tickers.split(",") if t.strip()]
+    if not symbols or len(symbols) > settings.REPORTS_MAX_TICKERS:
+        raise HTTPException(status_code=422, detail=f"tickers must be 1..{settings.REPORTS_MAX_TICKERS} symbols")
+    page_size = min(page_size, settings.REPORTS_MAX_PAGE_SIZE)
+    with deadline_scope(settings.REPORTS_BUDGET_SECONDS), priority_scope(Priority.BATCH):
+        return await get_reports(symbols, as_of=as_of, page=page, page_size=page_size)
+
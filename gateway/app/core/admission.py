@@ -0,0 +1,183 @@
+import asyncio
+import heapq
+import itertools
+import math
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from app.core.deadline import Deadline
+
+
+class Priority(IntEnum):
+    """Lower value is served first."""
+
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+class Overloaded(Exception):
+    """Shed before reaching the upstream; the client should retry after ``retry_after`` seconds."""
+
+    def __init__(self, upstream: str, retry_after: float) -> None:
+        super().__init__(f"{upstream} is overloaded")
+        self.upstream = upstream
+        self.retry_after = retry_after
+
+
+_priority: ContextVar[Priority] = ContextVar("priority", default=Priority.INTERACTIVE)
+
+
+def current_priority() -> Priority:
+    return _priority.get()
+
+
+@contextmanager
+def priority_scope(priority: Priority) -> Iterator[None]:
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class AdmissionController:
+    """Adaptive concurrency limit plus a priority wait queue for one upstream.
+
+    The limit follows AIMD on observed latency: while the limit is the
+    binding constraint, each healthy answer adds ``1 / limit`` (about +1 per
+    round trip); an error, a 5xx, or latency above ``tolerance`` times the
+    recent minimum multiplies it by ``backoff``. Requests over the limit wait
+    in a heap ordered by (priority, arrival). A request whose estimated wait
+    already exceeds its remaining deadline, or that finds ``max_queue`` live
+    waiters ahead of it, is shed immediately instead of timing out later.
+    Waiters that give up (deadline, disconnect) leave their heap entry
+    behind; the heap is compacted once those outnumber the live ones.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        initial_limit: int = 32,
+        min_limit: int = 4,
+        max_limit: int = 256,
+        backoff: float = 0.9,
+        tolerance: float = 2.0,
+        max_queue: int = 1000,
+    ) -> None:
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.max_queue = max_queue
+        self.inflight = 0
+        self._waiters: List[Tuple[int, int, "asyncio.Future[None]"]] = []
+        # live entries in _waiters, and abandoned ones not yet popped
+        self._waiting = 0
+        self._abandoned = 0
+        self._seq = itertools.count()
+        self._latencies: Deque[float] = deque(maxlen=256)
+        self._avg_latency: Optional[float] = None
+        self.admitted = 0
+        self.queued = 0
+        self.shed = 0
+
+    # -- capacity -------------------------------------------------------------
+    def _capacity(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    def _queued_ahead(self, priority: Priority) -> int:
+        return sum(1 for p, _, fut in self._waiters if p <= priority and not fut.done())
+
+    def estimated_wait(self, ahead: int) -> float:
+        """Seconds until a request with ``ahead`` waiters in front of it gets a slot."""
+        latency = self._avg_latency or 0.0
+        return math.ceil((ahead + 1) / self._capacity()) * latency
+
+    def _shed(self, retry_after: float) -> Overloaded:
+        self.shed += 1
+        return Overloaded(self.name, retry_after=max(1.0, math.ceil(retry_after)))
+
+    # -- acquire / release ----------------------------------------------------
+    async def acquire(self, priority: Priority, deadline: Optional[Deadline] = None) -> None:
+        if self.inflight < self._capacity() and not self._waiting:
+            self.inflight += 1
+            self.admitted += 1
+            return
+
+        ahead = self._queued_ahead(priority)
+        wait = self.estimated_wait(ahead)
+        if self._waiting >= self.max_queue:
+            raise self._shed(wait)
+        if deadline is not None and wait + (self._avg_latency or 0.0) > deadline.remaining():
+            raise self._shed(wait)
+
+        fut: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), fut))
+        self._waiting += 1
+        self.queued += 1
+        timeout = None if deadline is None else max(0.0, deadline.remaining())
+        try:
+            await asyncio.wait_for(fut, timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if fut.done() and not fut.cancelled():
+                # granted at the same moment we gave up: hand the slot on
+                self.release(None)
+            else:
+                fut.cancel()
+                self._abandon()
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+            raise self._shed(self.estimated_wait(self._queued_ahead(priority))) from None
+        self.admitted += 1
+
+    def release(self, latency: Optional[float], ok: bool = True) -> None:
+        """Free a slot; ``latency`` is None when the attempt was cancelled and carries no signal."""
+        saturated = self.inflight >= self._capacity()
+        self.inflight = max(0, self.inflight - 1)
+        if latency is not None:
+            self._observe(latency, ok, saturated)
+        self._wake()
+
+    def _observe(self, latency: float, ok: bool, saturated: bool) -> None:
+        self._avg_latency = latency if self._avg_latency is None else 0.8 * self._avg_latency + 0.2 * latency
+        baseline = min(self._latencies) if self._latencies else latency
+        if ok:
+            self._latencies.append(latency)
+        if not ok or latency > self.tolerance * baseline:
+            self.limit = max(float(self.min_limit), self.limit * self.backoff)
+        elif saturated:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+    def _abandon(self) -> None:
+        self._waiting -= 1
+        self._abandoned += 1
+        if self._abandoned > max(16, self._waiting):
+            self._waiters = [w for w in self._waiters if not w[2].done()]
+            heapq.heapify(self._waiters)
+            self._abandoned = 0
+
+    def _wake(self) -> None:
+        while self._waiters and self.inflight < self._capacity():
+            _, _, fut = heapq.heappop(self._waiters)
+            if fut.done():
+                self._abandoned = max(0, self._abandoned - 1)
+                continue
+            self._waiting -= 1
+            self.inflight += 1
+            fut.set_result(None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": round(self.limit, 2),
+            "inflight": self.inflight,
+            "waiting": self._waiting,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "shed": self.shed,
+        }
@@ -1,3 +1,5 @@
+from datetime import time
+
 from pydantic import BaseSettings, AnyHttpUrl, validator
 
 
@@ -13,6 +15,76 @@ class AppSettings(BaseSettings):
     # Timezone and timeouts
     DEFAULT_TZ: str = "UTC"
     REQUEST_TIMEOUT_SECONDS: int = 10
+    # End-to-end budgets per endpoint; the remaining part is forwarded to
+    # upstreams as X-Deadline-Ms and caps each call's timeout.
+    REPORT_BUDGET_SECONDS: float = 5.0
+    REPORTS_BUDGET_SECONDS: float = 15.0
+    # Budget for the /report news branch; on timeout it degrades to [] instead
+    # of failing the report.
+    NEWS_TIMEOUT_SECONDS: float = 2.0
+
+    # Upstream connection pools. HTTP/2 is negotiated only when `h2` is
+    # installed and the upstream offers it.
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP2_ENABLED: bool = True
+
+    # Idempotent GETs: hedge after the upstream's p95 once enough samples are
+    # seen, retry transport errors / 502-504; both spend the retry budget.
+    HTTP_HEDGE_ENABLED: bool = True
+    HTTP_HEDGE_MIN_SAMPLES: int = 20
+    HTTP_HEDGE_MIN_DELAY_SECONDS: float = 0.05
+    HTTP_MAX_RETRIES: int = 2
+    HTTP_RETRY_BACKOFF_SECONDS: float = 0.05
+    HTTP_RETRY_BUDGET_RATIO: float = 0.1
+    HTTP_RETRY_BUDGET_MAX_TOKENS: float = 10.0
+    HTTP_LATENCY_WINDOW: int = 512
+
+    # Sector/peer universe (CSV or Parquet with ticker,sector,industry);
+    # empty uses the bundled app/domain/data/universe.csv.
+    SECTOR_UNIVERSE_PATH: str = ""
+    # (sector, trading day) sorted return tables kept for peer percentiles
+    SECTOR_PERCENTILE_MAX_TABLES: int = 512
+    # Daily session close (UTC). Before it a live request expects to resolve
+    # to the previous trading day, whose sector table can already be final.
+    MARKET_SESSION_CLOSE_UTC: time = time(21, 0)
+
+    # Admission control per upstream: AIMD concurrency limit on latency
+    # (backs off past TOLERANCE x the recent minimum) and a priority queue
+    # where /report outranks /reports. Requests that cannot start within
+    # their deadline are shed with 503 + Retry-After.
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_INITIAL_LIMIT: int = 32
+    ADMISSION_MIN_LIMIT: int = 4
+    ADMISSION_MAX_LIMIT: int = 256
+    ADMISSION_BACKOFF: float = 0.9
+    ADMISSION_LATENCY_TOLERANCE: float = 2.0
+    ADMISSION_MAX_QUEUE: int = 1000
+
+    # /reports batching
+    MARKET_DATA_MAX_TICKERS: int = 50  # market_data rejects larger ticker lists
+    NEWS_BATCH_SIZE: int = 20
+    BATCH_MAX_CONCURRENCY: int = 4
+    REPORTS_MAX_TICKERS: int = 1000
+    REPORTS_MAX_PAGE_SIZE: int = 100
+
+    # Historical replay job (app/jobs/replay.py): extra history fetched in
+    # front of every market_data window so indicators and 20-day returns are
+    # warmed up, and how many sectors are replayed at once. Each news batch
+    # gets REPLAY_NEWS_TIMEOUT_SECONDS (the job has no request budget).
+    REPLAY_WARMUP_DAYS: int = 120
+    REPLAY_CONCURRENCY: int = 4
+    REPLAY_NEWS_TIMEOUT_SECONDS: float = 30.0
+
+    # /report cache: reports for past trading days are deterministic and stay
+    # fresh much longer than requests for today; stale entries are served
+    # while a background refresh runs. REDIS_URL enables the shared tier.
+    REPORT_CACHE_MAX_ENTRIES: int = 1024
+    REPORT_CACHE_FRESH_SECONDS: float = 60.0
+    REPORT_CACHE_HISTORICAL_FRESH_SECONDS: float = 86400.0
+    REPORT_CACHE_STALE_SECONDS: float = 600.0
+    REDIS_URL: str = ""
 
     @validator("REQUEST_TIMEOUT_SECONDS")
     def _validate_timeout(cls, v: int) -> int:
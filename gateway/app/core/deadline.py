@@ -0,0 +1,50 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# Remaining budget in milliseconds, sent on every upstream call so
+# market_data and rag can stop work the gateway will no longer wait for.
+DEADLINE_HEADER = "X-Deadline-Ms"
+
+
+class DeadlineExceeded(Exception):
+    """The request's budget ran out before an upstream call could finish."""
+
+
+class Deadline:
+    def __init__(self, budget_seconds: float) -> None:
+        self.expires_at = time.monotonic() + max(0.0, budget_seconds)
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def header_value(self) -> str:
+        return str(max(0, int(self.remaining() * 1000)))
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar("deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(budget_seconds: float) -> Iterator[Deadline]:
+    """Bind a per-endpoint budget to the current task and any task it spawns.
+
+    A tighter enclosing deadline wins over a looser nested budget.
+    """
+    outer = _current.get()
+    deadline = Deadline(budget_seconds)
+    if outer is not None and outer.expires_at < deadline.expires_at:
+        deadline = outer
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
@@ -1,28 +1,291 @@
-from typing import Any, Dict, Optional
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set, Tuple
 
 import httpx
 
+from app.core.admission import AdmissionController, current_priority
 from app.core.config import settings
+from app.core.deadline import DEADLINE_HEADER, DeadlineExceeded, current_deadline
+
+# Upstream answers worth retrying for idempotent requests; everything else is
+# returned to the caller as-is.
+RETRYABLE_STATUS = {502, 503, 504}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class RetryBudget:
+    """Token bucket that caps retries and hedges to a fraction of traffic.
+
+    Every request deposits ``ratio`` tokens (up to ``max_tokens``) and every
+    retry or hedge withdraws one, so an unhealthy upstream sees at most
+    ``1 + ratio`` times its normal load instead of a retry storm.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float) -> None:
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def deposit(self) -> None:
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+class UpstreamStats:
+    """Rolling latency window plus counters for one upstream."""
+
+    def __init__(self, window: int = 512) -> None:
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.budget_exhausted = 0
+
+    def observe(self, seconds: float) -> None:
+        self.latencies.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "budget_exhausted": self.budget_exhausted,
+            "samples": len(self.latencies),
+            "p50_ms": _ms(self.quantile(0.50)),
+            "p95_ms": _ms(self.quantile(0.95)),
+            "p99_ms": _ms(self.quantile(0.99)),
+        }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000.0, 3)
 
 
 class InternalHttpClient:
-    def __init__(self, base_url: str):
-        self.base_url = base_url.rstrip("/")
+    """Pooled client for one internal upstream.
+
+    The underlying ``httpx.AsyncClient`` is opened in the app lifespan (or
+    lazily on first use) with pool limits and keep-alive from settings, and
+    HTTP/2 when ``h2`` is installed. GETs are treated as idempotent: they are
+    hedged after the upstream's observed p95 and retried on transport errors
+    or 502/503/504, both paid for from a shared retry budget.
+
+    Inside a ``deadline_scope`` every attempt's timeout is capped by the
+    remaining budget, which is also forwarded in ``X-Deadline-Ms``; an
+    exhausted budget raises ``DeadlineExceeded``.
+
+    Every attempt first takes a slot from the upstream's
+    ``AdmissionController``, which may queue it by priority or shed it with
+    ``Overloaded``.
+    """
+
+    def __init__(self, base_url: str, name: str = ""):
+        self.base_url = str(base_url).rstrip("/")
+        self.name = name or self.base_url
         self.timeout = settings.REQUEST_TIMEOUT_SECONDS
-        self._client = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout)
+        self._client: Optional[httpx.AsyncClient] = None
+        self.stats = UpstreamStats(window=settings.HTTP_LATENCY_WINDOW)
+        self.budget = RetryBudget(settings.HTTP_RETRY_BUDGET_RATIO, settings.HTTP_RETRY_BUDGET_MAX_TOKENS)
+        self.admission = self._build_admission()
 
-    async def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> httpx.Response:
-        return await self._client.get(path, params=params)
+    def _build_admission(self) -> AdmissionController:
+        return AdmissionController(
+            self.name,
+            initial_limit=settings.ADMISSION_INITIAL_LIMIT,
+            min_limit=settings.ADMISSION_MIN_LIMIT,
+            max_limit=settings.ADMISSION_MAX_LIMIT,
+            backoff=settings.ADMISSION_BACKOFF,
+            tolerance=settings.ADMISSION_LATENCY_TOLERANCE,
+            max_queue=settings.ADMISSION_MAX_QUEUE,
+        )
 
-    async def post(self, path: str, json: Optional[Dict[str, Any]] = None) -> httpx.Response:
-        return await self._client.post(path, json=json)
+    def _build_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        )
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            limits=limits,
+            http2=settings.HTTP2_ENABLED and _http2_available(),
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+
+    async def start(self) -> None:
+        _ = self.client
 
     async def aclose(self) -> None:
-        await self._client.aclose()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def reset_stats(self) -> None:
+        self.stats = UpstreamStats(window=settings.HTTP_LATENCY_WINDOW)
+        self.budget = RetryBudget(settings.HTTP_RETRY_BUDGET_RATIO, settings.HTTP_RETRY_BUDGET_MAX_TOKENS)
+        self.admission = self._build_admission()
+
+    def _budget(self) -> Tuple[float, Dict[str, str]]:
+        """Timeout and headers for one attempt under the current deadline."""
+        deadline = current_deadline()
+        if deadline is None:
+            return self.timeout, {}
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"no budget left for {self.name}")
+        return min(self.timeout, remaining), {DEADLINE_HEADER: deadline.header_value()}
 
+    async def _send(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        self._budget()  # fail fast before queueing when nothing is left
+        if settings.ADMISSION_ENABLED:
+            await self.admission.acquire(current_priority(), current_deadline())
+        started = time.perf_counter()
+        latency: Optional[float] = None
+        ok = False
+        try:
+            timeout, headers = self._budget()
+            request = self.client.request(method, path, headers=headers, timeout=timeout, **kwargs)
+            if not headers:
+                resp = await request
+            else:
+                # httpx timeouts are per phase; the budget caps the whole attempt
+                resp = await asyncio.wait_for(request, timeout=timeout)
+            latency, ok = time.perf_counter() - started, resp.status_code < 500
+            # measured from admission on: queueing here is not upstream latency
+            self.stats.observe(latency)
+            return resp
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            latency = time.perf_counter() - started
+            raise
+        finally:
+            if settings.ADMISSION_ENABLED:
+                self.admission.release(latency, ok)
 
-market_data_client = InternalHttpClient(settings.MARKET_DATA_BASE_URL)
-rag_client = InternalHttpClient(settings.RAG_BASE_URL)
+    async def _counted(self, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """One attempt with its errors counted; ``_send`` records the latency."""
+        try:
+            return await send()
+        except asyncio.CancelledError:
+            raise
+        except (httpx.TimeoutException, asyncio.TimeoutError) as exc:
+            self.stats.errors += 1
+            deadline = current_deadline()
+            if deadline is not None and deadline.expired():
+                raise DeadlineExceeded(f"{self.name} did not answer within the budget") from exc
+            raise
+        except Exception:
+            self.stats.errors += 1
+            raise
 
+    def _hedge_delay(self) -> Optional[float]:
+        if not settings.HTTP_HEDGE_ENABLED or len(self.stats.latencies) < settings.HTTP_HEDGE_MIN_SAMPLES:
+            return None
+        p95 = self.stats.quantile(0.95) or 0.0
+        return max(settings.HTTP_HEDGE_MIN_DELAY_SECONDS, p95)
+
+    async def _hedged(self, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        delay = self._hedge_delay()
+        first = asyncio.ensure_future(self._counted(send))
+        if delay is None:
+            return await first
+        tasks: Set["asyncio.Future[httpx.Response]"] = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return first.result()
+            if not self.budget.withdraw():
+                self.stats.budget_exhausted += 1
+                return await first
+            self.stats.hedges += 1
+            hedge = asyncio.ensure_future(self._counted(send))
+            tasks.add(hedge)
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.stats.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            assert error is not None
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        self.stats.requests += 1
+        self.budget.deposit()
+
+        async def send() -> httpx.Response:
+            return await self._send("GET", path, params=params)
+
+        attempt = 0
+        while True:
+            try:
+                resp = await self._hedged(send)
+            except httpx.TransportError:
+                if not self._may_retry(attempt):
+                    raise
+            else:
+                if resp.status_code not in RETRYABLE_STATUS or not self._may_retry(attempt):
+                    return resp
+            attempt += 1
+            await asyncio.sleep(settings.HTTP_RETRY_BACKOFF_SECONDS * (2 ** (attempt - 1)))
+
+    def _may_retry(self, attempt: int) -> bool:
+        if attempt >= settings.HTTP_MAX_RETRIES:
+            return False
+        deadline = current_deadline()
+        if deadline is not None and deadline.remaining() <= settings.HTTP_RETRY_BACKOFF_SECONDS * (2**attempt):
+            return False
+        if not self.budget.withdraw():
+            self.stats.budget_exhausted += 1
+            return False
+        self.stats.retries += 1
+        return True
+
+    async def post(self, path: str, json: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        self.stats.requests += 1
+        self.budget.deposit()
+        return await self._counted(lambda: self._send("POST", path, json=json))
 
 
+market_data_client = InternalHttpClient(settings.MARKET_DATA_BASE_URL, name="market_data")
+rag_client = InternalHttpClient(settings.RAG_BASE_URL, name="rag")
+upstream_clients = (market_data_client, rag_client)
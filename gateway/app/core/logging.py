@@ -1,22 +1,23 @@
 import logging
-import sys
+
+from loguru import logger as loguru_logger
+
 
 class InterceptHandler(logging.Handler):
     def emit(self, record):
         # Get corresponding Loguru level if it exists
         try:
-            level = logging.getLevelName(record.levelname)
+            level = loguru_logger.level(record.levelname).name
         except ValueError:
             level = record.levelno
         # Find caller from where originated the log message
-        frame, depth = sys._getframe(6), 6
-        while frame.f_code.co_filename == logging.__file__:
+        frame, depth = logging.currentframe(), 2
+        while frame and frame.f_code.co_filename == logging.__file__:
             frame = frame.f_back
             depth += 1
-        logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
+        loguru_logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
 
 logging.basicConfig(handlers=[InterceptHandler()], level=0)
 
 logger = logging.getLogger("gateway")
 logger.setLevel(logging.INFO)
-
@@ -61,3 +61,12 @@ class ReportResponse(BaseModel):
         }
 
 
+class BatchReportResponse(BaseModel):
+    total: int
+    page: int
+    page_size: int
+    next_page: Optional[int] = None
+    results: List[ReportResponse] = []
+    # ticker -> reason for tickers on this page without a report
+    errors: Dict[str, str] = {}
+
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import csv
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+
+DEFAULT_UNIVERSE_PATH = Path(__file__).resolve().parent / "data" / "universe.csv"
+
+
+def _read_rows(path: Path) -> Iterable[Tuple[str, str, str]]:
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq  # optional; CSV needs no extra dependency
+
+        table = pq.read_table(path, columns=["ticker", "sector", "industry"]).to_pydict()
+        yield from zip(table["ticker"], table["sector"], table["industry"])
+        return
+    with path.open(newline="", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh):
+            yield row["ticker"], row["sector"], row.get("industry") or ""
+
+
+class SectorIndex:
+    """Immutable ticker -> sector/industry index over a universe file.
+
+    Rows are sorted by sector so each sector's members occupy one contiguous
+    range of ``tickers``; ``offsets[s]:offsets[s + 1]`` is that range. Sector
+    and industry names are interned once and rows only carry small integer
+    ids, so a 10k-symbol universe costs one dict entry and a few bytes per row.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[str, str, str]]) -> None:
+        cleaned: Dict[str, Tuple[str, str]] = {}
+        for ticker, sector, industry in rows:
+            ticker = (ticker or "").strip().upper()
+            sector = (sector or "").strip()
+            if ticker and sector:
+                cleaned[ticker] = (sector, (industry or "").strip())
+
+        self.sectors: List[str] = sorted({s for s, _ in cleaned.values()})
+        self.industries: List[str] = sorted({i for _, i in cleaned.values()})
+        sector_id = {name: i for i, name in enumerate(self.sectors)}
+        industry_id = {name: i for i, name in enumerate(self.industries)}
+
+        ordered = sorted(cleaned.items(), key=lambda kv: (sector_id[kv[1][0]], kv[0]))
+        self.tickers: List[str] = [t for t, _ in ordered]
+        self.sector_ids = array("H", (sector_id[s] for _, (s, _) in ordered))
+        self.industry_ids = array("H", (industry_id[i] for _, (_, i) in ordered))
+        self.row_by_ticker: Dict[str, int] = {t: i for i, t in enumerate(self.tickers)}
+        self._sector_id = sector_id
+
+        self.offsets = array("I", [0] * (len(self.sectors) + 1))
+        for sid in self.sector_ids:
+            self.offsets[sid + 1] += 1
+        for i in range(len(self.sectors)):
+            self.offsets[i + 1] += self.offsets[i]
+
+    @classmethod
+    def from_path(cls, path: Path) -> "SectorIndex":
+        return cls(_read_rows(Path(path)))
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker.upper() in self.row_by_ticker
+
+    def sector_of(self, ticker: str) -> Optional[str]:
+        row = self.row_by_ticker.get(ticker.upper())
+        return None if row is None else self.sectors[self.sector_ids[row]]
+
+    def industry_of(self, ticker: str) -> Optional[str]:
+        row = self.row_by_ticker.get(ticker.upper())
+        return None if row is None else (self.industries[self.industry_ids[row]] or None)
+
+    def members(self, sector: str) -> List[str]:
+        sid = self._sector_id.get(sector)
+        if sid is None:
+            return []
+        return self.tickers[self.offsets[sid] : self.offsets[sid + 1]]
+
+    def peers_of(self, ticker: str) -> Tuple[Optional[str], List[str]]:
+        """(sector, members of that sector including the ticker itself)."""
+        row = self.row_by_ticker.get(ticker.upper())
+        if row is None:
+            return None, []
+        sid = self.sector_ids[row]
+        return self.sectors[sid], self.tickers[self.offsets[sid] : self.offsets[sid + 1]]
+
+
+_lock = threading.Lock()
+_current: Optional[SectorIndex] = None
+
+
+def _configured_path() -> Path:
+    return Path(settings.SECTOR_UNIVERSE_PATH) if settings.SECTOR_UNIVERSE_PATH else DEFAULT_UNIVERSE_PATH
+
+
+def get_sector_index() -> SectorIndex:
+    global _current
+    index = _current
+    if index is None:
+        with _lock:
+            if _current is None:
+                _current = SectorIndex.from_path(_configured_path())
+            index = _current
+    return index
+
+
+def reload_sector_index(path: Optional[Path] = None) -> SectorIndex:
+    """Build a new index from ``path`` (default: the configured file) and swap it in.
+
+    Readers holding the old index keep a consistent view; the swap is a
+    single reference assignment.
+    """
+    global _current
+    fresh = SectorIndex.from_path(Path(path) if path else _configured_path())
+    with _lock:
+        _current = fresh
+    return fresh
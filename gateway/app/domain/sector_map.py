@@ -1,7 +0,0 @@
-SECTOR_BY_TICKER = {
-    "TSM": ("Semiconductors", ["TSM", "AAPL", "NVDA", "AMD", "ASML"]),
-    "AAPL": ("Technology Hardware", ["AAPL", "MSFT", "GOOGL", "AMZN", "META"]),
-}
-
-
-
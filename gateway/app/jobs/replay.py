@@ -0,0 +1,247 @@
+"""Historical report replay: one report row per (ticker, trading day).
+
+Instead of calling ``get_report`` once per day, each sector's history is
+loaded once (target tickers plus their peers, in windows market_data
+accepts), and the 20-day returns and sector percentiles for every day come
+from vectorized pandas operations over the whole range. Indicators are the
+ones market_data computes on the bars. News is looked up point-in-time for
+every day through rag's batch endpoint; ``news_error`` marks the days whose
+lookup failed, so their empty news is not mistaken for no news. One Parquet
+file is written per ticker; sectors are processed concurrently.
+
+    python -m app.jobs.replay --tickers TSM,NVDA --start 2020-01-01 --end 2024-12-31 --out replay/
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from app.core.admission import Priority, priority_scope
+from app.core.config import settings
+from app.core.http import upstream_clients
+from app.core.logging import logger
+from app.domain.sector_index import get_sector_index
+from app.services.report_service import (
+    _fetch_bars_batched,
+    _gather_bounded,
+    _map_ma_trend,
+    _map_macd_signal,
+    _search_news_batches,
+)
+
+# market_data rejects windows longer than this
+MAX_WINDOW_DAYS = 365 * 5
+
+COLUMNS = [
+    "as_of",
+    "ticker",
+    "spot",
+    "rsi14",
+    "macd_signal",
+    "vol_vs_avg20",
+    "trend_20_60",
+    "sector",
+    "twenty_day_return",
+    "peer_strength_percentile",
+    "news_title",
+    "news_ts",
+    "news_doc_id",
+    "news_url",
+    "news_error",
+]
+
+
+def _history_windows(start: date, end: date, warmup_days: int) -> List[Tuple[date, date, date]]:
+    """Split [start, end] into (fetch_start, keep_start, keep_end) windows.
+
+    market_data computes indicators over the window it is asked for, so every
+    window is fetched with ``warmup_days`` of extra history in front and only
+    the rows from ``keep_start`` on are kept.
+    """
+    span = MAX_WINDOW_DAYS - warmup_days
+    if span <= 0:
+        raise ValueError("REPLAY_WARMUP_DAYS must be shorter than the market_data window")
+    windows = []
+    keep_start = start
+    while keep_start <= end:
+        keep_end = min(end, keep_start + timedelta(days=span))
+        windows.append((keep_start - timedelta(days=warmup_days), keep_start, keep_end))
+        keep_start = keep_end + timedelta(days=1)
+    return windows
+
+
+def _bars_frame(bars: List[Dict[str, Any]]) -> pd.DataFrame:
+    frame = pd.DataFrame(bars)
+    if frame.empty or "ts" not in frame:
+        return pd.DataFrame()
+    frame["ts"] = pd.to_datetime(frame["ts"], utc=True)
+    return frame.set_index("ts").sort_index()
+
+
+async def _load_history(symbols: List[str], start: date, end: date) -> Dict[str, pd.DataFrame]:
+    """Full daily history per symbol over [start - warmup, end], one pass per window.
+
+    The first window's warm-up rows are kept too: the 20-day returns of the
+    first days look back on their closes (their indicators are not used).
+    """
+    parts: Dict[str, List[pd.DataFrame]] = {}
+    windows = _history_windows(start, end, settings.REPLAY_WARMUP_DAYS)
+    for i, (fetch_start, keep_start, keep_end) in enumerate(windows):
+        results = await _fetch_bars_batched(symbols, fetch_start.isoformat(), keep_end.isoformat())
+        lo = pd.Timestamp(fetch_start if i == 0 else keep_start, tz="UTC")
+        for sym, bars in results.items():
+            frame = _bars_frame(bars)
+            if not frame.empty:
+                parts.setdefault(sym.upper(), []).append(frame[frame.index >= lo])
+    history = {}
+    for sym, frames in parts.items():
+        frame = pd.concat(frames)
+        history[sym] = frame[~frame.index.duplicated(keep="last")]
+    return history
+
+
+def _twenty_day_returns(history: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Wide (day x symbol) 20-day returns, carried forward across other symbols' trading days.
+
+    Each symbol's return is taken over its own last 20 bars, matching
+    ``_compute_twenty_day_return``; a day a symbol did not trade sees its
+    last known return, as ``_bars_up_to`` does in ``/report``.
+    """
+    series = {}
+    for sym, frame in history.items():
+        close = frame["close"].astype(float).dropna()
+        series[sym] = close / close.shift(19) - 1.0
+    return pd.DataFrame(series).sort_index().ffill()
+
+
+def _sector_percentiles(returns: pd.DataFrame) -> pd.DataFrame:
+    """Each symbol's share of the sector with a return <= its own, per day."""
+    # rank(method="max") counts the values <= each value: searchsorted(side="right")
+    return returns.rank(axis=1, method="max").div(returns.notna().sum(axis=1), axis=0)
+
+
+def _report_rows(
+    ticker: str,
+    frame: pd.DataFrame,
+    sector: Optional[str],
+    returns: pd.DataFrame,
+    percentiles: Optional[pd.DataFrame],
+    start: date,
+    end: date,
+) -> pd.DataFrame:
+    days = frame.index.date
+    frame = frame[(days >= start) & (days <= end)]
+    out = pd.DataFrame(index=frame.index)
+    out["as_of"] = frame.index
+    out["ticker"] = ticker
+    out["spot"] = frame["close"].astype(float)
+    out["rsi14"] = frame.get("rsi14")
+    out["macd_signal"] = frame.get("macd_signal", pd.Series(None, index=frame.index)).map(_map_macd_signal)
+    out["vol_vs_avg20"] = frame.get("vol_vs_avg20")
+    out["trend_20_60"] = frame.get("ma20_trend", pd.Series(None, index=frame.index)).map(_map_ma_trend)
+    out["sector"] = sector
+    out["twenty_day_return"] = returns[ticker].reindex(frame.index)
+    out["peer_strength_percentile"] = (
+        percentiles[ticker].reindex(frame.index) if percentiles is not None else None
+    )
+    return out.reset_index(drop=True)
+
+
+async def _attach_news(rows: pd.DataFrame) -> pd.DataFrame:
+    queries = [(t, ts.to_pydatetime()) for t, ts in zip(rows["ticker"], rows["as_of"])]
+    news = await _search_news_batches(queries, timeout=settings.REPLAY_NEWS_TIMEOUT_SECONDS)
+    first = [items[0] if items else None for items in news]
+    rows["news_title"] = [n.title if n else None for n in first]
+    rows["news_ts"] = [n.ts if n else None for n in first]
+    rows["news_doc_id"] = [n.doc_id if n else None for n in first]
+    rows["news_url"] = [str(n.url) if n and n.url else None for n in first]
+    rows["news_error"] = [items is None for items in news]
+    failed = int(rows["news_error"].sum())
+    if failed:
+        logger.warning("replay: news lookup failed for %d of %d rows", failed, len(rows))
+    return rows[COLUMNS]
+
+
+def _plan_groups(tickers: List[str]) -> List[Tuple[Optional[str], List[str], List[str]]]:
+    """(sector, targets, symbols to load) per sector; tickers outside the universe stand alone."""
+    index = get_sector_index()
+    by_sector: Dict[str, List[str]] = {}
+    groups: List[Tuple[Optional[str], List[str], List[str]]] = []
+    for t in dict.fromkeys(t.strip().upper() for t in tickers if t.strip()):
+        sector = index.sector_of(t)
+        if sector is None:
+            groups.append((None, [t], [t]))
+        else:
+            by_sector.setdefault(sector, []).append(t)
+    for sector, targets in by_sector.items():
+        groups.append((sector, targets, list(index.members(sector))))
+    return groups
+
+
+async def _replay_group(
+    sector: Optional[str], targets: List[str], symbols: List[str], start: date, end: date, out_dir: Path
+) -> Dict[str, int]:
+    history = await _load_history(symbols, start, end)
+    returns = await asyncio.to_thread(_twenty_day_returns, history)
+    percentiles = await asyncio.to_thread(_sector_percentiles, returns) if sector else None
+
+    async def one(ticker: str) -> Tuple[str, int]:
+        frame = history.get(ticker)
+        if frame is None or frame.empty:
+            logger.warning("replay: no bars for %s", ticker)
+            return ticker, 0
+        rows = _report_rows(ticker, frame, sector, returns, percentiles, start, end)
+        if rows.empty:
+            return ticker, 0
+        rows = await _attach_news(rows)
+        await asyncio.to_thread(rows.to_parquet, out_dir / f"{ticker}.parquet", index=False)
+        return ticker, len(rows)
+
+    return dict(await asyncio.gather(*(one(t) for t in targets)))
+
+
+async def replay(tickers: List[str], start: date, end: date, out_dir: Path) -> Dict[str, int]:
+    """Write ``<out_dir>/<TICKER>.parquet`` for every ticker; returns rows written per ticker."""
+    if start > end:
+        raise ValueError("start must not be after end")
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    groups = _plan_groups(tickers)
+    with priority_scope(Priority.BATCH):
+        parts = await _gather_bounded(
+            [_replay_group(sector, targets, symbols, start, end, out_dir) for sector, targets, symbols in groups],
+            settings.REPLAY_CONCURRENCY,
+        )
+    written: Dict[str, int] = {}
+    for part in parts:
+        written.update(part)
+    return written
+
+
+def _parse_day(value: str) -> date:
+    return date.fromisoformat(value[:10])
+
+
+async def _main(args: argparse.Namespace) -> None:
+    try:
+        written = await replay(args.tickers.split(","), _parse_day(args.start), _parse_day(args.end), Path(args.out))
+    finally:
+        for client in upstream_clients:
+            await client.aclose()
+    for ticker, rows in written.items():
+        logger.info("replay: %s %d rows", ticker, rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay historical reports to Parquet")
+    parser.add_argument("--tickers", required=True, help="comma separated, e.g. TSM,NVDA")
+    parser.add_argument("--start", required=True, help="first day, YYYY-MM-DD")
+    parser.add_argument("--end", required=True, help="last day, YYYY-MM-DD")
+    parser.add_argument("--out", default="replay", help="output directory")
+    asyncio.run(_main(parser.parse_args()))
@@ -1,6 +1,42 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
 from .api.routers import router
+from .core.admission import Overloaded
+from .core.deadline import DeadlineExceeded
+from .core.http import upstream_clients
+from .services.report_cache import report_cache
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    for client in upstream_clients:
+        await client.start()
+    try:
+        yield
+    finally:
+        await report_cache.aclose()
+        for client in upstream_clients:
+            await client.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+@app.exception_handler(DeadlineExceeded)
+async def _deadline_exceeded(request: Request, exc: DeadlineExceeded) -> JSONResponse:
+    return JSONResponse(status_code=504, content={"detail": "upstream deadline exceeded"})
+
+
+@app.exception_handler(Overloaded)
+async def _overloaded(request: Request, exc: Overloaded) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"{exc.upstream} overloaded, retry later"},
+        headers={"Retry-After": str(int(exc.retry_after))},
+    )
 
-app = FastAPI()
 
 app.include_router(router)
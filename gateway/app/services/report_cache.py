@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.domain.report_schema import ReportResponse
+
+
+@dataclass
+class _Entry:
+    report: ReportResponse
+    created_at: float
+
+
+def _utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+class ReportCache:
+    """Stale-while-revalidate cache for /report keyed by ticker and resolved trading day.
+
+    Requests are looked up through aliases that point at entries. An
+    explicit `as_of` has its own alias, since the news part of a report
+    depends on the time of day. Only once `as_of` lies past the end of the
+    trading day the report resolved to (a weekend, a holiday) is the report
+    determined by that day alone; it is then stored under (ticker, trading
+    day) and also aliased by (ticker, requested day), so a Saturday and a
+    Sunday `as_of` at any hour share the Friday entry. Requests without
+    `as_of` share one live alias per day. Freshness depends on the request:
+    reports for past days are deterministic and stay fresh for
+    `historical_fresh_seconds`, while requests for today only stay fresh for
+    `fresh_seconds`. A stale entry is served immediately while one
+    background refresh runs; misses are single-flighted per alias, in a task
+    that a cancelled caller does not take down with it.
+    The in-process LRU is capped by entry count; an optional Redis tier is
+    shared across replicas and restarts.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        fresh_seconds: float = 60.0,
+        historical_fresh_seconds: float = 86400.0,
+        stale_seconds: float = 600.0,
+        redis_url: str = "",
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_entries = max(1, max_entries)
+        self.fresh_seconds = fresh_seconds
+        self.historical_fresh_seconds = historical_fresh_seconds
+        self.stale_seconds = stale_seconds
+        self.redis_url = redis_url
+        self._clock = clock
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._aliases: "OrderedDict[str, str]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Task[ReportResponse]"] = {}
+        self._refreshing: Set[str] = set()
+        self._tasks: Set["asyncio.Task[Any]"] = set()
+        self._redis: Any = None
+        self._redis_disabled = not redis_url
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.redis_hits = 0
+        self.redis_errors = 0
+        self.refreshes = 0
+        self.evictions = 0
+
+    # -- keys ---------------------------------------------------------------
+    @staticmethod
+    def _day_alias(ticker: str, requested_day: date) -> str:
+        return f"{ticker.upper()}|{requested_day.isoformat()}"
+
+    @staticmethod
+    def _alias_key(ticker: str, as_of: Optional[datetime], requested_day: date) -> str:
+        if as_of is None:
+            return f"{ticker.upper()}|now|{requested_day.isoformat()}"
+        return f"{ticker.upper()}|{_utc(as_of).isoformat()}"
+
+    @staticmethod
+    def _entry_key(report: ReportResponse, alias: str, as_of: datetime) -> str:
+        """(ticker, trading day) when ``as_of`` is past that day, else the request's own alias."""
+        trading_day = date.fromisoformat(report.as_of[:10])
+        day_end = datetime.combine(trading_day + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+        if as_of >= day_end:
+            return f"{report.ticker.upper()}|{trading_day.isoformat()}"
+        return alias
+
+    def _now(self) -> datetime:
+        return datetime.fromtimestamp(self._clock(), tz=timezone.utc)
+
+    def _fresh_for(self, requested_day: date) -> float:
+        today = self._now().date()
+        return self.fresh_seconds if requested_day >= today else self.historical_fresh_seconds
+
+    # -- public API ---------------------------------------------------------
+    async def get_or_compute(
+        self,
+        ticker: str,
+        as_of: Optional[datetime],
+        compute: Callable[[], Awaitable[ReportResponse]],
+    ) -> ReportResponse:
+        requested_day = (_utc(as_of) if as_of is not None else self._now()).date()
+        alias = self._alias_key(ticker, as_of, requested_day)
+        day_alias = self._day_alias(ticker, requested_day)
+        fresh_for = self._fresh_for(requested_day)
+
+        entry = await self._find(alias, day_alias)
+        if entry is not None:
+            age = self._clock() - entry.created_at
+            if age < fresh_for:
+                self.hits += 1
+                return entry.report
+            if age < fresh_for + self.stale_seconds:
+                self.stale_hits += 1
+                self._schedule_refresh(alias, day_alias, as_of, compute)
+                return entry.report
+
+        self.misses += 1
+        return await self._single_flight(alias, day_alias, as_of, compute)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": ((self.hits + self.stale_hits) / lookups) if lookups else 0.0,
+            "redis_enabled": not self._redis_disabled,
+            "redis_hits": self.redis_hits,
+            "redis_errors": self.redis_errors,
+            "refreshes": self.refreshes,
+            "evictions": self.evictions,
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._aliases.clear()
+        self._inflight.clear()
+        self._refreshing.clear()
+        self.hits = self.stale_hits = self.misses = 0
+        self.redis_hits = self.redis_errors = self.refreshes = self.evictions = 0
+
+    async def aclose(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._redis is not None:
+            try:
+                await self._redis.close()
+            except Exception:
+                pass
+            self._redis = None
+
+    # -- local tier ---------------------------------------------------------
+    async def _find(self, *aliases: str) -> Optional[_Entry]:
+        for alias in aliases:
+            entry = self._lookup(alias)
+            if entry is None:
+                entry = await self._lookup_redis(alias)
+            if entry is not None:
+                return entry
+        return None
+
+    def _lookup(self, alias: str) -> Optional[_Entry]:
+        key = self._aliases.get(alias)
+        if key is None:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self._aliases.pop(alias, None)
+            return None
+        self._entries.move_to_end(key)
+        self._aliases.move_to_end(alias)
+        return entry
+
+    def _store(self, aliases: List[str], key: str, entry: _Entry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        for alias in aliases:
+            self._aliases[alias] = key
+            self._aliases.move_to_end(alias)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        # aliases are tiny but still bounded; dangling ones are dropped lazily on lookup
+        while len(self._aliases) > self.max_entries * 4:
+            self._aliases.popitem(last=False)
+
+    # -- compute paths ------------------------------------------------------
+    async def _compute_and_store(
+        self,
+        alias: str,
+        day_alias: str,
+        as_of: Optional[datetime],
+        compute: Callable[[], Awaitable[ReportResponse]],
+    ) -> ReportResponse:
+        resolved_as_of = _utc(as_of) if as_of is not None else self._now()
+        report = await compute()
+        entry = _Entry(report=report, created_at=self._clock())
+        key = self._entry_key(report, alias, resolved_as_of)
+        # the day alias only points at entries the requested day determines
+        aliases = [alias, day_alias] if key != alias else [alias]
+        self._store(aliases, key, entry)
+        await self._store_redis(aliases, key, entry)
+        return report
+
+    async def _single_flight(
+        self,
+        alias: str,
+        day_alias: str,
+        as_of: Optional[datetime],
+        compute: Callable[[], Awaitable[ReportResponse]],
+    ) -> ReportResponse:
+        task = self._inflight.get(alias)
+        if task is None:
+            task = asyncio.create_task(self._compute_and_store(alias, day_alias, as_of, compute))
+            self._inflight[alias] = task
+            self._tasks.add(task)
+            task.add_done_callback(functools.partial(self._flight_done, alias))
+        # every caller, the first included, only shields the shared task:
+        # one of them being cancelled does not cancel it for the others
+        return await asyncio.shield(task)
+
+    def _flight_done(self, alias: str, task: "asyncio.Task[ReportResponse]") -> None:
+        self._tasks.discard(task)
+        if self._inflight.get(alias) is task:
+            del self._inflight[alias]
+        if not task.cancelled():
+            # mark retrieved so a failure nobody awaited any more does not warn
+            task.exception()
+
+    def _schedule_refresh(
+        self,
+        alias: str,
+        day_alias: str,
+        as_of: Optional[datetime],
+        compute: Callable[[], Awaitable[ReportResponse]],
+    ) -> None:
+        if alias in self._refreshing or alias in self._inflight:
+            return
+        self._refreshing.add(alias)
+
+        async def refresh() -> None:
+            try:
+                await self._compute_and_store(alias, day_alias, as_of, compute)
+                self.refreshes += 1
+            except Exception as exc:
+                logger.warning("report cache refresh failed for %s: %s", alias, exc)
+            finally:
+                self._refreshing.discard(alias)
+
+        task = asyncio.create_task(refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # -- redis tier ---------------------------------------------------------
+    async def _client(self) -> Any:
+        if self._redis_disabled:
+            return None
+        if self._redis is None:
+            try:
+                import redis.asyncio as aioredis  # type: ignore
+
+                self._redis = aioredis.from_url(self.redis_url)
+            except Exception as exc:
+                logger.warning("report cache redis tier disabled: %s", exc)
+                self._redis_disabled = True
+                return None
+        return self._redis
+
+    async def _lookup_redis(self, alias: str) -> Optional[_Entry]:
+        client = await self._client()
+        if client is None:
+            return None
+        try:
+            key = await client.get(f"report-alias:{alias}")
+            if key is None:
+                return None
+            key = key.decode() if isinstance(key, bytes) else key
+            raw = await client.get(f"report:{key}")
+            if raw is None:
+                return None
+            payload = json.loads(raw)
+            entry = _Entry(report=ReportResponse.parse_obj(payload["report"]), created_at=float(payload["created_at"]))
+        except Exception:
+            self.redis_errors += 1
+            return None
+        self.redis_hits += 1
+        self._store([alias], key, entry)
+        return entry
+
+    async def _store_redis(self, aliases: List[str], key: str, entry: _Entry) -> None:
+        client = await self._client()
+        if client is None:
+            return
+        ttl = int(max(self.fresh_seconds, self.historical_fresh_seconds) + self.stale_seconds)
+        payload = json.dumps({"created_at": entry.created_at, "report": json.loads(entry.report.json())})
+        try:
+            await client.set(f"report:{key}", payload, ex=ttl)
+            for alias in aliases:
+                await client.set(f"report-alias:{alias}", key, ex=ttl)
+        except Exception:
+            self.redis_errors += 1
+
+
+report_cache = ReportCache(
+    max_entries=settings.REPORT_CACHE_MAX_ENTRIES,
+    fresh_seconds=settings.REPORT_CACHE_FRESH_SECONDS,
+    historical_fresh_seconds=settings.REPORT_CACHE_HISTORICAL_FRESH_SECONDS,
+    stale_seconds=settings.REPORT_CACHE_STALE_SECONDS,
+    redis_url=settings.REDIS_URL,
+)
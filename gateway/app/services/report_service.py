@@ -1,19 +1,30 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import json
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
 
+import httpx
 from fastapi import HTTPException
 
+from app.core.admission import Overloaded
+from app.core.config import settings
+from app.core.deadline import DeadlineExceeded, current_deadline, deadline_scope
 from app.core.http import market_data_client, rag_client
+from app.core.logging import logger
 from app.domain.report_schema import (
+    BatchReportResponse,
     ContextModel,
     IndicatorsModel,
     MacdModel,
     NewsItem,
     ReportResponse,
 )
-from app.domain.sector_map import SECTOR_BY_TICKER
+from app.domain.sector_index import get_sector_index
+from app.services.sector_percentiles import SectorReturns, sector_percentiles
+
+T = TypeVar("T")
 
 
 def _isoformat_utc(dt: datetime) -> str:
@@ -39,18 +50,25 @@ async def _fetch_bars(ticker: str, start: str, end: str) -> Dict[str, List[Dict[
     return data.get("results", {})
 
 
-def _extract_latest_trading_as_of(bars: List[Dict[str, Any]]) -> Optional[datetime]:
-    if not bars:
+def _parse_ts(value: Any) -> Optional[datetime]:
+    if not value:
         return None
-    latest_ts = bars[-1]["ts"]
     try:
         # Expect ISO8601
-        dt = datetime.fromisoformat(latest_ts.replace("Z", "+00:00"))
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
     except Exception:
         return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
     return dt.astimezone(timezone.utc)
 
 
+def _extract_latest_trading_as_of(bars: List[Dict[str, Any]]) -> Optional[datetime]:
+    if not bars:
+        return None
+    return _parse_ts(bars[-1]["ts"])
+
+
 def _bars_close_list(bars: List[Dict[str, Any]]) -> List[float]:
     return [float(x.get("close")) for x in bars if x.get("close") is not None]
 
@@ -65,41 +83,117 @@ def _compute_twenty_day_return(bars: List[Dict[str, Any]]) -> Optional[float]:
         return None
 
 
-def _percentile_rank(value: float, population: List[float]) -> Optional[float]:
-    vals = [v for v in population if v is not None]
-    if not vals:
-        return None
-    vals_sorted = sorted(vals)
-    try:
-        rank = len([v for v in vals_sorted if v <= value])
-        return rank / len(vals_sorted)
-    except Exception:
-        return None
+def _plan_bar_symbols(ticker: str) -> Tuple[Optional[str], List[str], List[str]]:
+    """Plan the single /internal/bars request a report needs.
+
+    Returns (sector, peers, symbols): symbols is the target followed by its
+    peers with duplicates removed, so the target's series is downloaded once
+    and serves both the indicators and its own peer return.
+    """
+    target = ticker.upper()
+    sector, peers = get_sector_index().peers_of(target)
+    if not sector:
+        return None, [], [target]
+    return sector, peers, list(dict.fromkeys([target] + peers))
+
+
+def _bars_up_to(bars: List[Dict[str, Any]], as_of: datetime) -> List[Dict[str, Any]]:
+    out = []
+    for bar in bars:
+        ts = _parse_ts(bar.get("ts"))
+        if ts is None or ts <= as_of:
+            out.append(bar)
+    return out
+
+
+def _is_final_day(day: date) -> bool:
+    return day < datetime.now(timezone.utc).date()
+
+
+def _expected_trading_day(as_of: datetime, now: Optional[datetime] = None) -> date:
+    """The trading day a report for ``as_of`` should resolve to, guessed before any bars arrive.
+
+    Daily bars are stamped at midnight, so a past day is its own trading
+    day; today's bar is only counted on once its session has closed.
+    Weekends roll back to Friday. Holidays are not known here: a wrong guess
+    costs the follow-up peer fetch in ``_missing_peers``, not a wrong answer.
+    """
+    now = (now or datetime.now(timezone.utc)).astimezone(timezone.utc)
+    day = min(as_of.date(), now.date())
+    if day == now.date() and now.time() < settings.MARKET_SESSION_CLOSE_UTC:
+        day -= timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+
+def _trading_day_end(effective_as_of: datetime) -> datetime:
+    """End of the trading day ``effective_as_of`` (a midnight bar stamp) stands for."""
+    return effective_as_of + timedelta(days=1)
+
+
+def _has_final_table(sector: Optional[str], day: date) -> bool:
+    return bool(sector) and _is_final_day(day) and sector_percentiles.get(sector, day) is not None
+
 
+def _peers_final(sector: Optional[str], as_of: datetime) -> bool:
+    """Whether the sector table is final for the day ``as_of`` is expected to resolve to."""
+    return any(_has_final_table(sector, day) for day in {as_of.date(), _expected_trading_day(as_of)})
 
-async def _peer_strength_percentile(ticker: str, as_of_day: datetime) -> Tuple[Optional[str], Optional[float]]:
-    mapping = SECTOR_BY_TICKER.get(ticker.upper())
-    if not mapping:
-        return None, None
-    sector, peers = mapping
-    start = (as_of_day - timedelta(days=90)).date().isoformat()
-    end = as_of_day.date().isoformat()
-    peer_csv = ",".join(peers)
-    results = await _fetch_bars(peer_csv, start, end)
-
-    returns: List[Optional[float]] = []
-    my_return: Optional[float] = None
-    for sym in peers:
-        sym_bars = results.get(sym, [])
-        r = _compute_twenty_day_return(sym_bars)
-        returns.append(r)
-        if sym.upper() == ticker.upper():
-            my_return = r
 
+def _missing_peers(
+    sector: Optional[str], peers: List[str], results: Dict[str, List[Dict[str, Any]]], as_of: datetime
+) -> List[str]:
+    if not sector or _has_final_table(sector, as_of.date()):
+        return []
+    return [p for p in peers if p not in results]
+
+
+def _sector_table(
+    sector: str, peers: List[str], results: Dict[str, List[Dict[str, Any]]], as_of: datetime
+) -> SectorReturns:
+    """Sorted sector returns for the trading day of ``as_of``.
+
+    A table for a past day is final and reused without looking at the peers'
+    bars; the current day's table is refreshed from whichever peers are in
+    ``results``, only moving the symbols whose return changed.
+    """
+    day = as_of.date()
+    if _has_final_table(sector, day):
+        sector_percentiles.hits += 1
+        return sector_percentiles.get(sector, day)  # type: ignore[return-value]
+    # a peer's bars can run past the target's last trading day; keep them point-in-time
+    returns = {
+        sym: _compute_twenty_day_return(_bars_up_to(results[sym], as_of)) for sym in peers if sym in results
+    }
+    if len(returns) < len(peers):
+        # peers cut by a deadline: rank against what arrived, but never cache a partial sector
+        return SectorReturns(returns)
+    return sector_percentiles.update(sector, day, returns)
+
+
+def _peer_strength(
+    ticker: str, sector: str, peers: List[str], results: Dict[str, List[Dict[str, Any]]], as_of: datetime
+) -> Optional[float]:
+    my_return = _compute_twenty_day_return(_bars_up_to(results.get(ticker.upper(), []), as_of))
     if my_return is None:
-        return sector, None
-    pct = _percentile_rank(my_return, [r for r in returns if r is not None])
-    return sector, pct
+        return None
+    return _sector_table(sector, peers, results, as_of).percentile(my_return)
+
+
+def _news_items_from_payload(data: Any, as_of: datetime) -> List[NewsItem]:
+    items = data if isinstance(data, list) else (data or {}).get("results", [])
+    if not items:
+        return []
+    item = items[0]
+    return [
+        NewsItem(
+            title=item.get("title", ""),
+            ts=item.get("ts") or item.get("published_at") or _isoformat_utc(as_of),
+            doc_id=item.get("doc_id", ""),
+            url=item.get("url"),
+        )
+    ]
 
 
 async def _fetch_latest_news(ticker: str, as_of: datetime) -> List[NewsItem]:
@@ -108,19 +202,7 @@ async def _fetch_latest_news(ticker: str, as_of: datetime) -> List[NewsItem]:
         resp = await rag_client.post("/search_news", json=payload)
         if resp.status_code != 200:
             return []
-        data = resp.json()
-        items = data if isinstance(data, list) else data.get("results", [])
-        if not items:
-            return []
-        item = items[0]
-        return [
-            NewsItem(
-                title=item.get("title", ""),
-                ts=item.get("ts", _isoformat_utc(as_of)),
-                doc_id=item.get("doc_id", ""),
-                url=item.get("url"),
-            )
-        ]
+        return _news_items_from_payload(resp.json(), as_of)
     except Exception:
         return []
 
@@ -155,44 +237,67 @@ def _map_macd_signal(value: Any) -> str:
         return "neutral"
 
 
-async def get_report(ticker: str, as_of: Optional[datetime]) -> ReportResponse:
-    # 1) parse as_of (UTC)
-    as_of_utc = (as_of or datetime.now(timezone.utc)).astimezone(timezone.utc)
-    start_day = (as_of_utc - timedelta(days=90)).date().isoformat()
-    end_day = as_of_utc.date().isoformat()
+def _news_timeout() -> float:
+    deadline = current_deadline()
+    if deadline is None:
+        return settings.NEWS_TIMEOUT_SECONDS
+    return max(0.0, min(settings.NEWS_TIMEOUT_SECONDS, deadline.remaining()))
 
-    # 2) fetch bars for target ticker
-    results = await _fetch_bars(ticker, start_day, end_day)
-    bars: List[Dict[str, Any]] = results.get(ticker.upper()) or results.get(ticker) or []
-    if not bars:
-        raise HTTPException(status_code=404, detail="no bars for ticker in range")
 
-    # fallback to last trading day returned
-    last_trade_dt = _extract_latest_trading_as_of(bars)
-    effective_as_of = last_trade_dt or as_of_utc
+async def _fetch_missing_peers(missing: List[str], start: str, end: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Peers the first bars call did not return (its deadline cut it short).
 
-    last_bar = bars[-1]
-    spot = float(last_bar.get("close"))
-    rsi14 = float(last_bar.get("rsi14", 0.0))
-    macd_signal = _map_macd_signal(last_bar.get("macd_signal"))
-    trend_20_60 = _map_ma_trend(last_bar.get("ma20_trend"))
-    vol_vs_avg20 = float(last_bar.get("vol_vs_avg20", 0.0))
+    Best effort: with the budget spent or the upstream shedding load or
+    failing, the percentile is ranked against the peers that did arrive.
+    """
+    try:
+        return await _fetch_bars_batched(missing, start, end)
+    except (DeadlineExceeded, Overloaded, HTTPException, httpx.HTTPError):
+        return {}
 
-    # 3) sector and peer percentile
-    sector, peer_pct = await _peer_strength_percentile(ticker, effective_as_of)
 
-    # 4) news
-    news_items = await _fetch_latest_news(ticker, effective_as_of)
+async def _with_timeout(fn: Callable[..., Awaitable[T]], *args: Any, timeout: float, default: T) -> T:
+    """Run a non-critical branch; on timeout or upstream error fall back to ``default``."""
+    try:
+        return await asyncio.wait_for(fn(*args), timeout=timeout)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        return default
 
+
+async def _cancel(*tasks: "asyncio.Task[Any]") -> None:
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _news_is_point_in_time(items: List[NewsItem], as_of: datetime) -> bool:
+    for item in items:
+        ts = _parse_ts(item.ts)
+        if ts is not None and ts > as_of:
+            return False
+    return True
+
+
+def _build_report(
+    ticker: str,
+    bars: List[Dict[str, Any]],
+    effective_as_of: datetime,
+    sector: Optional[str],
+    peer_pct: Optional[float],
+    news_items: List[NewsItem],
+) -> ReportResponse:
+    last_bar = bars[-1]
     return ReportResponse(
         as_of=_isoformat_utc(effective_as_of),
         ticker=ticker.upper(),
-        spot=spot,
+        spot=float(last_bar.get("close")),
         indicators=IndicatorsModel(
-            rsi14=rsi14,
-            macd=MacdModel(signal=macd_signal),
-            vol_vs_avg20=vol_vs_avg20,
-            trend_20_60=trend_20_60,  # type: ignore[arg-type]
+            rsi14=float(last_bar.get("rsi14", 0.0)),
+            macd=MacdModel(signal=_map_macd_signal(last_bar.get("macd_signal"))),
+            vol_vs_avg20=float(last_bar.get("vol_vs_avg20", 0.0)),
+            trend_20_60=_map_ma_trend(last_bar.get("ma20_trend")),  # type: ignore[arg-type]
         ),
         context=ContextModel(
             sector=sector,
@@ -202,4 +307,314 @@ async def get_report(ticker: str, as_of: Optional[datetime]) -> ReportResponse:
     )
 
 
+async def get_report(ticker: str, as_of: Optional[datetime]) -> ReportResponse:
+    # 1) parse as_of (UTC)
+    as_of_utc = (as_of or datetime.now(timezone.utc)).astimezone(timezone.utc)
+    start_day = (as_of_utc - timedelta(days=90)).date().isoformat()
+    end_day = as_of_utc.date().isoformat()
+
+    # 2) fan out: news does not need the bars, so it starts speculatively with
+    # the requested as_of and is reconciled against the resolved trading day.
+    news_task = asyncio.create_task(
+        _with_timeout(_fetch_latest_news, ticker, as_of_utc, timeout=_news_timeout(), default=[])
+    )
+
+    # 3) one bars call for target + peers over the shared window (critical path);
+    # sectors larger than MARKET_DATA_MAX_TICKERS are split into parallel calls.
+    # Peers are skipped when the sector's table for the expected trading day is
+    # already final; a different resolved day fetches them afterwards.
+    sector, peers, symbols = _plan_bar_symbols(ticker)
+    if _peers_final(sector, as_of_utc):
+        symbols = symbols[:1]
+    try:
+        results = await _fetch_bars_batched(symbols, start_day, end_day)
+        bars: List[Dict[str, Any]] = results.get(ticker.upper()) or results.get(ticker) or []
+        if not bars:
+            raise HTTPException(status_code=404, detail="no bars for ticker in range")
+
+        # fallback to last trading day returned
+        effective_as_of = _extract_latest_trading_as_of(bars) or as_of_utc
+        missing = _missing_peers(sector, peers, results, effective_as_of)
+        if missing:
+            results.update(await _fetch_missing_peers(missing, start_day, end_day))
+    except BaseException:
+        await _cancel(news_task)
+        raise
+
+    # 4) peer percentile: one searchsorted against the whole sector for that day
+    peer_pct = _peer_strength(ticker, sector, peers, results, effective_as_of) if sector else None
+
+    # 5) news; refetch only if the speculative answer runs past the effective trading day
+    news_items = await _reconcile_news(ticker, await news_task, effective_as_of, as_of_utc)
+
+    return _build_report(ticker, bars, effective_as_of, sector, peer_pct, news_items)
+
 
+async def _reconcile_news(
+    ticker: str, news_items: List[NewsItem], effective_as_of: datetime, requested: datetime
+) -> List[NewsItem]:
+    # news published during the effective trading day belongs to it; only a
+    # speculative answer from a later day (e.g. a weekend as_of) is refetched
+    if effective_as_of < requested and not _news_is_point_in_time(news_items, _trading_day_end(effective_as_of)):
+        return await _with_timeout(_fetch_latest_news, ticker, effective_as_of, timeout=_news_timeout(), default=[])
+    return news_items
+
+
+def _section(model: Any) -> Dict[str, Any]:
+    return json.loads(model.json())
+
+
+async def _report_sections(
+    ticker: str, as_of: Optional[datetime], emit: Callable[[str, Dict[str, Any]], None]
+) -> None:
+    """Compute a report section by section, calling ``emit`` as each one is ready.
+
+    Unlike ``get_report`` the target's bars come from their own small call so
+    price and indicators are not held back by the peers; peers and news run
+    concurrently and are emitted in whichever order they finish.
+    """
+    as_of_utc = (as_of or datetime.now(timezone.utc)).astimezone(timezone.utc)
+    start_day = (as_of_utc - timedelta(days=90)).date().isoformat()
+    end_day = as_of_utc.date().isoformat()
+    sector, peers, symbols = _plan_bar_symbols(ticker)
+    target = symbols[0]
+
+    tasks: List["asyncio.Task[Any]"] = []
+    news_task = asyncio.create_task(
+        _with_timeout(_fetch_latest_news, ticker, as_of_utc, timeout=_news_timeout(), default=[])
+    )
+    tasks.append(news_task)
+    peer_symbols = [] if _peers_final(sector, as_of_utc) else symbols[1:]
+    peers_task = asyncio.create_task(_fetch_missing_peers(peer_symbols, start_day, end_day)) if peer_symbols else None
+    if peers_task is not None:
+        tasks.append(peers_task)
+
+    try:
+        results = await _fetch_bars(target, start_day, end_day)
+        bars: List[Dict[str, Any]] = results.get(target) or []
+        if not bars:
+            raise HTTPException(status_code=404, detail="no bars for ticker in range")
+        effective_as_of = _extract_latest_trading_as_of(bars) or as_of_utc
+        price = _build_report(ticker, bars, effective_as_of, None, None, [])
+        price_section = {"as_of": price.as_of, "ticker": price.ticker, "spot": price.spot}
+        emit("price", {**price_section, "indicators": _section(price.indicators)})
+
+        async def peers_section() -> Tuple[str, Optional[float]]:
+            if not sector:
+                return "peers", None
+            if peers_task is not None:
+                results.update(await peers_task)
+            missing = _missing_peers(sector, peers, results, effective_as_of)
+            if missing:
+                results.update(await _fetch_missing_peers(missing, start_day, end_day))
+            return "peers", _peer_strength(ticker, sector, peers, results, effective_as_of)
+
+        async def news_section() -> Tuple[str, List[NewsItem]]:
+            return "news", await _reconcile_news(ticker, await news_task, effective_as_of, as_of_utc)
+
+        sections: Dict[str, Any] = {}
+        pending = [asyncio.create_task(peers_section()), asyncio.create_task(news_section())]
+        tasks.extend(pending)
+        for next_done in asyncio.as_completed(pending):
+            name, value = await next_done
+            sections[name] = value
+            if name == "peers":
+                emit("peers", {"sector": sector, "peer_strength_percentile": value})
+            else:
+                emit("news", {"top_news": [_section(item) for item in value]})
+
+        report = _build_report(ticker, bars, effective_as_of, sector, sections["peers"], sections["news"])
+        emit("report", _section(report))
+    finally:
+        await _cancel(*tasks)
+
+
+async def stream_report(
+    ticker: str, as_of: Optional[datetime], budget_seconds: float
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (event, payload) pairs: price, peers and news as they complete, then report.
+
+    Failures end the stream with an ``error`` event carrying the status code
+    ``/report`` would have returned. Closing the iterator (client disconnect)
+    cancels the producer and every upstream call it still has in flight.
+    """
+    queue: "asyncio.Queue[Optional[Tuple[str, Dict[str, Any]]]]" = asyncio.Queue()
+
+    def emit(event: str, payload: Dict[str, Any]) -> None:
+        queue.put_nowait((event, payload))
+
+    async def produce() -> None:
+        try:
+            with deadline_scope(budget_seconds):
+                await _report_sections(ticker, as_of, emit)
+        except HTTPException as exc:
+            emit("error", {"status_code": exc.status_code, "detail": exc.detail})
+        except DeadlineExceeded:
+            emit("error", {"status_code": 504, "detail": "upstream deadline exceeded"})
+        except Overloaded as exc:
+            emit("error", {"status_code": 503, "detail": str(exc), "retry_after": exc.retry_after})
+        except Exception as exc:
+            logger.warning("report stream failed for %s: %s", ticker, exc)
+            emit("error", {"status_code": 502, "detail": "upstream error"})
+        finally:
+            queue.put_nowait(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            yield item
+    finally:
+        await _cancel(producer)
+
+
+def _chunks(items: List[T], size: int) -> List[List[T]]:
+    return [items[i : i + size] for i in range(0, len(items), max(1, size))]
+
+
+async def _gather_bounded(coros: List[Awaitable[T]], limit: int) -> List[T]:
+    sem = asyncio.Semaphore(max(1, limit))
+
+    async def run(coro: Awaitable[T]) -> T:
+        async with sem:
+            return await coro
+
+    return await asyncio.gather(*(run(c) for c in coros))
+
+
+async def _fetch_bars_batched(symbols: List[str], start: str, end: str) -> Dict[str, List[Dict[str, Any]]]:
+    batches = _chunks(symbols, settings.MARKET_DATA_MAX_TICKERS)
+    parts = await _gather_bounded(
+        [_fetch_bars(",".join(batch), start, end) for batch in batches], settings.BATCH_MAX_CONCURRENCY
+    )
+    merged: Dict[str, List[Dict[str, Any]]] = {}
+    for part in parts:
+        merged.update(part)
+    return merged
+
+
+async def _search_news_batches(
+    queries: List[Tuple[str, datetime]], timeout: Optional[float] = None
+) -> List[Optional[List[NewsItem]]]:
+    """Latest news for many (ticker, as_of) pairs via rag's batch endpoint, in query order.
+
+    Each batch gets ``timeout`` seconds (default: the request's news
+    budget). Queries of a batch that failed or timed out come back as None.
+    """
+
+    async def one_batch(batch: List[Tuple[str, datetime]]) -> List[Optional[List[NewsItem]]]:
+        failed: List[Optional[List[NewsItem]]] = [None] * len(batch)
+        try:
+            payload = {
+                "requests": [{"query": t, "as_of": _isoformat_utc(d), "top_k": 1} for t, d in batch]
+            }
+            resp = await asyncio.wait_for(
+                rag_client.post("/search_news_batch", json=payload),
+                timeout=_news_timeout() if timeout is None else timeout,
+            )
+            if resp.status_code != 200:
+                return failed
+            responses = resp.json().get("results", [])
+            out: List[Optional[List[NewsItem]]] = [[] for _ in batch]
+            for i, ((_, d), data) in enumerate(zip(batch, responses)):
+                out[i] = _news_items_from_payload(data, d)
+            return out
+        except Exception:
+            return failed
+
+    parts = await _gather_bounded(
+        [one_batch(b) for b in _chunks(queries, settings.NEWS_BATCH_SIZE)], settings.BATCH_MAX_CONCURRENCY
+    )
+    return [items for part in parts for items in part]
+
+
+async def _search_news_batch(queries: List[Tuple[str, datetime]]) -> List[List[NewsItem]]:
+    """Like ``_search_news_batches``; a failed batch degrades its queries to [] rather than failing the caller."""
+    return [items or [] for items in await _search_news_batches(queries)]
+
+
+async def _fetch_news_batch(queries: List[Tuple[str, datetime]]) -> Dict[str, List[NewsItem]]:
+    """Latest news per ticker for a page of (ticker, as_of) pairs."""
+    return {t: items for (t, _), items in zip(queries, await _search_news_batch(queries))}
+
+
+async def get_reports(
+    tickers: List[str], as_of: Optional[datetime], page: int = 1, page_size: int = 50
+) -> BatchReportResponse:
+    """Reports for many tickers with shared upstream work.
+
+    Only the requested page is computed. Bars for the union of targets and
+    their sector peers are fetched once in batches, each sector's sorted
+    return table is built once per trading day (and reused across requests
+    once that day is final), and news comes from batched rag calls.
+    """
+    ordered = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+    total = len(ordered)
+    offset = (page - 1) * page_size
+    page_tickers = ordered[offset : offset + page_size]
+    next_page = page + 1 if offset + page_size < total else None
+
+    as_of_utc = (as_of or datetime.now(timezone.utc)).astimezone(timezone.utc)
+    start_day = (as_of_utc - timedelta(days=90)).date().isoformat()
+    end_day = as_of_utc.date().isoformat()
+
+    plans = {t: _plan_bar_symbols(t) for t in page_tickers}
+    symbols = list(
+        dict.fromkeys(
+            sym
+            for sector, _, plan_symbols in plans.values()
+            for sym in (plan_symbols[:1] if _peers_final(sector, as_of_utc) else plan_symbols)
+        )
+    )
+    results = await _fetch_bars_batched(symbols, start_day, end_day) if symbols else {}
+
+    errors: Dict[str, str] = {}
+    resolved: Dict[str, Tuple[List[Dict[str, Any]], datetime]] = {}
+    for t in page_tickers:
+        bars = results.get(t) or []
+        if not bars:
+            errors[t] = "no bars for ticker in range"
+            continue
+        resolved[t] = (bars, _extract_latest_trading_as_of(bars) or as_of_utc)
+
+    # a resolved day can differ from the requested one; fetch peers still needed
+    missing = list(
+        dict.fromkeys(
+            p
+            for t, (_, effective) in resolved.items()
+            for p in _missing_peers(plans[t][0], plans[t][1], results, effective)
+        )
+    )
+    if missing:
+        results.update(await _fetch_missing_peers(missing, start_day, end_day))
+
+    # one sorted return table per (sector, trading day), shared by the page
+    tables: Dict[Tuple[str, date], SectorReturns] = {}
+    peer_pcts: Dict[str, Optional[float]] = {}
+    for t, (bars, effective) in resolved.items():
+        sector, peers, _ = plans[t]
+        my_return = _compute_twenty_day_return(_bars_up_to(bars, effective)) if sector else None
+        if not sector or my_return is None:
+            peer_pcts[t] = None
+            continue
+        key = (sector, effective.date())
+        if key not in tables:
+            tables[key] = _sector_table(sector, peers, results, effective)
+        peer_pcts[t] = tables[key].percentile(my_return)
+
+    news = await _fetch_news_batch([(t, effective) for t, (_, effective) in resolved.items()]) if resolved else {}
+
+    reports = [
+        _build_report(t, bars, effective, plans[t][0], peer_pcts.get(t), news.get(t, []))
+        for t, (bars, effective) in resolved.items()
+    ]
+    return BatchReportResponse(
+        total=total,
+        page=page,
+        page_size=page_size,
+        next_page=next_page,
+        results=reports,
+        errors=errors,
+    )
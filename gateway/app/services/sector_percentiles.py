@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+
+class SectorReturns:
+    """Sorted N-day returns of one sector on one trading day.
+
+    ``values`` stays sorted, so a percentile is one ``searchsorted``.
+    Updating a symbol moves a single element (O(n) memmove, no re-sort).
+    """
+
+    def __init__(self, returns: Mapping[str, Optional[float]]) -> None:
+        self.by_symbol: Dict[str, float] = {s: float(r) for s, r in returns.items() if r is not None}
+        self.values = np.sort(np.fromiter(self.by_symbol.values(), dtype=np.float64, count=len(self.by_symbol)))
+
+    def __len__(self) -> int:
+        return int(self.values.size)
+
+    def percentile(self, value: float) -> Optional[float]:
+        """Share of the sector with a return <= ``value``."""
+        if not self.values.size:
+            return None
+        return float(np.searchsorted(self.values, value, side="right")) / self.values.size
+
+    def upsert(self, symbol: str, value: Optional[float]) -> bool:
+        old = self.by_symbol.get(symbol)
+        if value is not None:
+            value = float(value)
+        if old == value:
+            return False
+        values = self.values
+        if old is not None:
+            values = np.delete(values, np.searchsorted(values, old, side="left"))
+            del self.by_symbol[symbol]
+        if value is not None:
+            values = np.insert(values, np.searchsorted(values, value, side="right"), value)
+            self.by_symbol[symbol] = value
+        self.values = values
+        return True
+
+
+class SectorPercentileEngine:
+    """LRU of ``SectorReturns`` tables keyed by (sector, trading day).
+
+    Tables for past trading days are final and reused as-is; a table for the
+    current day is updated in place, one symbol at a time, as newer bars
+    arrive.
+    """
+
+    def __init__(self, max_tables: int = 512) -> None:
+        self.max_tables = max(1, max_tables)
+        self._tables: "OrderedDict[Tuple[str, date], SectorReturns]" = OrderedDict()
+        self.hits = 0
+        self.builds = 0
+        self.upserts = 0
+
+    def get(self, sector: str, day: date) -> Optional[SectorReturns]:
+        table = self._tables.get((sector, day))
+        if table is not None:
+            self._tables.move_to_end((sector, day))
+        return table
+
+    def update(self, sector: str, day: date, returns: Mapping[str, Optional[float]]) -> SectorReturns:
+        """Merge ``returns`` into the (sector, day) table, building it if absent."""
+        key = (sector, day)
+        table = self._tables.get(key)
+        if table is None:
+            table = SectorReturns(returns)
+            self._tables[key] = table
+            self.builds += 1
+            while len(self._tables) > self.max_tables:
+                self._tables.popitem(last=False)
+        else:
+            for symbol, value in returns.items():
+                self.upserts += table.upsert(symbol, value)
+            self._tables.move_to_end(key)
+        return table
+
+    def stats(self) -> Dict[str, Any]:
+        return {"tables": len(self._tables), "hits": self.hits, "builds": self.builds, "upserts": self.upserts}
+
+    def clear(self) -> None:
+        self._tables.clear()
+        self.hits = self.builds = self.upserts = 0
+
+
+sector_percentiles = SectorPercentileEngine(max_tables=settings.SECTOR_PERCENTILE_MAX_TABLES)
@@ -2,6 +2,24 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # 將該服務根目錄（含 app/）加入匯入路徑
 SERVICE_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(SERVICE_ROOT))
+
+
+@pytest.fixture(autouse=True)
+def _reset_process_state():
+    # /report responses and upstream latency stats live per process;
+    # keep tests independent
+    from app.core.http import upstream_clients
+    from app.services.report_cache import report_cache
+    from app.services.sector_percentiles import sector_percentiles
+
+    report_cache.clear()
+    sector_percentiles.clear()
+    for client in upstream_clients:
+        client.reset_stats()
+    yield
+    report_cache.clear()
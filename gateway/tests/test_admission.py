@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+import respx
+from httpx import AsyncClient, Response
+
+from app.main import app
+from app.core.admission import AdmissionController, Overloaded, Priority
+from app.core.config import settings
+from app.core.deadline import Deadline
+from app.core.http import market_data_client
+
+
+@pytest.mark.asyncio
+async def test_interactive_waiters_are_served_before_batch():
+    ctl = AdmissionController("up", initial_limit=1, min_limit=1)
+    await ctl.acquire(Priority.BATCH)
+    order = []
+
+    async def waiter(name, priority):
+        await ctl.acquire(priority)
+        order.append(name)
+        ctl.release(0.01)
+
+    tasks = [
+        asyncio.create_task(waiter("batch-1", Priority.BATCH)),
+        asyncio.create_task(waiter("batch-2", Priority.BATCH)),
+        asyncio.create_task(waiter("interactive", Priority.INTERACTIVE)),
+    ]
+    await asyncio.sleep(0)
+    assert ctl.snapshot()["waiting"] == 3
+    ctl.release(0.01)
+    await asyncio.gather(*tasks)
+    assert order == ["interactive", "batch-1", "batch-2"]
+
+
+@pytest.mark.asyncio
+async def test_requests_that_cannot_start_in_time_are_shed():
+    ctl = AdmissionController("up", initial_limit=1, min_limit=1)
+    ctl._avg_latency = 2.0
+    await ctl.acquire(Priority.INTERACTIVE)
+    with pytest.raises(Overloaded) as info:
+        await ctl.acquire(Priority.INTERACTIVE, Deadline(0.5))
+    assert info.value.retry_after >= 2.0
+    assert ctl.snapshot()["shed"] == 1 and ctl.snapshot()["waiting"] == 0
+
+    # a queued request whose deadline passes while waiting is shed too
+    ctl._avg_latency = 0.0
+    with pytest.raises(Overloaded):
+        await ctl.acquire(Priority.INTERACTIVE, Deadline(0.05))
+    ctl.release(0.01)
+    assert ctl.inflight == 0
+
+
+@pytest.mark.asyncio
+async def test_abandoned_waiters_do_not_fill_the_queue():
+    ctl = AdmissionController("up", initial_limit=1, min_limit=1, max_queue=4)
+    await ctl.acquire(Priority.INTERACTIVE)
+    # expired deadlines and rounds of client disconnects leave only dead heap entries
+    for _ in range(3):
+        with pytest.raises(Overloaded):
+            await ctl.acquire(Priority.INTERACTIVE, Deadline(0.01))
+    for _ in range(10):
+        gone = [asyncio.create_task(ctl.acquire(Priority.INTERACTIVE)) for _ in range(4)]
+        await asyncio.sleep(0)
+        for task in gone:
+            task.cancel()
+        await asyncio.gather(*gone, return_exceptions=True)
+    assert ctl.snapshot()["waiting"] == 0
+    assert len(ctl._waiters) <= 17
+
+    # the live queue is empty, so a full queue's worth is accepted again
+    waiters = [asyncio.create_task(ctl.acquire(Priority.INTERACTIVE)) for _ in range(4)]
+    await asyncio.sleep(0)
+    assert ctl.snapshot()["waiting"] == 4
+    with pytest.raises(Overloaded):
+        await ctl.acquire(Priority.INTERACTIVE)
+    for _ in range(4):
+        ctl.release(0.01)
+        await asyncio.sleep(0)
+    await asyncio.gather(*waiters)
+    assert ctl.inflight == 1 and ctl.snapshot()["waiting"] == 0
+
+
+def test_aimd_limit_follows_latency():
+    ctl = AdmissionController("up", initial_limit=4, min_limit=2, max_limit=8)
+    for _ in range(40):
+        ctl.inflight = int(ctl.limit)
+        ctl.release(0.010)
+    grown = ctl.limit
+    assert 5.0 < grown <= 8.0
+
+    ctl.inflight = 1
+    ctl.release(0.100)  # 10x the baseline latency
+    assert ctl.limit == pytest.approx(grown * 0.9)
+    for _ in range(50):
+        ctl.inflight = 1
+        ctl.release(0.010, ok=False)
+    assert ctl.limit == 2.0
+
+    # an idle upstream does not inflate the limit
+    limit = ctl.limit
+    ctl.inflight = 1
+    ctl.release(0.010)
+    assert ctl.limit == limit
+
+
+@pytest.mark.asyncio
+async def test_shed_request_returns_503_with_retry_after(monkeypatch):
+    base_md = str(settings.MARKET_DATA_BASE_URL)
+    admission = market_data_client.admission
+    admission.limit = float(admission.min_limit)
+    admission.inflight = admission.min_limit
+    admission._avg_latency = 30.0
+
+    with respx.mock(assert_all_called=False) as router:
+        bars_route = router.get(f"{base_md}/internal/bars").mock(return_value=Response(200, json={"results": {}}))
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            resp = await ac.get("/report", params={"ticker": "TSM", "as_of": "2024-01-20T00:00:00Z"})
+
+    assert resp.status_code == 503
+    assert int(resp.headers["Retry-After"]) >= 30
+    assert not bars_route.called
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+import respx
+from httpx import AsyncClient, Response
+
+from app.main import app
+from app.core.config import settings
+from app.core.deadline import DeadlineExceeded, current_deadline, deadline_scope
+from app.core.http import InternalHttpClient
+
+
+def bars(symbols, close_step=0.1):
+    return {
+        s: [{"ts": f"2024-01-{d + 1:02d}T00:00:00Z", "close": 100 + d * close_step * (i + 1)} for d in range(20)]
+        for i, s in enumerate(symbols)
+    }
+
+
+@pytest.mark.asyncio
+async def test_remaining_budget_is_forwarded():
+    client = InternalHttpClient("http://upstream.test", name="up")
+    with respx.mock() as router:
+        route = router.get("http://upstream.test/x").mock(return_value=Response(200))
+        with deadline_scope(2.0):
+            await client.get("/x")
+        await client.get("/x")
+    await client.aclose()
+
+    sent = int(route.calls[0].request.headers["X-Deadline-Ms"])
+    assert 1000 < sent <= 2000
+    assert "X-Deadline-Ms" not in route.calls[1].request.headers
+
+
+@pytest.mark.asyncio
+async def test_exhausted_budget_raises_without_calling():
+    client = InternalHttpClient("http://upstream.test", name="up")
+    with respx.mock(assert_all_called=False) as router:
+        route = router.get("http://upstream.test/x").mock(return_value=Response(200))
+        with deadline_scope(0.0):
+            with pytest.raises(DeadlineExceeded):
+                await client.get("/x")
+    await client.aclose()
+    assert not route.called
+
+
+def test_nested_scope_keeps_tighter_deadline():
+    with deadline_scope(1.0) as outer:
+        with deadline_scope(10.0) as inner:
+            assert inner is outer and current_deadline() is outer
+    assert current_deadline() is None
+
+
+@pytest.mark.asyncio
+async def test_report_times_out_with_504(monkeypatch):
+    monkeypatch.setattr(settings, "REPORT_BUDGET_SECONDS", 0.1)
+    base_md = str(settings.MARKET_DATA_BASE_URL)
+    base_rag = str(settings.RAG_BASE_URL)
+
+    async def slow_bars(request):
+        await asyncio.sleep(1.0)
+        return Response(200, json={"results": {}})
+
+    with respx.mock(assert_all_called=False) as router:
+        router.get(f"{base_md}/internal/bars").mock(side_effect=slow_bars)
+        router.post(f"{base_rag}/search_news").mock(return_value=Response(200, json=[]))
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            resp = await ac.get("/report", params={"ticker": "TSM", "as_of": "2024-01-20T00:00:00Z"})
+
+    assert resp.status_code == 504
+
+
+@pytest.mark.asyncio
+async def test_partial_bars_rank_against_arrived_peers_without_caching():
+    base_md = str(settings.MARKET_DATA_BASE_URL)
+    base_rag = str(settings.RAG_BASE_URL)
+    calls = []
+
+    def partial_bars(request):
+        symbols = request.url.params["ticker"].split(",")
+        calls.append(request.headers.get("X-Deadline-Ms"))
+        # market_data runs out of budget after three tickers, then has none left
+        kept = symbols[:3] if len(calls) == 1 else []
+        return Response(
+            200, json={"results": bars(kept), "partial": True, "skipped": [s for s in symbols if s not in kept]}
+        )
+
+    with respx.mock(assert_all_called=True) as router:
+        router.get(f"{base_md}/internal/bars").mock(side_effect=partial_bars)
+        router.post(f"{base_rag}/search_news").mock(return_value=Response(200, json=[]))
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            resp = await ac.get("/report", params={"ticker": "TSM", "as_of": "2024-01-20T00:00:00Z"})
+            metrics = await ac.get("/internal/metrics")
+
+    assert resp.status_code == 200
+    assert resp.json()["context"]["peer_strength_percentile"] is not None
+    assert len(calls) == 2 and all(c is not None for c in calls)
+    assert metrics.json()["sector_percentiles"]["tables"] == 0
@@ -0,0 +1,137 @@
+import asyncio
+
+import httpx
+import pytest
+import respx
+from httpx import AsyncClient, Response
+
+from app.main import app
+from app.core.admission import AdmissionController, Priority
+from app.core.config import settings
+from app.core.http import InternalHttpClient
+
+BASE = "http://upstream.test"
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_RETRY_BACKOFF_SECONDS", 0.0)
+
+
+@pytest.mark.asyncio
+async def test_get_retries_transient_errors(fast_retries):
+    client = InternalHttpClient(BASE, name="up")
+    with respx.mock() as router:
+        route = router.get(f"{BASE}/x").mock(
+            side_effect=[httpx.ConnectError("boom"), Response(503), Response(200, json={"ok": True})]
+        )
+        resp = await client.get("/x")
+    await client.aclose()
+
+    assert resp.status_code == 200
+    assert route.call_count == 3
+    assert client.stats.retries == 2 and client.stats.errors == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_caps_retries(fast_retries, monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_RETRY_BUDGET_MAX_TOKENS", 1.0)
+    monkeypatch.setattr(settings, "HTTP_RETRY_BUDGET_RATIO", 0.0)
+    client = InternalHttpClient(BASE, name="up")
+    with respx.mock() as router:
+        route = router.get(f"{BASE}/x").mock(return_value=Response(503))
+        first = await client.get("/x")
+        second = await client.get("/x")
+    await client.aclose()
+
+    assert first.status_code == 503 and second.status_code == 503
+    # one retry for the first call, none left for the second
+    assert route.call_count == 3
+    assert client.stats.retries == 1 and client.stats.budget_exhausted == 2
+
+
+@pytest.mark.asyncio
+async def test_post_is_not_retried():
+    client = InternalHttpClient(BASE, name="up")
+    with respx.mock() as router:
+        route = router.post(f"{BASE}/x").mock(return_value=Response(503))
+        resp = await client.post("/x", json={})
+    await client.aclose()
+    assert resp.status_code == 503 and route.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_get_is_hedged_after_p95(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_HEDGE_MIN_SAMPLES", 5)
+    monkeypatch.setattr(settings, "HTTP_HEDGE_MIN_DELAY_SECONDS", 0.01)
+    client = InternalHttpClient(BASE, name="up")
+    for _ in range(5):
+        client.stats.observe(0.02)
+
+    calls = []
+
+    async def handler(request):
+        calls.append(1)
+        # the first attempt stalls, the hedge answers quickly
+        await asyncio.sleep(1.0 if len(calls) == 1 else 0.0)
+        return Response(200, json={"attempt": len(calls)})
+
+    with respx.mock(assert_all_called=False) as router:
+        router.get(f"{BASE}/x").mock(side_effect=handler)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        resp = await client.get("/x")
+        elapsed = loop.time() - started
+    await client.aclose()
+
+    assert resp.json() == {"attempt": 2}
+    assert elapsed < 0.5
+    assert client.stats.hedges == 1 and client.stats.hedge_wins == 1
+
+
+@pytest.mark.asyncio
+async def test_admission_wait_is_not_upstream_latency():
+    client = InternalHttpClient(BASE, name="up")
+    client.admission = AdmissionController("up", initial_limit=1, min_limit=1)
+    await client.admission.acquire(Priority.INTERACTIVE)
+    with respx.mock() as router:
+        router.get(f"{BASE}/x").mock(return_value=Response(200))
+        pending = asyncio.create_task(client.get("/x"))
+        await asyncio.sleep(0.2)
+        client.admission.release(0.01)
+        resp = await pending
+    await client.aclose()
+    assert resp.status_code == 200
+    # queued for 0.2s behind the held slot; only the upstream round trip is recorded
+    assert client.stats.latencies and max(client.stats.latencies) < 0.1
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_before_enough_samples():
+    client = InternalHttpClient(BASE, name="up")
+    with respx.mock() as router:
+        route = router.get(f"{BASE}/x").mock(return_value=Response(200))
+        await client.get("/x")
+    await client.aclose()
+    assert route.call_count == 1 and client.stats.hedges == 0
+    assert client.stats.snapshot()["samples"] == 1
+
+
+@pytest.mark.asyncio
+async def test_client_is_recreated_after_close():
+    client = InternalHttpClient(BASE, name="up")
+    await client.start()
+    first = client.client
+    await client.aclose()
+    assert first.is_closed
+    assert client.client is not first and not client.client.is_closed
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_metrics_expose_upstream_latency():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        resp = await ac.get("/internal/metrics")
+    upstreams = resp.json()["upstreams"]
+    assert set(upstreams) == {"market_data", "rag"}
+    assert {"p50_ms", "p95_ms", "p99_ms", "hedges", "retries"} <= set(upstreams["rag"])
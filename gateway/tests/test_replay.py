@@ -0,0 +1,146 @@
+import json
+from datetime import date, datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+import respx
+from httpx import AsyncClient, Response
+
+from app.main import app
+from app.core.config import settings
+from app.domain.sector_index import get_sector_index
+from app.jobs.replay import MAX_WINDOW_DAYS, _history_windows, replay
+
+FIRST_DAY = date(2023, 1, 2)
+
+
+def daily_bars(symbol: str, start: str, end: str) -> list:
+    """Deterministic weekday bars; each symbol trends at its own pace."""
+    seed = sum(map(ord, symbol))
+    lo, hi = date.fromisoformat(start), date.fromisoformat(end)
+    day, i, bars = FIRST_DAY, 0, []
+    while day <= date(2024, 6, 28):
+        if day.weekday() < 5:
+            if lo <= day <= hi:
+                bars.append(
+                    {
+                        "ts": f"{day.isoformat()}T00:00:00Z",
+                        "close": 50 + seed % 17 + i * (0.05 + (seed % 11) / 100) + (i % 7) * 0.3,
+                        "rsi14": 40.0 + i % 20,
+                        "macd_signal": "bullish" if i % 2 else "bearish",
+                        "ma20_trend": "up",
+                        "vol_vs_avg20": 1.0,
+                    }
+                )
+            i += 1
+        day += timedelta(days=1)
+    return bars
+
+
+def bars_handler(calls):
+    def handler(request):
+        params = request.url.params
+        symbols = params["ticker"].split(",")
+        calls.append((params["start"], params["end"], len(symbols)))
+        results = {s: daily_bars(s, params["start"], params["end"]) for s in symbols}
+        return Response(200, json={"timeframe": "1d", "adjust": "adj", "results": results})
+
+    return handler
+
+
+def news_item(query: str, as_of: str) -> dict:
+    published = (datetime.fromisoformat(as_of.replace("Z", "+00:00")) - timedelta(hours=6)).isoformat()
+    return {"doc_id": f"{query}:{as_of[:10]}", "title": f"{query} news", "url": None, "published_at": published}
+
+
+def news_batch_handler(request):
+    reqs = json.loads(request.content)["requests"]
+    return Response(200, json={"results": [{"results": [news_item(r["query"], r["as_of"])]} for r in reqs]})
+
+
+def news_handler(request):
+    body = json.loads(request.content)
+    return Response(200, json=[news_item(body["query"], body["as_of"])])
+
+
+def test_history_windows_respect_market_data_limit():
+    windows = _history_windows(date(2010, 1, 1), date(2024, 12, 31), warmup_days=120)
+    # the warm-up is fetched once, in front of the first requested day
+    assert windows[0][:2] == (date(2010, 1, 1) - timedelta(days=120), date(2010, 1, 1))
+    assert windows[-1][2] == date(2024, 12, 31)
+    for (fetch_start, keep_start, keep_end), nxt in zip(windows, windows[1:] + [None]):
+        assert (keep_end - fetch_start).days <= MAX_WINDOW_DAYS
+        assert keep_start - fetch_start == timedelta(days=120)
+        if nxt is not None:
+            assert nxt[1] == keep_end + timedelta(days=1)
+
+
+@pytest.mark.asyncio
+async def test_replay_matches_report_and_loads_history_once(tmp_path):
+    base_md = str(settings.MARKET_DATA_BASE_URL)
+    base_rag = str(settings.RAG_BASE_URL)
+    _, peers = get_sector_index().peers_of("TSM")
+    calls = []
+
+    with respx.mock(assert_all_called=False) as router:
+        router.get(f"{base_md}/internal/bars").mock(side_effect=bars_handler(calls))
+        router.post(f"{base_rag}/search_news_batch").mock(side_effect=news_batch_handler)
+        router.post(f"{base_rag}/search_news").mock(side_effect=news_handler)
+
+        written = await replay(["TSM", "NVDA", "AAPL"], date(2024, 3, 1), date(2024, 3, 29), tmp_path)
+        replay_calls = list(calls)
+
+        frame = pd.read_parquet(tmp_path / "TSM.parquet")
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            live = {
+                day: (await ac.get("/report", params={"ticker": "TSM", "as_of": f"{day}T00:00:00Z"})).json()
+                for day in ("2024-03-01", "2024-03-15", "2024-03-29")
+            }
+
+    # one history pass per sector: Semiconductors once for TSM and NVDA, AAPL's sector once
+    assert len(replay_calls) == 2
+    assert sorted(n for _, _, n in replay_calls) == sorted(
+        [len(peers), len(get_sector_index().members(get_sector_index().sector_of("AAPL")))]
+    )
+    assert written == {"TSM": 21, "NVDA": 21, "AAPL": 21}
+    assert set(p.name for p in tmp_path.iterdir()) == {"TSM.parquet", "NVDA.parquet", "AAPL.parquet"}
+
+    rows = frame.set_index(frame["as_of"].dt.strftime("%Y-%m-%d"))
+    for day, report in live.items():
+        row = rows.loc[day]
+        assert row["spot"] == pytest.approx(report["spot"])
+        assert row["rsi14"] == pytest.approx(report["indicators"]["rsi14"])
+        assert row["macd_signal"] == report["indicators"]["macd"]["signal"]
+        assert row["sector"] == report["context"]["sector"] == "Semiconductors"
+        assert row["peer_strength_percentile"] == pytest.approx(report["context"]["peer_strength_percentile"])
+        assert row["news_doc_id"] == report["context"]["top_news"][0]["doc_id"] == f"TSM:{day}"
+    assert frame["as_of"].min() == pd.Timestamp("2024-03-01", tz=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_replay_news_uses_job_timeout_and_marks_failed_days(tmp_path, monkeypatch):
+    base_md = str(settings.MARKET_DATA_BASE_URL)
+    base_rag = str(settings.RAG_BASE_URL)
+    # the per-request news budget does not apply to the job
+    monkeypatch.setattr(settings, "NEWS_TIMEOUT_SECONDS", 0.0)
+    monkeypatch.setattr(settings, "NEWS_BATCH_SIZE", 2)
+    calls = []
+
+    def flaky_news(request):
+        reqs = json.loads(request.content)["requests"]
+        if any(r["as_of"].startswith("2024-03-06") for r in reqs):
+            return Response(503)
+        return news_batch_handler(request)
+
+    with respx.mock(assert_all_called=False) as router:
+        router.get(f"{base_md}/internal/bars").mock(side_effect=bars_handler(calls))
+        router.post(f"{base_rag}/search_news_batch").mock(side_effect=flaky_news)
+        await replay(["AAPL"], date(2024, 3, 4), date(2024, 3, 8), tmp_path)
+
+    # one fetch, warmed up once in front of the first day
+    assert calls[0][0] == (date(2024, 3, 4) - timedelta(days=settings.REPLAY_WARMUP_DAYS)).isoformat()
+    frame = pd.read_parquet(tmp_path / "AAPL.parquet")
+    failed = frame.set_index(frame["as_of"].dt.strftime("%Y-%m-%d"))["news_error"]
+    # days are batched in pairs: 03-06 shared the failed batch with 03-07
+    assert failed[failed].index.tolist() == ["2024-03-06", "2024-03-07"]
+    assert frame.loc[~frame["news_error"], "news_doc_id"].notna().all()
@@ -0,0 +1,203 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+import respx
+from httpx import AsyncClient, Response
+
+from app.main import app
+from app.core.config import settings
+from app.domain.report_schema import ContextModel, IndicatorsModel, MacdModel, ReportResponse
+from app.services.report_cache import ReportCache
+
+
+class FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_report(ticker: str, as_of: str, close: float) -> ReportResponse:
+    return ReportResponse(
+        ticker=ticker,
+        as_of=as_of,
+        spot=close,
+        indicators=IndicatorsModel(rsi14=50.0, macd=MacdModel(signal="neutral"), vol_vs_avg20=1.0, trend_20_60="flat"),
+        context=ContextModel(),
+    )
+
+
+def counting_compute(as_of: str):
+    calls = []
+
+    async def compute():
+        calls.append(as_of)
+        return make_report("TSM", as_of, float(len(calls)))
+
+    return compute, calls
+
+
+NOW = datetime(2024, 1, 10, 12, tzinfo=timezone.utc).timestamp()
+
+
+@pytest.mark.asyncio
+async def test_weekend_request_shares_resolved_trading_day_entry():
+    cache = ReportCache(clock=FakeClock(NOW))
+    compute, calls = counting_compute("2024-01-05T00:00:00Z")
+
+    sunday = datetime(2024, 1, 7, tzinfo=timezone.utc)
+    first = await cache.get_or_compute("TSM", sunday, compute)
+    again = await cache.get_or_compute("tsm", sunday, compute)
+
+    assert calls == ["2024-01-05T00:00:00Z"]
+    assert again == first
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    assert cache.stats()["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_as_of_time_within_the_trading_day_is_part_of_the_key():
+    cache = ReportCache(clock=FakeClock(NOW))
+    compute, calls = counting_compute("2024-01-09T00:00:00Z")
+
+    # news differs between 10:00 and 18:00 of the day the report resolves to
+    morning = await cache.get_or_compute("TSM", datetime(2024, 1, 9, 10, tzinfo=timezone.utc), compute)
+    evening = await cache.get_or_compute("TSM", datetime(2024, 1, 9, 18, tzinfo=timezone.utc), compute)
+    again = await cache.get_or_compute("TSM", datetime(2024, 1, 9, 10, tzinfo=timezone.utc), compute)
+    assert len(calls) == 2 and (morning.spot, evening.spot, again.spot) == (1.0, 2.0, 1.0)
+
+    # past the end of the resolved day, any hour of the requested day shares the entry
+    compute, calls = counting_compute("2024-01-05T00:00:00Z")
+    await cache.get_or_compute("TSM", datetime(2024, 1, 7, 9, tzinfo=timezone.utc), compute)
+    await cache.get_or_compute("TSM", datetime(2024, 1, 7, 21, tzinfo=timezone.utc), compute)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_fail_waiters():
+    cache = ReportCache(clock=FakeClock(NOW))
+    gate = asyncio.Event()
+    calls = []
+
+    async def slow_compute():
+        calls.append(1)
+        await gate.wait()
+        return make_report("TSM", "2024-01-05T00:00:00Z", 1.0)
+
+    day = datetime(2024, 1, 5, tzinfo=timezone.utc)
+    leader = asyncio.create_task(cache.get_or_compute("TSM", day, slow_compute))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get_or_compute("TSM", day, slow_compute))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    gate.set()
+
+    assert (await waiter).spot == 1.0
+    assert leader.cancelled() and len(calls) == 1
+    # the result was stored even though the caller that started it left
+    await cache.get_or_compute("TSM", day, slow_compute)
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_served_while_refreshing():
+    clock = FakeClock(NOW)
+    cache = ReportCache(fresh_seconds=60, stale_seconds=600, clock=clock)
+    compute, calls = counting_compute("2024-01-10T00:00:00Z")
+
+    first = await cache.get_or_compute("TSM", datetime(2024, 1, 10, tzinfo=timezone.utc), compute)
+    clock.now += 120  # past fresh, within stale window
+    stale = await cache.get_or_compute("TSM", datetime(2024, 1, 10, tzinfo=timezone.utc), compute)
+    assert stale == first
+    await asyncio.gather(*cache._tasks)
+
+    refreshed = await cache.get_or_compute("TSM", datetime(2024, 1, 10, tzinfo=timezone.utc), compute)
+    assert refreshed.spot == 2.0
+    stats = cache.stats()
+    assert stats["stale_hits"] == 1 and stats["refreshes"] == 1 and stats["hits"] == 1
+    assert len(calls) == 2
+
+    clock.now += 10_000  # past the stale window -> blocking recompute
+    await cache.get_or_compute("TSM", datetime(2024, 1, 10, tzinfo=timezone.utc), compute)
+    assert cache.stats()["misses"] == 2 and len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_historical_days_stay_fresh_longer():
+    clock = FakeClock(NOW)
+    cache = ReportCache(fresh_seconds=60, historical_fresh_seconds=3600, clock=clock)
+    compute, calls = counting_compute("2024-01-05T00:00:00Z")
+
+    friday = datetime(2024, 1, 5, tzinfo=timezone.utc)
+    await cache.get_or_compute("TSM", friday, compute)
+    clock.now += 600
+    await cache.get_or_compute("TSM", friday, compute)
+    assert cache.stats()["hits"] == 1 and len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_and_single_flight():
+    cache = ReportCache(max_entries=2, clock=FakeClock(NOW))
+    gate = asyncio.Event()
+    calls = []
+
+    async def slow_compute():
+        calls.append(1)
+        await gate.wait()
+        return make_report("TSM", "2024-01-05T00:00:00Z", 1.0)
+
+    day = datetime(2024, 1, 5, tzinfo=timezone.utc)
+    waiters = [asyncio.create_task(cache.get_or_compute("TSM", day, slow_compute)) for _ in range(5)]
+    await asyncio.sleep(0)
+    gate.set()
+    results = await asyncio.gather(*waiters)
+    assert len(calls) == 1 and all(r == results[0] for r in results)
+
+    for ticker in ("AAPL", "NVDA"):
+        async def compute(t=ticker):
+            return make_report(t, "2024-01-05T00:00:00Z", 1.0)
+
+        await cache.get_or_compute(ticker, day, compute)
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_report_endpoint_uses_cache_and_exposes_metrics():
+    base_md = str(settings.MARKET_DATA_BASE_URL)
+    base_rag = str(settings.RAG_BASE_URL)
+    bar = {
+        "ts": "2024-01-05T00:00:00Z",
+        "open": 100,
+        "high": 110,
+        "low": 95,
+        "close": 108,
+        "volume": 1000,
+        "rsi14": 55.0,
+        "macd_signal": "bullish",
+        "ma20_trend": "up",
+        "vol_vs_avg20": 1.2,
+    }
+
+    with respx.mock(assert_all_called=True) as router:
+        bars_route = router.get(f"{base_md}/internal/bars").mock(
+            side_effect=lambda request: Response(
+                200,
+                json={"results": {s: [bar] * 20 for s in request.url.params["ticker"].split(",")}},
+            )
+        )
+        router.post(f"{base_rag}/search_news").mock(return_value=Response(200, json=[]))
+
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            first = await ac.get("/report", params={"ticker": "TSM", "as_of": "2024-01-06T00:00:00Z"})
+            second = await ac.get("/report", params={"ticker": "TSM", "as_of": "2024-01-06T00:00:00Z"})
+            metrics = await ac.get("/internal/metrics")
+
+    assert first.status_code == 200 and second.json() == first.json()
+    assert bars_route.call_count == 1
+    cache_stats = metrics.json()["report_cache"]
+    assert cache_stats["hits"] == 1 and cache_stats["misses"] == 1
+    assert cache_stats["hit_rate"] == 0.5
@@ -0,0 +1,159 @@
+import asyncio
+import time
+
+import pytest
+import respx
+from httpx import AsyncClient, Response
+
+from app.main import app
+from app.core.config import settings
+from app.domain.sector_index import get_sector_index
+
+
+def make_bar(ts: str, close: float = 108.0) -> dict:
+    return {
+        "ts": ts,
+        "open": 100,
+        "high": 110,
+        "low": 95,
+        "close": close,
+        "volume": 1000,
+        "rsi14": 55.0,
+        "macd_signal": "bullish",
+        "ma20_trend": "up",
+        "vol_vs_avg20": 1.2,
+    }
+
+
+def bars_side_effect(delay: float, last_ts: str = "2024-01-10T00:00:00Z"):
+    async def handler(request):
+        symbols = request.url.params["ticker"].split(",")
+        await asyncio.sleep(delay)
+        results = {sym: [make_bar(last_ts, 100 + i)] * 20 for i, sym in enumerate(symbols)}
+        return Response(200, json={"timeframe": "1d", "adjust": "adj", "results": results})
+
+    return handler
+
+
+def news_side_effect(delay: float, ts: str = "2024-01-10T12:00:00Z"):
+    async def handler(request):
+        await asyncio.sleep(delay)
+        return Response(200, json=[{"title": "TSM news", "ts": ts, "doc_id": "doc-1", "url": "http://example.com/n"}])
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_report_latency_close_to_slowest_branch():
+    base_md = str(settings.MARKET_DATA_BASE_URL)
+    base_rag = str(settings.RAG_BASE_URL)
+
+    with respx.mock(assert_all_called=True) as router:
+        router.get(f"{base_md}/internal/bars").mock(side_effect=bars_side_effect(0.3))
+        router.post(f"{base_rag}/search_news").mock(side_effect=news_side_effect(0.3))
+
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            started = time.perf_counter()
+            resp = await ac.get("/report", params={"ticker": "TSM", "as_of": "2024-01-10T00:00:00Z"})
+            elapsed = time.perf_counter() - started
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["context"]["peer_strength_percentile"] is not None
+    assert len(data["context"]["top_news"]) == 1
+    # sequential would be 0.3 + 0.3 = 0.6s
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_report_slow_news_degrades(monkeypatch):
+    monkeypatch.setattr(settings, "NEWS_TIMEOUT_SECONDS", 0.1)
+    base_md = str(settings.MARKET_DATA_BASE_URL)
+    base_rag = str(settings.RAG_BASE_URL)
+
+    with respx.mock(assert_all_called=False) as router:
+        router.get(f"{base_md}/internal/bars").mock(side_effect=bars_side_effect(0.0))
+        router.post(f"{base_rag}/search_news").mock(side_effect=news_side_effect(1.0))
+
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            started = time.perf_counter()
+            resp = await ac.get("/report", params={"ticker": "TSM"})
+            elapsed = time.perf_counter() - started
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["context"]["sector"] == "Semiconductors"
+    assert data["context"]["peer_strength_percentile"] is not None
+    assert data["context"]["top_news"] == []
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_report_speculative_news_reconciled_to_trading_day():
+    base_md = str(settings.MARKET_DATA_BASE_URL)
+    base_rag = str(settings.RAG_BASE_URL)
+    calls = []
+
+    async def news_handler(request):
+        import json
+
+        as_of = json.loads(request.content)["as_of"]
+        calls.append(as_of)
+        # the speculative Sunday query sees a Saturday article; the Friday one must not
+        ts = "2024-01-06T09:00:00Z" if as_of.startswith("2024-01-07") else "2024-01-04T09:00:00Z"
+        return Response(200, json=[{"title": "news", "ts": ts, "doc_id": as_of, "url": None}])
+
+    with respx.mock(assert_all_called=True) as router:
+        router.get(f"{base_md}/internal/bars").mock(
+            side_effect=bars_side_effect(0.0, last_ts="2024-01-05T00:00:00Z")
+        )
+        router.post(f"{base_rag}/search_news").mock(side_effect=news_handler)
+
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            resp = await ac.get("/report", params={"ticker": "TSM", "as_of": "2024-01-07T00:00:00Z"})
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["as_of"] == "2024-01-05T00:00:00Z"
+    assert calls == ["2024-01-07T00:00:00Z", "2024-01-05T00:00:00Z"]
+    assert data["context"]["top_news"][0]["ts"] == "2024-01-04T09:00:00Z"
+
+
+@pytest.mark.asyncio
+async def test_report_makes_single_bars_call_for_target_and_peers():
+    base_md = str(settings.MARKET_DATA_BASE_URL)
+    base_rag = str(settings.RAG_BASE_URL)
+
+    with respx.mock(assert_all_called=True) as router:
+        bars_route = router.get(f"{base_md}/internal/bars").mock(side_effect=bars_side_effect(0.0))
+        router.post(f"{base_rag}/search_news").mock(side_effect=news_side_effect(0.0))
+
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            resp = await ac.get("/report", params={"ticker": "TSM", "as_of": "2024-01-10T00:00:00Z"})
+
+    assert resp.status_code == 200
+    assert bars_route.call_count == 1
+    symbols = bars_route.calls.last.request.url.params["ticker"].split(",")
+    # target first, listed once even though it is also in its own peer list
+    assert symbols[0] == "TSM"
+    assert symbols.count("TSM") == 1
+    assert set(symbols) == set(get_sector_index().members("Semiconductors"))
+    assert resp.json()["context"]["peer_strength_percentile"] is not None
+
+
+@pytest.mark.asyncio
+async def test_report_keeps_news_from_the_effective_trading_day():
+    base_md = str(settings.MARKET_DATA_BASE_URL)
+    base_rag = str(settings.RAG_BASE_URL)
+
+    with respx.mock(assert_all_called=True) as router:
+        router.get(f"{base_md}/internal/bars").mock(side_effect=bars_side_effect(0.0))
+        news_route = router.post(f"{base_rag}/search_news").mock(side_effect=news_side_effect(0.0))
+
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            # mid-session: the bar is stamped at midnight, the article at noon of the same day
+            resp = await ac.get("/report", params={"ticker": "TSM", "as_of": "2024-01-10T18:00:00Z"})
+
+    assert resp.status_code == 200
+    assert resp.json()["context"]["top_news"][0]["ts"] == "2024-01-10T12:00:00Z"
+    assert news_route.call_count == 1
@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+import pytest
+import respx
+from httpx import AsyncClient, Response
+
+from app.main import app
+from app.core.config import settings
+from app.services.report_service import stream_report
+
+
+def make_bars(symbols):
+    return {
+        s: [
+            {
+                "ts": f"2024-01-{d + 1:02d}T00:00:00Z",
+                "close": 100 + d * 0.1 * (i + 1),
+                "rsi14": 55.0,
+                "macd_signal": "bullish",
+                "ma20_trend": "up",
+                "vol_vs_avg20": 1.2,
+            }
+            for d in range(20)
+        ]
+        for i, s in enumerate(symbols)
+    }
+
+
+def bars_handler(peer_delay: float = 0.0):
+    async def handler(request):
+        symbols = request.url.params["ticker"].split(",")
+        if symbols != ["TSM"]:
+            await asyncio.sleep(peer_delay)
+        return Response(200, json={"results": make_bars(symbols)})
+
+    return handler
+
+
+def parse_sse(text: str):
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_sections_then_report():
+    base_md = str(settings.MARKET_DATA_BASE_URL)
+    base_rag = str(settings.RAG_BASE_URL)
+
+    with respx.mock(assert_all_called=True) as router:
+        bars_route = router.get(f"{base_md}/internal/bars").mock(side_effect=bars_handler(peer_delay=0.2))
+        router.post(f"{base_rag}/search_news").mock(
+            return_value=Response(200, json=[{"title": "n", "ts": "2024-01-19T09:00:00Z", "doc_id": "d1"}])
+        )
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            resp = await ac.get("/report/stream", params={"ticker": "TSM", "as_of": "2024-01-20T00:00:00Z"})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = parse_sse(resp.text)
+    names = [name for name, _ in events]
+    # the slow peers call finishes after news
+    assert names == ["price", "news", "peers", "report"]
+
+    price, news, peers, report = (payload for _, payload in events)
+    assert price["spot"] == report["spot"] and price["indicators"] == report["indicators"]
+    assert peers["sector"] == "Semiconductors" and peers["peer_strength_percentile"] is not None
+    assert news["top_news"] == report["context"]["top_news"]
+    assert report["context"]["peer_strength_percentile"] == peers["peer_strength_percentile"]
+    # target on its own, peers in a separate concurrent call
+    requested = sorted((c.request.url.params["ticker"].split(",") for c in bars_route.calls), key=len)
+    assert len(requested) == 2 and requested[0] == ["TSM"] and "TSM" not in requested[1]
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_missing_ticker_as_error_event():
+    base_md = str(settings.MARKET_DATA_BASE_URL)
+    base_rag = str(settings.RAG_BASE_URL)
+
+    with respx.mock(assert_all_called=False) as router:
+        router.get(f"{base_md}/internal/bars").mock(return_value=Response(200, json={"results": {}}))
+        router.post(f"{base_rag}/search_news").mock(return_value=Response(200, json=[]))
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            resp = await ac.get("/report/stream", params={"ticker": "ZZZ"})
+
+    assert parse_sse(resp.text) == [("error", {"status_code": 404, "detail": "no bars for ticker in range"})]
+
+
+@pytest.mark.asyncio
+async def test_closing_stream_cancels_upstream_calls():
+    base_md = str(settings.MARKET_DATA_BASE_URL)
+    base_rag = str(settings.RAG_BASE_URL)
+    cancelled = []
+
+    async def hanging_news(request):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append("news")
+            raise
+        return Response(200, json=[])
+
+    with respx.mock(assert_all_called=False) as router:
+        router.get(f"{base_md}/internal/bars").mock(side_effect=bars_handler(peer_delay=10))
+        router.post(f"{base_rag}/search_news").mock(side_effect=hanging_news)
+
+        stream = stream_report("TSM", None, budget_seconds=30.0)
+        event, _ = await stream.__anext__()
+        assert event == "price"
+        # client disconnects after the first section
+        await asyncio.wait_for(stream.aclose(), timeout=1.0)
+
+    assert cancelled == ["news"]
+    pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task() and not t.done()]
+    assert pending == []
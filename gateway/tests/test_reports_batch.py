@@ -0,0 +1,144 @@
+import json
+
+import pytest
+import respx
+from httpx import AsyncClient, Response
+
+from app.main import app
+from app.core.config import settings
+from app.domain.sector_index import get_sector_index
+
+
+def make_bars(start_close: float, step: float) -> list:
+    return [
+        {
+            "ts": f"2024-01-{i + 1:02d}T00:00:00Z",
+            "open": start_close,
+            "high": start_close + 1,
+            "low": start_close - 1,
+            "close": start_close + i * step,
+            "volume": 1000,
+            "rsi14": 50.0,
+            "macd_signal": "neutral",
+            "ma20_trend": "flat",
+            "vol_vs_avg20": 1.0,
+        }
+        for i in range(20)
+    ]
+
+
+def bars_handler(missing=()):
+    def handler(request):
+        symbols = request.url.params["ticker"].split(",")
+        results = {s: ([] if s in missing else make_bars(100, 0.1 * (i + 1))) for i, s in enumerate(symbols)}
+        return Response(200, json={"timeframe": "1d", "adjust": "adj", "results": results})
+
+    return handler
+
+
+def news_handler(request):
+    reqs = json.loads(request.content)["requests"]
+    return Response(
+        200,
+        json={
+            "results": [
+                {
+                    "as_of": r["as_of"],
+                    "query": r["query"],
+                    "top_k": 1,
+                    "results": [
+                        {
+                            "doc_id": f"news:{r['query']}",
+                            "title": f"{r['query']} news",
+                            "url": None,
+                            "published_at": "2024-01-19T08:00:00Z",
+                            "snippet": "",
+                            "score": 1.0,
+                            "ticker": r["query"],
+                        }
+                    ],
+                }
+                for r in reqs
+            ]
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_reports_batches_union_of_symbols(monkeypatch):
+    monkeypatch.setattr(settings, "MARKET_DATA_MAX_TICKERS", 4)
+    base_md = str(settings.MARKET_DATA_BASE_URL)
+    base_rag = str(settings.RAG_BASE_URL)
+
+    with respx.mock(assert_all_called=True) as router:
+        bars_route = router.get(f"{base_md}/internal/bars").mock(side_effect=bars_handler())
+        news_route = router.post(f"{base_rag}/search_news_batch").mock(side_effect=news_handler)
+
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            resp = await ac.get("/reports", params={"tickers": "TSM,AAPL,ZZZ,TSM", "as_of": "2024-01-20T00:00:00Z"})
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["total"] == 3 and data["next_page"] is None
+    assert [r["ticker"] for r in data["results"]] == ["TSM", "AAPL", "ZZZ"]
+
+    # union of both sectors plus ZZZ, each symbol requested once in calls of <= 4
+    index = get_sector_index()
+    union = set(index.members("Semiconductors")) | set(index.members("Technology Hardware")) | {"ZZZ"}
+    requested = [c.request.url.params["ticker"].split(",") for c in bars_route.calls]
+    assert bars_route.call_count == -(-len(union) // 4)
+    assert all(len(batch) <= 4 for batch in requested)
+    flat = [s for batch in requested for s in batch]
+    assert len(flat) == len(set(flat)) and set(flat) == union
+    assert news_route.call_count == 1
+
+    by_ticker = {r["ticker"]: r for r in data["results"]}
+    assert by_ticker["TSM"]["context"]["sector"] == "Semiconductors"
+    assert 0.0 <= by_ticker["TSM"]["context"]["peer_strength_percentile"] <= 1.0
+    assert by_ticker["ZZZ"]["context"]["sector"] is None
+    assert by_ticker["AAPL"]["context"]["top_news"][0]["doc_id"] == "news:AAPL"
+    assert by_ticker["AAPL"]["context"]["top_news"][0]["ts"] == "2024-01-19T08:00:00Z"
+
+
+@pytest.mark.asyncio
+async def test_reports_paging_and_errors():
+    base_md = str(settings.MARKET_DATA_BASE_URL)
+    base_rag = str(settings.RAG_BASE_URL)
+
+    with respx.mock(assert_all_called=False) as router:
+        router.get(f"{base_md}/internal/bars").mock(side_effect=bars_handler(missing={"ZZY"}))
+        router.post(f"{base_rag}/search_news_batch").mock(side_effect=news_handler)
+
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            first = await ac.get("/reports", params={"tickers": "ZZX,ZZY,ZZW", "page_size": 2})
+            second = await ac.get("/reports", params={"tickers": "ZZX,ZZY,ZZW", "page_size": 2, "page": 2})
+
+    assert first.status_code == 200 and second.status_code == 200
+    p1, p2 = first.json(), second.json()
+    assert p1["next_page"] == 2 and p2["next_page"] is None
+    assert [r["ticker"] for r in p1["results"]] == ["ZZX"]
+    assert p1["errors"] == {"ZZY": "no bars for ticker in range"}
+    assert [r["ticker"] for r in p2["results"]] == ["ZZW"]
+
+
+@pytest.mark.asyncio
+async def test_reports_news_failure_degrades():
+    base_md = str(settings.MARKET_DATA_BASE_URL)
+    base_rag = str(settings.RAG_BASE_URL)
+
+    with respx.mock(assert_all_called=True) as router:
+        router.get(f"{base_md}/internal/bars").mock(side_effect=bars_handler())
+        router.post(f"{base_rag}/search_news_batch").mock(return_value=Response(500))
+
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            resp = await ac.get("/reports", params={"tickers": "TSM"})
+
+    assert resp.status_code == 200
+    assert resp.json()["results"][0]["context"]["top_news"] == []
+
+
+@pytest.mark.asyncio
+async def test_reports_validation():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        resp = await ac.get("/reports", params={"tickers": " , "})
+    assert resp.status_code == 422
@@ -0,0 +1,65 @@
+import pytest
+from httpx import AsyncClient
+
+from app.main import app
+from app.core.config import settings
+from app.domain import sector_index as sector_index_module
+from app.domain.sector_index import SectorIndex, get_sector_index, reload_sector_index
+
+
+def test_bundled_universe_lookups():
+    index = get_sector_index()
+    assert len(index) > 200
+    assert index.sector_of("tsm") == "Semiconductors"
+    assert index.sector_of("AAPL") == "Technology Hardware"
+    assert index.industry_of("ASML") == "Semiconductor Equipment"
+    assert index.sector_of("ZZZ") is None
+
+    sector, peers = index.peers_of("NVDA")
+    assert sector == "Semiconductors"
+    assert "NVDA" in peers and "TSM" in peers and "AAPL" not in peers
+    # members of every sector partition the universe
+    assert sum(len(index.members(s)) for s in index.sectors) == len(index)
+
+
+def test_index_is_compact_and_contiguous():
+    rows = [(f"T{i:05d}", f"S{i % 37}", f"I{i % 111}") for i in range(10_000)]
+    index = SectorIndex(rows)
+    assert len(index) == 10_000 and len(index.sectors) == 37
+    assert index.sector_ids.itemsize == 2 and index.offsets.itemsize == 4
+    assert index.members("S5") == sorted(f"T{i:05d}" for i in range(10_000) if i % 37 == 5)
+    assert index.peers_of("T00042") == ("S5", index.members("S5"))
+
+
+def test_reload_swaps_index(tmp_path, monkeypatch):
+    path = tmp_path / "universe.csv"
+    path.write_text("ticker,sector,industry\nAAA,Widgets,Gadgets\nBBB,Widgets,Gadgets\n")
+    monkeypatch.setattr(sector_index_module, "_current", None)
+    try:
+        index = reload_sector_index(path)
+        assert get_sector_index() is index
+        assert index.peers_of("AAA") == ("Widgets", ["AAA", "BBB"])
+        assert index.sector_of("TSM") is None
+    finally:
+        reload_sector_index()
+
+
+@pytest.mark.asyncio
+async def test_reload_endpoint(tmp_path, monkeypatch):
+    path = tmp_path / "universe.csv"
+    path.write_text("ticker,sector,industry\nAAA,Widgets,Gadgets\n")
+    monkeypatch.setattr(settings, "SECTOR_UNIVERSE_PATH", str(path))
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            resp = await ac.post("/internal/sector_index/reload")
+        assert resp.json() == {"tickers": 1, "sectors": 1}
+        assert get_sector_index().sector_of("AAA") == "Widgets"
+
+        monkeypatch.setattr(settings, "SECTOR_UNIVERSE_PATH", str(tmp_path / "missing.csv"))
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            resp = await ac.post("/internal/sector_index/reload")
+        assert resp.status_code == 400
+        assert get_sector_index().sector_of("AAA") == "Widgets"
+    finally:
+        monkeypatch.setattr(settings, "SECTOR_UNIVERSE_PATH", "")
+        reload_sector_index()
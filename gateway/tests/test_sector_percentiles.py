@@ -0,0 +1,125 @@
+from datetime import date, datetime, time, timedelta, timezone
+
+import numpy as np
+import pytest
+import respx
+from httpx import AsyncClient, Response
+
+from app.main import app
+from app.core.config import settings
+from app.services.report_service import _expected_trading_day
+from app.services.sector_percentiles import SectorPercentileEngine, SectorReturns, sector_percentiles
+
+
+def test_percentile_matches_rank_definition():
+    rng = np.random.default_rng(3)
+    returns = {f"S{i}": float(r) for i, r in enumerate(rng.normal(size=500))}
+    table = SectorReturns(returns)
+    population = list(returns.values())
+    for value in (-1.0, 0.0, population[7], 2.5):
+        expected = sum(1 for v in population if v <= value) / len(population)
+        assert table.percentile(value) == pytest.approx(expected)
+
+
+def test_upsert_keeps_array_sorted():
+    table = SectorReturns({"A": 0.1, "B": -0.2, "C": 0.3, "D": None})
+    assert len(table) == 3
+    assert table.upsert("A", 0.5)
+    assert not table.upsert("A", 0.5)
+    assert table.upsert("D", 0.0)
+    assert table.upsert("B", None)
+    assert table.values.tolist() == [0.0, 0.3, 0.5]
+    assert table.by_symbol == {"A": 0.5, "C": 0.3, "D": 0.0}
+    assert table.percentile(0.3) == pytest.approx(2 / 3)
+    assert SectorReturns({}).percentile(0.1) is None
+
+
+def test_engine_updates_in_place_and_evicts():
+    engine = SectorPercentileEngine(max_tables=2)
+    day = date(2024, 1, 10)
+    first = engine.update("Semis", day, {"A": 0.1, "B": 0.2})
+    again = engine.update("Semis", day, {"A": 0.1, "B": 0.4})
+    assert again is first and engine.upserts == 1 and engine.builds == 1
+    assert first.values.tolist() == [0.1, 0.4]
+
+    engine.update("Semis", date(2024, 1, 11), {"A": 0.0})
+    engine.update("Semis", date(2024, 1, 12), {"A": 0.0})
+    assert engine.get("Semis", day) is None
+    assert engine.stats()["tables"] == 2
+
+
+def rising_bars(step: float) -> list:
+    return [{"ts": f"2024-01-{i + 1:02d}T00:00:00Z", "close": 100 + i * step} for i in range(20)]
+
+
+@pytest.mark.asyncio
+async def test_final_day_table_skips_peer_fetch():
+    base_md = str(settings.MARKET_DATA_BASE_URL)
+    base_rag = str(settings.RAG_BASE_URL)
+    requested = []
+
+    def handler(request):
+        symbols = request.url.params["ticker"].split(",")
+        requested.append(symbols)
+        results = {s: rising_bars(0.5 if s == "TSM" else 0.1 * (i + 1)) for i, s in enumerate(symbols)}
+        return Response(200, json={"results": results})
+
+    with respx.mock(assert_all_called=True) as router:
+        router.get(f"{base_md}/internal/bars").mock(side_effect=handler)
+        router.post(f"{base_rag}/search_news").mock(return_value=Response(200, json=[]))
+
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            first = await ac.get("/report", params={"ticker": "TSM", "as_of": "2024-01-20T00:00:00Z"})
+            second = await ac.get("/report", params={"ticker": "NVDA", "as_of": "2024-01-20T00:00:00Z"})
+            metrics = await ac.get("/internal/metrics")
+
+    assert first.status_code == 200 and second.status_code == 200
+    assert first.json()["context"]["peer_strength_percentile"] is not None
+    # the Semiconductors table for 2024-01-20 is final, so NVDA only needs its own bars
+    assert len(requested[0]) > 1 and requested[1] == ["NVDA"]
+    assert metrics.json()["sector_percentiles"]["hits"] == 1
+
+
+def test_expected_trading_day(monkeypatch):
+    monkeypatch.setattr(settings, "MARKET_SESSION_CLOSE_UTC", time(21, 0))
+    wednesday = datetime(2024, 1, 10, 15, 0, tzinfo=timezone.utc)
+    # past days are their own trading day; weekends roll back to Friday
+    assert _expected_trading_day(datetime(2024, 1, 3, tzinfo=timezone.utc), now=wednesday) == date(2024, 1, 3)
+    assert _expected_trading_day(datetime(2024, 1, 7, tzinfo=timezone.utc), now=wednesday) == date(2024, 1, 5)
+    # today resolves to the previous trading day until its session has closed
+    assert _expected_trading_day(wednesday, now=wednesday) == date(2024, 1, 9)
+    monday = datetime(2024, 1, 8, 15, 0, tzinfo=timezone.utc)
+    assert _expected_trading_day(monday, now=monday) == date(2024, 1, 5)
+    after_close = datetime(2024, 1, 10, 22, 0, tzinfo=timezone.utc)
+    assert _expected_trading_day(after_close, now=after_close) == date(2024, 1, 10)
+
+
+@pytest.mark.asyncio
+async def test_live_report_with_final_table_fetches_only_target():
+    base_md = str(settings.MARKET_DATA_BASE_URL)
+    base_rag = str(settings.RAG_BASE_URL)
+    day = _expected_trading_day(datetime.now(timezone.utc))
+    sector_percentiles.update("Semiconductors", day, {"NVDA": 0.01, "AMD": 0.015, "INTC": 0.03})
+    requested = []
+
+    def handler(request):
+        symbols = request.url.params["ticker"].split(",")
+        requested.append(symbols)
+        bars = [
+            {"ts": (day - timedelta(days=19 - i)).isoformat() + "T00:00:00Z", "close": 100 + i * 0.1}
+            for i in range(20)
+        ]
+        return Response(200, json={"results": {s: bars for s in symbols}})
+
+    with respx.mock(assert_all_called=True) as router:
+        router.get(f"{base_md}/internal/bars").mock(side_effect=handler)
+        router.post(f"{base_rag}/search_news").mock(return_value=Response(200, json=[]))
+
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            resp = await ac.get("/report", params={"ticker": "TSM"})
+
+    assert resp.status_code == 200
+    assert resp.json()["as_of"].startswith(day.isoformat())
+    # returns 0.019 sits between AMD and INTC
+    assert resp.json()["context"]["peer_strength_percentile"] == pytest.approx(2 / 3)
+    assert requested == [["TSM"]]
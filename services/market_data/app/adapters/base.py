@@ -2,18 +2,23 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Dict
+from typing import Dict, List, Optional
 
 import pandas as pd
 
+from ..core.deadline import Deadline
+
 
 class BarsAdapter(ABC):
     @abstractmethod
-    def get_bars(self, tickers: List[str], start: datetime, end: datetime, tf: str) -> Dict[str, pd.DataFrame]:
+    def get_bars(
+        self, tickers: List[str], start: datetime, end: datetime, tf: str, deadline: Optional[Deadline] = None
+    ) -> Dict[str, pd.DataFrame]:
         """Fetch bars for given tickers and timeframe.
 
         Returns mapping ticker -> DataFrame indexed by timestamp with columns
-        ['open','high','low','close','volume'].
+        ['open','high','low','close','volume']. When ``deadline`` expires,
+        tickers not yet fetched are left out of the mapping.
         """
         raise NotImplementedError
 
@@ -7,6 +7,7 @@ from typing import Dict, List, Optional
 import pandas as pd
 import yfinance as yf
 
+from ..core.deadline import Deadline
 from .base import BarsAdapter
 
 
@@ -76,10 +77,15 @@ class FreeSourceAdapter(BarsAdapter):
             df = df.set_index("ts")
         return df[["open", "high", "low", "close", "volume"]].sort_index()
 
-    def get_bars(self, tickers: List[str], start: datetime, end: datetime, tf: str) -> Dict[str, pd.DataFrame]:
+    def get_bars(
+        self, tickers: List[str], start: datetime, end: datetime, tf: str, deadline: Optional[Deadline] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """Bars per ticker; stops early once ``deadline`` has passed, leaving later tickers out."""
         results: Dict[str, pd.DataFrame] = {}
         interval = TIMEFRAME_TO_YF.get(tf, "1d")
         for ticker in tickers:
+            if deadline is not None and deadline.expired():
+                break
             try:
                 df = yf.download(ticker, start=start, end=end, interval=interval, progress=False, auto_adjust=False)
                 if df is None or df.empty:
@@ -0,0 +1,7 @@
+from .correlation import CorrelationCache, RollingCovariance, align_returns
+
+__all__ = [
+    "CorrelationCache",
+    "RollingCovariance",
+    "align_returns",
+]
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def align_returns(bars_map: Dict[str, pd.DataFrame], tickers: List[str]) -> pd.DataFrame:
+    """Align close-to-close returns of many tickers into one (dates x tickers) frame.
+
+    Dates are the union of all trading days; a return is NaN when a ticker has
+    no bar on that day or on its previous bar date, so gaps never leak into
+    neighbouring observations.
+    """
+    closes: Dict[str, pd.Series] = {}
+    for tkr in tickers:
+        df = bars_map.get(tkr)
+        if df is None or df.empty or "close" not in df.columns:
+            closes[tkr] = pd.Series(dtype=float)
+            continue
+        close = df["close"]
+        if isinstance(close, pd.DataFrame):
+            close = close.iloc[:, 0]
+        close = close.astype(float)
+        closes[tkr] = close[~close.index.duplicated(keep="last")].sort_index()
+    frame = pd.DataFrame(closes, columns=tickers).sort_index()
+    return frame.pct_change(fill_method=None).iloc[1:]
+
+
+class RollingCovariance:
+    """Pairwise-complete rolling covariance/correlation over a fixed window.
+
+    Keeps per-pair running sums (count, sum x, sum x^2, sum xy) so sliding the
+    window by one row costs O(n^2) instead of recomputing O(window * n^2).
+    Missing values only drop the pairs they touch. The sums are rebuilt from
+    the ring buffer every ``rebase_every`` pushes to bound float drift.
+    """
+
+    def __init__(self, n: int, window: int, rebase_every: Optional[int] = None) -> None:
+        if window < 2:
+            raise ValueError("window must be >= 2")
+        self.n = n
+        self.window = window
+        self.rebase_every = rebase_every or window * 10
+        self._values = np.zeros((window, n))
+        self._masks = np.zeros((window, n))
+        self._filled = 0
+        self._head = 0
+        self._pushes = 0
+        self._count = np.zeros((n, n))
+        self._sx = np.zeros((n, n))
+        self._sxx = np.zeros((n, n))
+        self._sxy = np.zeros((n, n))
+        self.last_key: Optional[Hashable] = None
+
+    def _accumulate(self, v: np.ndarray, m: np.ndarray, sign: float) -> None:
+        self._count += sign * np.outer(m, m)
+        self._sx += sign * np.outer(v, m)
+        self._sxx += sign * np.outer(v * v, m)
+        self._sxy += sign * np.outer(v, v)
+
+    def push(self, row: np.ndarray, key: Optional[Hashable] = None) -> None:
+        row = np.asarray(row, dtype=float)
+        m = np.isfinite(row).astype(float)
+        v = np.where(m > 0, row, 0.0)
+
+        if self._filled == self.window:
+            self._accumulate(self._values[self._head], self._masks[self._head], -1.0)
+        else:
+            self._filled += 1
+        self._values[self._head] = v
+        self._masks[self._head] = m
+        self._head = (self._head + 1) % self.window
+        self._accumulate(v, m, 1.0)
+
+        self._pushes += 1
+        if self._pushes % self.rebase_every == 0:
+            self._rebase()
+        if key is not None:
+            self.last_key = key
+
+    def _rebase(self) -> None:
+        rows = self._values[: self._filled] if self._filled < self.window else self._values
+        masks = self._masks[: self._filled] if self._filled < self.window else self._masks
+        self._count = masks.T @ masks
+        self._sx = rows.T @ masks
+        self._sxx = (rows * rows).T @ masks
+        self._sxy = rows.T @ rows
+
+    @property
+    def observations(self) -> int:
+        return self._filled
+
+    def _centered(self) -> Tuple[np.ndarray, np.ndarray]:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cnt = np.where(self._count > 0, self._count, np.nan)
+            cross = self._sxy - self._sx * self._sx.T / cnt
+        return cross, cnt
+
+    def cov(self) -> np.ndarray:
+        cross, cnt = self._centered()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = cross / (cnt - 1.0)
+        out[~(cnt > 1)] = np.nan
+        return out
+
+    def corr(self) -> np.ndarray:
+        cross, cnt = self._centered()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            var_i = self._sxx - self._sx**2 / cnt
+            var_j = var_i.T
+            out = cross / np.sqrt(var_i * var_j)
+        out[~(cnt > 1)] = np.nan
+        out = np.clip(out, -1.0, 1.0)
+        diag = np.diag(self.cov())
+        out[np.diag_indices(self.n)] = np.where(np.isfinite(diag) & (diag > 0), 1.0, np.nan)
+        return out
+
+
+@dataclass
+class _CacheEntry:
+    engine: RollingCovariance
+    as_of: Optional[pd.Timestamp]
+
+
+class CorrelationCache:
+    """LRU of rolling-covariance engines keyed by (universe, window).
+
+    A request whose returns extend past the cached engine's last date only
+    pushes the new rows; anything else rebuilds the engine from scratch.
+    Engines are mutated in place, so callers hold ``lock`` while updating
+    and reading them.
+    """
+
+    def __init__(self, max_entries: int = 8) -> None:
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Tuple[Tuple[str, ...], int], _CacheEntry]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def update(self, tickers: List[str], window: int, returns: pd.DataFrame) -> Tuple[RollingCovariance, bool]:
+        """Return the engine for this universe advanced to the last row of ``returns``.
+
+        The boolean is True when a cached engine was reused (possibly after
+        pushing only the new rows).
+        """
+        key = (tuple(tickers), window)
+        entry = self._entries.get(key)
+        last = returns.index[-1] if len(returns) else None
+
+        if entry is not None and entry.as_of is not None and entry.as_of in returns.index:
+            newer = returns.loc[returns.index > entry.as_of]
+            for ts, row in zip(newer.index, newer.to_numpy()):
+                entry.engine.push(row, key=ts)
+            entry.as_of = last if len(newer) else entry.as_of
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.engine, True
+
+        engine = RollingCovariance(len(tickers), window)
+        tail = returns.iloc[-window:]
+        for ts, row in zip(tail.index, tail.to_numpy()):
+            engine.push(row, key=ts)
+        self._entries[key] = _CacheEntry(engine=engine, as_of=last)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self.misses += 1
+        return engine, False
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -1,21 +1,33 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Literal, Optional
+from typing import Dict, List, Literal, Optional, Tuple
 
+import numpy as np
 import pandas as pd
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel, Field
 
 from ..adapters.free_source import FreeSourceAdapter
+from ..analytics import CorrelationCache, align_returns
 from ..core.config import settings
+from ..core.deadline import Deadline, request_deadline
 from ..indicators import compute_indicators
+from ..simulation import estimate_log_returns, simulate_paths
 from ..utils.adjust import apply_dividends, apply_splits
-from ..utils.validators import validate_date_range, validate_timeframe, validate_tickers
+from ..utils.validators import (
+    validate_date_range,
+    validate_simulation,
+    validate_tickers,
+    validate_timeframe,
+    validate_universe,
+)
 
 router = APIRouter()
 
+correlation_cache = CorrelationCache(max_entries=settings.CORRELATION_CACHE_SIZE)
+
 @router.get("/healthz")
 async def health_check():
     return {"status": "ok", "service": "market_data"}
@@ -39,6 +51,10 @@ class BarsResponse(BaseModel):
     timeframe: Literal["1d", "1h", "5m"]
     adjust: Literal["raw", "adj"]
     results: Dict[str, List[BarOut]]
+    # set when the caller's deadline cut the work short; `skipped` tickers
+    # were not fetched or not computed and are absent from `results`
+    partial: bool = False
+    skipped: List[str] = []
 
 
 @router.get("/internal/bars", response_model=BarsResponse)
@@ -48,6 +64,7 @@ async def get_internal_bars(
     end: str = Query(...),
     tf: Literal["1d", "1h", "5m"] = Query("1d"),
     adjust: Literal["raw", "adj"] = Query("raw"),
+    deadline: Deadline = Depends(request_deadline),
 ):
     tickers = [t.strip().upper() for t in ticker.split(",") if t.strip()]
     validate_tickers(tickers)
@@ -60,13 +77,17 @@ async def get_internal_bars(
     sample_dir = Path(__file__).resolve().parents[1] / "data" / "sample"
     adapter = FreeSourceAdapter(sample_dir)
 
-    bars_map = adapter.get_bars(tickers, start_dt, end_dt, tf)
+    # stage 1: fetch (stops between tickers once the caller's deadline passes)
+    bars_map = adapter.get_bars(tickers, start_dt, end_dt, tf, deadline=deadline)
 
     # For simplicity, corporate actions are empty in I1.
     corporate_actions: List[dict] = []
     results: Dict[str, List[BarOut]] = {}
 
+    # stage 2: indicators + serialization, ticker by ticker in request order
     for tkr, df in bars_map.items():
+        if deadline.expired():
+            break
         if df.empty:
             results[tkr] = []
             continue
@@ -110,9 +131,204 @@ async def get_internal_bars(
             )
         results[tkr] = out_rows
 
+    skipped = [t for t in tickers if t not in results]
     return BarsResponse(
         as_of=datetime.now(tz=timezone.utc),
         timeframe=tf,
         adjust=adjust,
         results=results,
+        partial=bool(skipped),
+        skipped=skipped,
+    )
+
+
+class BandPoint(BaseModel):
+    step: int
+    p5: float
+    p25: float
+    p50: float
+    p75: float
+    p95: float
+
+
+class RiskFigure(BaseModel):
+    confidence: float
+    var: float
+    es: float
+
+
+class SimulateResponse(BaseModel):
+    as_of: datetime
+    ticker: str
+    method: Literal["gbm", "bootstrap"]
+    spot: float
+    paths: int
+    horizon: int
+    seed: int
+    mu: float
+    sigma: float
+    bands: List[BandPoint]
+    risk: List[RiskFigure]
+    prob_touch_up: float
+    prob_touch_down: float
+    touch_up_level: float
+    touch_down_level: float
+
+
+# CPU-heavy handlers below are plain functions so FastAPI runs them in its
+# threadpool instead of blocking the event loop that serves /internal/bars.
+@router.get("/internal/simulate", response_model=SimulateResponse)
+def get_internal_simulate(
+    ticker: str = Query(..., description="Single ticker"),
+    paths: int = Query(10_000),
+    horizon: int = Query(20, description="Trading days ahead"),
+    method: Literal["gbm", "bootstrap"] = Query("gbm"),
+    lookback_days: int = Query(365, ge=30, le=365 * 5),
+    end: Optional[str] = Query(None, description="Estimation window end, default today"),
+    seed: int = Query(42),
+    touch_up: float = Query(0.1, gt=0),
+    touch_down: float = Query(0.1, gt=0, lt=1),
+):
+    tkr = ticker.strip().upper()
+    validate_tickers([tkr] if tkr else [])
+    validate_simulation(paths, horizon)
+
+    end_dt = (
+        pd.to_datetime(end).to_pydatetime().replace(tzinfo=timezone.utc)
+        if end
+        else datetime.now(tz=timezone.utc)
+    )
+    start_dt = end_dt - timedelta(days=lookback_days)
+
+    sample_dir = Path(__file__).resolve().parents[1] / "data" / "sample"
+    adapter = FreeSourceAdapter(sample_dir)
+    df = adapter.get_bars([tkr], start_dt, end_dt, "1d").get(tkr)
+    if df is None or df.empty:
+        raise HTTPException(status_code=404, detail="no bars for ticker in range")
+
+    close = df.sort_index()["close"]
+    if isinstance(close, pd.DataFrame):
+        close = close.iloc[:, 0]
+    log_returns = estimate_log_returns(close.tolist())
+    if log_returns.size < 20:
+        raise HTTPException(status_code=422, detail="not enough bars to estimate dynamics")
+
+    sim = simulate_paths(
+        log_returns,
+        spot=float(close.iloc[-1]),
+        paths=paths,
+        horizon=horizon,
+        method=method,
+        seed=seed,
+        touch_up=touch_up,
+        touch_down=touch_down,
     )
+
+    bands = [
+        BandPoint(
+            step=i + 1,
+            p5=sim.bands[5.0][i],
+            p25=sim.bands[25.0][i],
+            p50=sim.bands[50.0][i],
+            p75=sim.bands[75.0][i],
+            p95=sim.bands[95.0][i],
+        )
+        for i in range(horizon)
+    ]
+    return SimulateResponse(
+        as_of=pd.to_datetime(close.index[-1]).to_pydatetime().replace(tzinfo=timezone.utc),
+        ticker=tkr,
+        method=method,
+        spot=float(close.iloc[-1]),
+        paths=paths,
+        horizon=horizon,
+        seed=seed,
+        mu=sim.mu,
+        sigma=sim.sigma,
+        bands=bands,
+        risk=[RiskFigure(confidence=c, var=sim.var[c], es=sim.es[c]) for c in sorted(sim.var)],
+        prob_touch_up=sim.prob_touch_up,
+        prob_touch_down=sim.prob_touch_down,
+        touch_up_level=sim.touch_up_level,
+        touch_down_level=sim.touch_down_level,
+    )
+
+
+class CorrelationResponse(BaseModel):
+    as_of: Optional[datetime]
+    window: int
+    observations: int
+    tickers: List[str]
+    corr: Optional[List[List[Optional[float]]]] = None
+    cov: Optional[List[List[Optional[float]]]] = None
+
+
+def _matrix_to_json(mat: np.ndarray) -> List[List[Optional[float]]]:
+    # float32 precision keeps the payload compact; NaN (no overlap) -> null
+    m32 = mat.astype(np.float32)
+    return [[float(v) if np.isfinite(v) else None for v in row] for row in m32.tolist()]
+
+
+@router.get("/internal/correlation", response_model=CorrelationResponse)
+def get_internal_correlation(
+    tickers: str = Query(..., description="Comma separated tickers (2..500)"),
+    window: int = Query(60, ge=5, le=504, description="Rolling window in trading days"),
+    end: Optional[str] = Query(None, description="Window end date, default today"),
+    matrix: Literal["corr", "cov", "both"] = Query("corr"),
+    format: Literal["json", "f32"] = Query("json"),
+):
+    tkrs = [t.strip().upper() for t in tickers.split(",") if t.strip()]
+    validate_universe(tkrs)
+
+    end_dt = (
+        pd.to_datetime(end).to_pydatetime().replace(tzinfo=timezone.utc)
+        if end
+        else datetime.now(tz=timezone.utc)
+    )
+    # ~252 trading days per 365 calendar days, plus slack for holidays
+    start_dt = end_dt - timedelta(days=int(window * 365 / 252) + 14)
+    validate_date_range(start_dt, end_dt)
+
+    sample_dir = Path(__file__).resolve().parents[1] / "data" / "sample"
+    adapter = FreeSourceAdapter(sample_dir)
+    bars_map = adapter.get_bars(tkrs, start_dt, end_dt, "1d")
+    returns = align_returns(bars_map, tkrs)
+    if returns.empty:
+        raise HTTPException(status_code=404, detail="no bars for tickers in range")
+
+    mats: List[Tuple[str, np.ndarray]] = []
+    # cached engines are shared across threadpool workers; read them under the same lock
+    with correlation_cache.lock:
+        engine, _ = correlation_cache.update(tkrs, window, returns)
+        as_of = pd.to_datetime(engine.last_key).to_pydatetime() if engine.last_key is not None else None
+        observations = engine.observations
+        if matrix in ("corr", "both"):
+            mats.append(("corr", engine.corr()))
+        if matrix in ("cov", "both"):
+            mats.append(("cov", engine.cov()))
+
+    if format == "f32":
+        body = b"".join(np.ascontiguousarray(m, dtype="<f4").tobytes() for _, m in mats)
+        n = len(tkrs)
+        return Response(
+            content=body,
+            media_type="application/octet-stream",
+            headers={
+                "X-Tickers": ",".join(tkrs),
+                "X-Matrices": ",".join(name for name, _ in mats),
+                "X-Shape": f"{len(mats)},{n},{n}",
+                "X-Window": str(window),
+                "X-Observations": str(observations),
+                "X-As-Of": as_of.isoformat() if as_of else "",
+            },
+        )
+
+    payload = {name: _matrix_to_json(m) for name, m in mats}
+    return CorrelationResponse(
+        as_of=as_of,
+        window=window,
+        observations=observations,
+        tickers=tkrs,
+        **payload,
+    )
+
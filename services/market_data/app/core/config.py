@@ -8,6 +8,7 @@ class AppSettings(BaseSettings):
     DATABASE_URL: str = ""
     REDIS_URL: str = ""
     OFFLINE: bool = False
+    CORRELATION_CACHE_SIZE: int = 8
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,6 @@
+from .walk_forward import WalkForwardReport, run_walk_forward
+
+__all__ = [
+    "WalkForwardReport",
+    "run_walk_forward",
+]
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..indicators.macd import compute_macd_12_26_9
+from ..indicators.moving_average import compute_ma20_ma60_and_trend
+from ..indicators.rsi import compute_rsi14
+from ..indicators.volume import compute_volume_indicators
+
+
+FEATURE_COLUMNS: List[str] = [
+    "ret_1",
+    "ret_5",
+    "ret_20",
+    "rsi14",
+    "macd_hist",
+    "ma20_ma60_gap",
+    "vol_vs_avg20",
+]
+
+
+def build_feature_matrix(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Build a causal feature matrix and next-bar return target from bars.
+
+    Every feature at row t only uses bars <= t; the target is the return from
+    t to t+1. Rows with incomplete lookback or no next bar are dropped.
+    Returns (X, y) as contiguous float64 arrays.
+    """
+    if df.empty or "close" not in df.columns:
+        return np.zeros((0, len(FEATURE_COLUMNS))), np.zeros(0)
+
+    close = pd.Series(df["close"].to_numpy(dtype=float))
+    volume = pd.Series(df["volume"].to_numpy(dtype=float)) if "volume" in df.columns else pd.Series(np.ones(len(close)))
+
+    _, _, histogram, _ = compute_macd_12_26_9(close)
+    ma20, ma60, _ = compute_ma20_ma60_and_trend(close)
+    _, vol_vs_avg20 = compute_volume_indicators(volume)
+
+    frame = pd.DataFrame(
+        {
+            "ret_1": close.pct_change(1),
+            "ret_5": close.pct_change(5),
+            "ret_20": close.pct_change(20),
+            "rsi14": compute_rsi14(close) / 100.0,
+            "macd_hist": histogram / close,
+            "ma20_ma60_gap": ma20 / ma60 - 1.0,
+            "vol_vs_avg20": vol_vs_avg20,
+            "target": close.shift(-1) / close - 1.0,
+        }
+    )
+    frame = frame.replace([np.inf, -np.inf], np.nan).dropna()
+    X = np.ascontiguousarray(frame[FEATURE_COLUMNS].to_numpy(dtype=np.float64))
+    y = np.ascontiguousarray(frame["target"].to_numpy(dtype=np.float64))
+    return X, y
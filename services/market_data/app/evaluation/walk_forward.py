@@ -0,0 +1,375 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .features import FEATURE_COLUMNS, build_feature_matrix
+
+
+CALIBRATION_BINS = 10
+
+
+@dataclass(frozen=True)
+class ArraySpec:
+    """Picklable handle to an array living in shared memory or a memmap file."""
+
+    backend: str  # "shm" | "memmap"
+    location: str  # shared memory name or .npy file path
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+@dataclass(frozen=True)
+class FoldTask:
+    ticker: str
+    fold: int
+    train_start: int
+    train_end: int
+    test_end: int
+
+
+@dataclass
+class FoldResult:
+    ticker: str
+    fold: int
+    n: int
+    sse: float
+    sae: float
+    hits: int
+    brier: float
+    # Per calibration bin: [count, sum(prob_up), sum(outcome)]
+    calibration: List[List[float]]
+
+
+@dataclass
+class MetricsSummary:
+    n: int = 0
+    rmse: Optional[float] = None
+    mae: Optional[float] = None
+    hit_rate: Optional[float] = None
+    brier: Optional[float] = None
+
+
+@dataclass
+class WalkForwardReport:
+    tickers: List[str]
+    folds: int
+    overall: MetricsSummary
+    per_ticker: Dict[str, MetricsSummary]
+    calibration: List[Dict[str, float]]
+    ece: Optional[float]
+    elapsed_seconds: float
+    folds_per_second: float
+    skipped: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class SharedFeatureStore:
+    """Owns the stacked feature/target arrays shared with worker processes.
+
+    Workers receive only the small `ArraySpec` handles and map the same
+    memory, so DataFrames and matrices are never pickled per task.
+    """
+
+    def __init__(self, X: np.ndarray, y: np.ndarray, backend: str = "shm") -> None:
+        if backend not in {"shm", "memmap"}:
+            raise ValueError(f"invalid backend: {backend}")
+        self.backend = backend
+        self._shms: List[shared_memory.SharedMemory] = []
+        self._tmpdir: Optional[tempfile.TemporaryDirectory] = None
+        self.x_spec = self._publish("X", X)
+        self.y_spec = self._publish("y", y)
+
+    def _publish(self, name: str, arr: np.ndarray) -> ArraySpec:
+        arr = np.ascontiguousarray(arr, dtype=np.float64)
+        if self.backend == "shm":
+            shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+            self._shms.append(shm)
+            return ArraySpec("shm", shm.name, arr.shape, arr.dtype.str)
+        if self._tmpdir is None:
+            self._tmpdir = tempfile.TemporaryDirectory(prefix="walk_forward_")
+        path = os.path.join(self._tmpdir.name, f"{name}.npy")
+        mm = np.lib.format.open_memmap(path, mode="w+", dtype=arr.dtype, shape=arr.shape)
+        mm[...] = arr
+        mm.flush()
+        del mm
+        return ArraySpec("memmap", path, arr.shape, arr.dtype.str)
+
+    def close(self) -> None:
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
+        self._shms = []
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+            self._tmpdir = None
+
+    def __enter__(self) -> "SharedFeatureStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# Per-process views, set once by the pool initializer
+_WORKER_X: Optional[np.ndarray] = None
+_WORKER_Y: Optional[np.ndarray] = None
+_WORKER_HANDLES: List[object] = []
+_WORKER_RIDGE: float = 1.0
+
+
+def _attach(spec: ArraySpec) -> np.ndarray:
+    if spec.backend == "memmap":
+        return np.load(spec.location, mmap_mode="r")
+    # Pool workers share the parent's resource tracker, so attaching here does
+    # not take ownership; the parent unlinks the segment in SharedFeatureStore.close().
+    shm = shared_memory.SharedMemory(name=spec.location)
+    _WORKER_HANDLES.append(shm)
+    return np.ndarray(spec.shape, dtype=np.dtype(spec.dtype), buffer=shm.buf)
+
+
+def _init_worker(x_spec: ArraySpec, y_spec: ArraySpec, ridge: float) -> None:
+    global _WORKER_X, _WORKER_Y, _WORKER_RIDGE
+    _WORKER_X = _attach(x_spec)
+    _WORKER_Y = _attach(y_spec)
+    _WORKER_RIDGE = ridge
+
+
+def _prob_up(pred: np.ndarray, sigma: float) -> np.ndarray:
+    # Logistic approximation of the normal CDF: P(return > 0 | pred, sigma)
+    z = pred / max(sigma, 1e-12)
+    return 1.0 / (1.0 + np.exp(-1.702 * z))
+
+
+def fit_predict_ridge(
+    X_train: np.ndarray, y_train: np.ndarray, X_test: np.ndarray, ridge: float = 1.0
+) -> Tuple[np.ndarray, float]:
+    """Standardized ridge regression; returns test predictions and train residual std."""
+    mu = X_train.mean(axis=0)
+    sd = X_train.std(axis=0)
+    sd[sd == 0] = 1.0
+    Xs = (X_train - mu) / sd
+    y_mean = float(y_train.mean())
+    gram = Xs.T @ Xs + ridge * np.eye(Xs.shape[1])
+    w = np.linalg.solve(gram, Xs.T @ (y_train - y_mean))
+    resid = y_train - (Xs @ w + y_mean)
+    sigma = float(resid.std()) if len(resid) > 1 else 0.0
+    pred = ((X_test - mu) / sd) @ w + y_mean
+    return pred, sigma
+
+
+def evaluate_fold(task: FoldTask, X: np.ndarray, y: np.ndarray, ridge: float = 1.0) -> FoldResult:
+    X_train = X[task.train_start : task.train_end]
+    y_train = y[task.train_start : task.train_end]
+    X_test = X[task.train_end : task.test_end]
+    y_test = y[task.train_end : task.test_end]
+
+    pred, sigma = fit_predict_ridge(X_train, y_train, X_test, ridge=ridge)
+    err = pred - y_test
+    outcome = (y_test > 0).astype(float)
+    prob = _prob_up(pred, sigma)
+
+    bins = np.minimum((prob * CALIBRATION_BINS).astype(int), CALIBRATION_BINS - 1)
+    calib = np.zeros((CALIBRATION_BINS, 3))
+    calib[:, 0] = np.bincount(bins, minlength=CALIBRATION_BINS)
+    calib[:, 1] = np.bincount(bins, weights=prob, minlength=CALIBRATION_BINS)
+    calib[:, 2] = np.bincount(bins, weights=outcome, minlength=CALIBRATION_BINS)
+
+    return FoldResult(
+        ticker=task.ticker,
+        fold=task.fold,
+        n=int(len(y_test)),
+        sse=float(np.sum(err**2)),
+        sae=float(np.sum(np.abs(err))),
+        hits=int(np.sum(np.sign(pred) == np.sign(y_test))),
+        brier=float(np.sum((prob - outcome) ** 2)),
+        calibration=calib.tolist(),
+    )
+
+
+def _run_task(task: FoldTask) -> FoldResult:
+    assert _WORKER_X is not None and _WORKER_Y is not None, "worker not initialized"
+    return evaluate_fold(task, _WORKER_X, _WORKER_Y, ridge=_WORKER_RIDGE)
+
+
+def make_folds(ticker: str, offset: int, n_rows: int, n_folds: int, min_train: int) -> List[FoldTask]:
+    """Expanding-window walk-forward folds over rows [offset, offset + n_rows)."""
+    if n_folds <= 0 or n_rows <= min_train:
+        return []
+    test_size = (n_rows - min_train) // n_folds
+    if test_size <= 0:
+        return []
+    tasks: List[FoldTask] = []
+    for k in range(n_folds):
+        train_end = min_train + k * test_size
+        test_end = n_rows if k == n_folds - 1 else train_end + test_size
+        tasks.append(FoldTask(ticker, k, offset, offset + train_end, offset + test_end))
+    return tasks
+
+
+def _summarize(results: Sequence[FoldResult]) -> MetricsSummary:
+    n = sum(r.n for r in results)
+    if n == 0:
+        return MetricsSummary()
+    return MetricsSummary(
+        n=n,
+        rmse=float(np.sqrt(sum(r.sse for r in results) / n)),
+        mae=sum(r.sae for r in results) / n,
+        hit_rate=sum(r.hits for r in results) / n,
+        brier=sum(r.brier for r in results) / n,
+    )
+
+
+def _calibration_table(results: Sequence[FoldResult]) -> Tuple[List[Dict[str, float]], Optional[float]]:
+    total = np.zeros((CALIBRATION_BINS, 3))
+    for r in results:
+        total += np.asarray(r.calibration)
+    n = total[:, 0].sum()
+    table: List[Dict[str, float]] = []
+    ece = 0.0
+    for i, (count, sum_prob, sum_out) in enumerate(total):
+        if count == 0:
+            continue
+        mean_prob = sum_prob / count
+        observed = sum_out / count
+        ece += (count / n) * abs(mean_prob - observed)
+        table.append(
+            {
+                "bin_low": i / CALIBRATION_BINS,
+                "bin_high": (i + 1) / CALIBRATION_BINS,
+                "count": float(count),
+                "mean_prob_up": float(mean_prob),
+                "observed_up": float(observed),
+            }
+        )
+    return table, (float(ece) if n else None)
+
+
+def run_walk_forward(
+    frames: Dict[str, pd.DataFrame],
+    *,
+    n_folds: int = 5,
+    min_train: int = 120,
+    workers: Optional[int] = None,
+    backend: str = "shm",
+    ridge: float = 1.0,
+) -> WalkForwardReport:
+    """Walk-forward evaluation of the ridge baseline across many tickers.
+
+    Feature matrices for all tickers are stacked into one array, published via
+    shared memory (or a memmap file), and (ticker, fold) tasks are scheduled on
+    a process pool. With ``workers <= 1`` folds run inline.
+    """
+    blocks_X: List[np.ndarray] = []
+    blocks_y: List[np.ndarray] = []
+    tasks: List[FoldTask] = []
+    skipped: List[str] = []
+    offset = 0
+    for ticker, df in frames.items():
+        X, y = build_feature_matrix(df.sort_index())
+        ticker_tasks = make_folds(ticker, offset, len(y), n_folds, min_train)
+        if not ticker_tasks:
+            skipped.append(ticker)
+            continue
+        blocks_X.append(X)
+        blocks_y.append(y)
+        tasks.extend(ticker_tasks)
+        offset += len(y)
+
+    X_all = np.vstack(blocks_X) if blocks_X else np.zeros((0, len(FEATURE_COLUMNS)))
+    y_all = np.concatenate(blocks_y) if blocks_y else np.zeros(0)
+
+    started = time.perf_counter()
+    results: List[FoldResult] = []
+    if tasks:
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1:
+            results = [evaluate_fold(t, X_all, y_all, ridge=ridge) for t in tasks]
+        else:
+            with SharedFeatureStore(X_all, y_all, backend=backend) as store:
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_worker,
+                    initargs=(store.x_spec, store.y_spec, ridge),
+                ) as pool:
+                    chunksize = max(1, len(tasks) // (workers * 4))
+                    results = list(pool.map(_run_task, tasks, chunksize=chunksize))
+    elapsed = time.perf_counter() - started
+
+    by_ticker: Dict[str, List[FoldResult]] = {}
+    for r in results:
+        by_ticker.setdefault(r.ticker, []).append(r)
+    calibration, ece = _calibration_table(results)
+
+    return WalkForwardReport(
+        tickers=list(by_ticker.keys()),
+        folds=len(results),
+        overall=_summarize(results),
+        per_ticker={t: _summarize(rs) for t, rs in by_ticker.items()},
+        calibration=calibration,
+        ece=ece,
+        elapsed_seconds=elapsed,
+        folds_per_second=(len(results) / elapsed) if elapsed > 0 else 0.0,
+        skipped=skipped,
+    )
+
+
+def _load_frames(tickers: List[str], start: datetime, end: datetime, tf: str) -> Dict[str, pd.DataFrame]:
+    from ..adapters.free_source import FreeSourceAdapter
+
+    sample_dir = Path(__file__).resolve().parents[1] / "data" / "sample"
+    adapter = FreeSourceAdapter(sample_dir)
+    return adapter.get_bars(tickers, start, end, tf)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Parallel walk-forward evaluation")
+    parser.add_argument("--tickers", required=True, help="Comma separated tickers")
+    parser.add_argument("--start", default=None, help="ISO date, default 3 years ago")
+    parser.add_argument("--end", default=None, help="ISO date, default today")
+    parser.add_argument("--tf", default="1d")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--min-train", type=int, default=120)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--backend", choices=["shm", "memmap"], default="shm")
+    parser.add_argument("--ridge", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    end = pd.to_datetime(args.end).to_pydatetime() if args.end else datetime.now(timezone.utc)
+    start = pd.to_datetime(args.start).to_pydatetime() if args.start else end - timedelta(days=365 * 3)
+    tickers = [t.strip().upper() for t in args.tickers.split(",") if t.strip()]
+
+    frames = _load_frames(tickers, start.replace(tzinfo=timezone.utc), end.replace(tzinfo=timezone.utc), args.tf)
+    report = run_walk_forward(
+        frames,
+        n_folds=args.folds,
+        min_train=args.min_train,
+        workers=args.workers,
+        backend=args.backend,
+        ridge=args.ridge,
+    )
+    print(json.dumps(report.to_dict(), indent=2))
+    print(
+        f"[walk_forward] folds={report.folds} tickers={len(report.tickers)} "
+        f"elapsed={report.elapsed_seconds:.3f}s throughput={report.folds_per_second:.1f} folds/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+from .monte_carlo import SimulationResult, estimate_log_returns, simulate_paths
+
+__all__ = [
+    "SimulationResult",
+    "estimate_log_returns",
+    "simulate_paths",
+]
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+
+DEFAULT_PERCENTILES = (5.0, 25.0, 50.0, 75.0, 95.0)
+DEFAULT_CONFIDENCES = (0.95, 0.99)
+
+
+@dataclass
+class SimulationResult:
+    method: str
+    paths: int
+    horizon: int
+    mu: float
+    sigma: float
+    # percentile -> per-step price levels (length == horizon)
+    bands: Dict[float, List[float]]
+    var: Dict[float, float]
+    es: Dict[float, float]
+    prob_touch_up: float
+    prob_touch_down: float
+    touch_up_level: float
+    touch_down_level: float
+    terminal_mean: float = 0.0
+
+
+def estimate_log_returns(close: Iterable[float]) -> np.ndarray:
+    """Daily log returns from a close series, dropping non-positive/invalid prices."""
+    arr = np.asarray(list(close), dtype=float)
+    arr = arr[np.isfinite(arr) & (arr > 0)]
+    if arr.size < 2:
+        return np.zeros(0)
+    return np.diff(np.log(arr))
+
+
+class _StepHistogram:
+    """Fixed-grid histogram of cumulative log returns for every horizon step.
+
+    Memory is horizon * n_bins counters regardless of how many paths are
+    pushed, which lets percentile bands be computed while paths stream by
+    in blocks.
+    """
+
+    def __init__(self, horizon: int, mu: float, sigma: float, spread: float, n_bins: int = 2048) -> None:
+        steps = np.arange(1, horizon + 1, dtype=float)
+        half = np.maximum(8.0 * max(sigma, 1e-6) * np.sqrt(steps), spread * steps)
+        self.lo = mu * steps - half
+        self.width = (2.0 * half) / n_bins
+        self.n_bins = n_bins
+        self.horizon = horizon
+        self.counts = np.zeros(horizon * n_bins, dtype=np.int64)
+        self._offsets = np.arange(horizon, dtype=np.int64) * n_bins
+        self.total = 0
+
+    def push(self, cum: np.ndarray) -> None:
+        idx = np.floor((cum - self.lo) / self.width).astype(np.int64)
+        np.clip(idx, 0, self.n_bins - 1, out=idx)
+        idx += self._offsets
+        self.counts += np.bincount(idx.ravel(), minlength=self.counts.size)
+        self.total += cum.shape[0]
+
+    def percentiles(self, qs: Sequence[float]) -> Dict[float, np.ndarray]:
+        counts = self.counts.reshape(self.horizon, self.n_bins)
+        cdf = np.cumsum(counts, axis=1)
+        out: Dict[float, np.ndarray] = {}
+        for q in qs:
+            target = (q / 100.0) * self.total
+            # first bin whose cumulative count reaches the target, interpolated inside the bin
+            pos = np.argmax(cdf >= target, axis=1)
+            before = np.where(pos > 0, cdf[np.arange(self.horizon), pos - 1], 0)
+            in_bin = counts[np.arange(self.horizon), pos]
+            frac = np.where(in_bin > 0, (target - before) / np.maximum(in_bin, 1), 0.5)
+            out[q] = self.lo + (pos + np.clip(frac, 0.0, 1.0)) * self.width
+        return out
+
+
+def simulate_paths(
+    log_returns: np.ndarray,
+    *,
+    spot: float,
+    paths: int,
+    horizon: int,
+    method: str = "gbm",
+    seed: int = 42,
+    block_size: int = 10_000,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    confidences: Sequence[float] = DEFAULT_CONFIDENCES,
+    touch_up: float = 0.1,
+    touch_down: float = 0.1,
+) -> SimulationResult:
+    """Monte Carlo price paths from historical daily log returns.
+
+    ``method="gbm"`` draws normal log returns with the sample drift/vol;
+    ``method="bootstrap"`` resamples the historical returns. Paths are
+    generated ``block_size`` at a time as one (block, horizon) array op from
+    a seeded ``default_rng``, so memory is bounded by the block and the
+    result does not depend on the block size.
+    """
+    if log_returns.size < 2:
+        raise ValueError("not enough returns to estimate dynamics")
+    if method not in {"gbm", "bootstrap"}:
+        raise ValueError(f"invalid method: {method}")
+
+    mu = float(np.mean(log_returns))
+    sigma = float(np.std(log_returns, ddof=1))
+    spread = float(np.max(np.abs(log_returns - mu))) if method == "bootstrap" else 0.0
+    rng = np.random.default_rng(seed)
+
+    hist = _StepHistogram(horizon, mu, sigma, spread)
+    terminal = np.empty(paths, dtype=np.float64)
+    up_barrier = np.log1p(touch_up)
+    down_barrier = np.log1p(-touch_down) if touch_down < 1 else -np.inf
+    touched_up = 0
+    touched_down = 0
+
+    done = 0
+    while done < paths:
+        b = min(block_size, paths - done)
+        if method == "gbm":
+            cum = rng.normal(mu, sigma, size=(b, horizon))
+        else:
+            cum = log_returns[rng.integers(0, log_returns.size, size=(b, horizon))]
+        np.cumsum(cum, axis=1, out=cum)
+
+        hist.push(cum)
+        terminal[done : done + b] = cum[:, -1]
+        touched_up += int(np.count_nonzero(cum.max(axis=1) >= up_barrier))
+        touched_down += int(np.count_nonzero(cum.min(axis=1) <= down_barrier))
+        done += b
+
+    bands = {q: (spot * np.exp(v)).tolist() for q, v in hist.percentiles(percentiles).items()}
+
+    terminal_ret = np.expm1(terminal)
+    var: Dict[float, float] = {}
+    es: Dict[float, float] = {}
+    for c in confidences:
+        cutoff = float(np.quantile(terminal_ret, 1.0 - c))
+        tail = terminal_ret[terminal_ret <= cutoff]
+        var[c] = -cutoff
+        es[c] = -float(tail.mean()) if tail.size else -cutoff
+
+    return SimulationResult(
+        method=method,
+        paths=paths,
+        horizon=horizon,
+        mu=mu,
+        sigma=sigma,
+        bands=bands,
+        var=var,
+        es=es,
+        prob_touch_up=touched_up / paths,
+        prob_touch_down=touched_down / paths,
+        touch_up_level=spot * (1.0 + touch_up),
+        touch_down_level=spot * (1.0 - touch_down),
+        terminal_mean=float(spot * np.mean(np.exp(terminal))),
+    )
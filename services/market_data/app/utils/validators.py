@@ -14,6 +14,16 @@ def validate_tickers(tickers: List[str]) -> None:
         raise HTTPException(status_code=422, detail="tickers must be 1..50 symbols")
 
 
+MAX_UNIVERSE_SIZE = 500
+
+
+def validate_universe(tickers: List[str]) -> None:
+    if len(tickers) < 2 or len(tickers) > MAX_UNIVERSE_SIZE:
+        raise HTTPException(status_code=422, detail=f"tickers must be 2..{MAX_UNIVERSE_SIZE} symbols")
+    if len(set(tickers)) != len(tickers):
+        raise HTTPException(status_code=422, detail="tickers must be unique")
+
+
 def validate_timeframe(tf: str) -> None:
     if tf not in ALLOWED_TIMEFRAMES:
         raise HTTPException(status_code=422, detail=f"invalid timeframe: {tf}")
@@ -27,4 +37,12 @@ def validate_date_range(start: datetime, end: datetime) -> None:
         raise HTTPException(status_code=422, detail="date window must be <= 5 years")
 
 
+MAX_SIMULATION_PATHS = 1_000_000
+MAX_SIMULATION_HORIZON = 252
+
 
+def validate_simulation(paths: int, horizon: int) -> None:
+    if paths <= 0 or paths > MAX_SIMULATION_PATHS:
+        raise HTTPException(status_code=422, detail=f"paths must be 1..{MAX_SIMULATION_PATHS}")
+    if horizon <= 0 or horizon > MAX_SIMULATION_HORIZON:
+        raise HTTPException(status_code=422, detail=f"horizon must be 1..{MAX_SIMULATION_HORIZON}")
@@ -94,3 +94,19 @@ def test_internal_bars_adjust_raw_vs_adj(tmp_path: Path):
     assert isinstance(data_raw, list) and isinstance(data_adj, list)
 
 
+
+
+def test_internal_bars_honors_deadline_header():
+    client = TestClient(app)
+    params = {"ticker": "TSM,AAPL", "start": "2024-01-01", "end": "2024-02-01", "tf": "1d"}
+
+    expired = client.get("/internal/bars", params=params, headers={"X-Deadline-Ms": "0"})
+    assert expired.status_code == 200
+    data = expired.json()
+    assert data["partial"] is True
+    assert data["skipped"] == ["TSM", "AAPL"]
+    assert data["results"] == {}
+
+    roomy = client.get("/internal/bars", params=params, headers={"X-Deadline-Ms": "60000"}).json()
+    assert roomy["partial"] is False and roomy["skipped"] == []
+    assert set(roomy["results"]) == {"TSM", "AAPL"}
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from services.market_data.app.analytics import CorrelationCache, RollingCovariance, align_returns
+from services.market_data.app.main import app
+
+
+def make_returns(n_rows: int = 120, n_cols: int = 4) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    base = rng.normal(0, 0.01, size=(n_rows, 1))
+    data = base + rng.normal(0, 0.01, size=(n_rows, n_cols))
+    idx = pd.date_range("2024-01-01", periods=n_rows, freq="B", tz="UTC")
+    return pd.DataFrame(data, index=idx, columns=[f"T{i}" for i in range(n_cols)])
+
+
+def test_rolling_matches_full_recompute():
+    rets = make_returns()
+    window = 30
+    engine = RollingCovariance(rets.shape[1], window, rebase_every=7)
+    for row in rets.to_numpy():
+        engine.push(row)
+    tail = rets.iloc[-window:]
+    np.testing.assert_allclose(engine.cov(), tail.cov().to_numpy(), rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(engine.corr(), tail.corr().to_numpy(), rtol=1e-9, atol=1e-12)
+
+
+def test_rolling_pairwise_missing_values():
+    rets = make_returns(n_rows=40, n_cols=3)
+    rets.iloc[5:15, 1] = np.nan
+    engine = RollingCovariance(3, 40)
+    for row in rets.to_numpy():
+        engine.push(row)
+    # pandas uses pairwise-complete observations as well
+    np.testing.assert_allclose(engine.corr(), rets.corr().to_numpy(), rtol=1e-9, atol=1e-12)
+
+
+def test_align_returns_keeps_gaps():
+    idx = pd.date_range("2024-01-01", periods=4, freq="B", tz="UTC")
+    a = pd.DataFrame({"close": [10.0, 11.0, 12.1, 13.31]}, index=idx)
+    b = pd.DataFrame({"close": [20.0, 22.0, 24.2]}, index=idx[[0, 1, 3]])
+    out = align_returns({"A": a, "B": b}, ["A", "B"])
+    assert list(out.columns) == ["A", "B"]
+    assert out["A"].tolist() == pytest.approx([0.1, 0.1, 0.1])
+    assert np.isnan(out["B"].iloc[1]) and np.isnan(out["B"].iloc[2])
+
+
+def test_cache_reuses_engine_and_pushes_only_new_rows():
+    rets = make_returns()
+    cache = CorrelationCache(max_entries=2)
+    engine, reused = cache.update(["T0", "T1", "T2", "T3"], 30, rets.iloc[:100])
+    assert not reused
+    engine2, reused = cache.update(["T0", "T1", "T2", "T3"], 30, rets)
+    assert reused and engine2 is engine
+    np.testing.assert_allclose(engine2.corr(), rets.iloc[-30:].corr().to_numpy(), rtol=1e-9)
+    assert cache.hits == 1 and cache.misses == 1
+
+
+def test_correlation_endpoint_json_and_binary():
+    client = TestClient(app)
+    params = {"tickers": "ZZA,ZZB,ZZC", "window": 20, "end": "2024-03-29"}
+    resp = client.get("/internal/correlation", params=params)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["tickers"] == ["ZZA", "ZZB", "ZZC"]
+    assert data["observations"] == 20
+    assert len(data["corr"]) == 3 and data["corr"][0][0] == pytest.approx(1.0)
+    assert data["cov"] is None
+
+    resp = client.get("/internal/correlation", params={**params, "matrix": "both", "format": "f32"})
+    assert resp.status_code == 200
+    assert resp.headers["x-shape"] == "2,3,3"
+    mats = np.frombuffer(resp.content, dtype="<f4").reshape(2, 3, 3)
+    np.testing.assert_allclose(mats[0], np.array(data["corr"], dtype=np.float32), rtol=1e-6)
+
+
+def test_correlation_param_validation():
+    client = TestClient(app)
+    assert client.get("/internal/correlation", params={"tickers": "TSM"}).status_code == 422
+    assert client.get("/internal/correlation", params={"tickers": "TSM,TSM"}).status_code == 422
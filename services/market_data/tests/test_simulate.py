@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from httpx import AsyncClient
+
+from services.market_data.app.api import routers
+from services.market_data.app.main import app
+from services.market_data.app.simulation import estimate_log_returns, simulate_paths
+
+
+def make_returns(n: int = 250) -> np.ndarray:
+    rng = np.random.default_rng(7)
+    return rng.normal(0.0005, 0.02, size=n)
+
+
+def test_simulation_is_deterministic_and_block_size_independent():
+    r = make_returns()
+    a = simulate_paths(r, spot=100.0, paths=5_000, horizon=30, block_size=5_000)
+    b = simulate_paths(r, spot=100.0, paths=5_000, horizon=30, block_size=700)
+    assert a.bands[50.0] == b.bands[50.0]
+    assert a.var == b.var and a.es == b.es
+    assert a.prob_touch_up == b.prob_touch_up
+
+
+def test_simulation_bands_and_risk_are_consistent():
+    r = make_returns()
+    sim = simulate_paths(r, spot=100.0, paths=20_000, horizon=60, method="gbm")
+    assert len(sim.bands[5.0]) == 60
+    for i in range(60):
+        assert sim.bands[5.0][i] <= sim.bands[50.0][i] <= sim.bands[95.0][i]
+    # dispersion grows with the horizon
+    assert sim.bands[95.0][-1] - sim.bands[5.0][-1] > sim.bands[95.0][0] - sim.bands[5.0][0]
+    # expected shortfall is at least as bad as VaR, and 99% worse than 95%
+    assert sim.es[0.95] >= sim.var[0.95]
+    assert sim.var[0.99] >= sim.var[0.95]
+    assert 0.0 <= sim.prob_touch_down <= 1.0 and 0.0 <= sim.prob_touch_up <= 1.0
+
+    # histogram median tracks the exact lognormal median
+    expected_median = 100.0 * np.exp(sim.mu * 60)
+    assert sim.bands[50.0][-1] == pytest.approx(expected_median, rel=0.01)
+
+
+def test_bootstrap_method():
+    r = make_returns()
+    sim = simulate_paths(r, spot=50.0, paths=2_000, horizon=10, method="bootstrap")
+    assert sim.method == "bootstrap"
+    assert sim.bands[5.0][-1] < 50.0 < sim.bands[95.0][-1]
+
+
+def test_estimate_log_returns_skips_bad_prices():
+    out = estimate_log_returns([100.0, float("nan"), 110.0, 0.0, 121.0])
+    assert out == pytest.approx(np.log([1.1, 1.1]))
+
+
+def test_simulate_endpoint():
+    client = TestClient(app)
+    resp = client.get(
+        "/internal/simulate",
+        params={"ticker": "ZZSIM", "paths": 2000, "horizon": 15, "end": "2024-06-28"},
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["ticker"] == "ZZSIM"
+    assert data["seed"] == 42
+    assert len(data["bands"]) == 15
+    assert {r["confidence"] for r in data["risk"]} == {0.95, 0.99}
+
+    again = client.get(
+        "/internal/simulate",
+        params={"ticker": "ZZSIM", "paths": 2000, "horizon": 15, "end": "2024-06-28"},
+    ).json()
+    assert again["bands"] == data["bands"]
+
+
+def test_simulate_param_validation():
+    client = TestClient(app)
+    resp = client.get("/internal/simulate", params={"ticker": "TSM", "paths": 0})
+    assert resp.status_code == 422
+    resp = client.get("/internal/simulate", params={"ticker": "TSM", "horizon": 10_000})
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_simulation_does_not_block_other_endpoints(monkeypatch):
+    real = routers.simulate_paths
+
+    def slow_simulation(*args, **kwargs):
+        time.sleep(0.5)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(routers, "simulate_paths", slow_simulation)
+    params = {"ticker": "ZZSIM", "paths": 1000, "horizon": 5, "end": "2024-06-28"}
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        sim = asyncio.create_task(ac.get("/internal/simulate", params=params))
+        await asyncio.sleep(0.1)
+        started = time.perf_counter()
+        health = await ac.get("/healthz")
+        elapsed = time.perf_counter() - started
+        assert not sim.done()
+        assert (await sim).status_code == 200
+    assert health.status_code == 200 and elapsed < 0.2
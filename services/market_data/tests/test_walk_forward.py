@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.market_data.app.evaluation.features import FEATURE_COLUMNS, build_feature_matrix
+from services.market_data.app.evaluation.walk_forward import make_folds, run_walk_forward
+
+
+def make_bars(seed: int, periods: int = 400) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range(start="2022-01-03", periods=periods, freq="B", tz="UTC")
+    close = 100 + np.cumsum(rng.normal(0, 1, size=periods))
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close + 0.5,
+            "low": close - 0.5,
+            "close": close,
+            "volume": 1_000_000 + rng.integers(0, 1000, size=periods).astype(float),
+        },
+        index=idx,
+    )
+
+
+def test_feature_matrix_is_causal_and_aligned():
+    df = make_bars(1, periods=100)
+    X, y = build_feature_matrix(df)
+    assert X.shape[1] == len(FEATURE_COLUMNS)
+    assert X.shape[0] == y.shape[0] == 100 - 20 - 1
+    assert np.isfinite(X).all() and np.isfinite(y).all()
+
+
+def test_make_folds_expanding_window():
+    folds = make_folds("TSM", offset=10, n_rows=220, n_folds=4, min_train=100)
+    assert [f.fold for f in folds] == [0, 1, 2, 3]
+    assert all(f.train_start == 10 for f in folds)
+    assert folds[0].train_end == 110
+    assert folds[-1].test_end == 230
+    # test windows are contiguous and never overlap training
+    for prev, cur in zip(folds, folds[1:]):
+        assert prev.test_end == cur.train_end
+
+
+@pytest.mark.parametrize("backend", ["shm", "memmap"])
+def test_parallel_matches_inline(backend):
+    frames = {f"T{i}": make_bars(i) for i in range(3)}
+    inline = run_walk_forward(frames, n_folds=3, min_train=150, workers=1)
+    pooled = run_walk_forward(frames, n_folds=3, min_train=150, workers=2, backend=backend)
+
+    assert inline.folds == pooled.folds == 9
+    assert pooled.overall.n == inline.overall.n
+    assert pooled.overall.rmse == pytest.approx(inline.overall.rmse)
+    assert 0.0 <= pooled.overall.hit_rate <= 1.0
+    assert sum(b["count"] for b in pooled.calibration) == pooled.overall.n
+    assert pooled.folds_per_second > 0
+
+
+def test_short_history_is_skipped():
+    frames = {"SHORT": make_bars(0, periods=50), "LONG": make_bars(1)}
+    report = run_walk_forward(frames, n_folds=2, min_train=150, workers=1)
+    assert report.skipped == ["SHORT"]
+    assert report.tickers == ["LONG"]
@@ -1,18 +1,30 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from pydantic import BaseModel, validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from app.core.config import settings
-from app.domain.schemas import SearchNewsResponse
+from app.core.deadline import Deadline, request_deadline
+from app.domain.schemas import SearchNewsBatchResponse, SearchNewsResponse
+from app.rag.embed import get_embedder
+from app.rag.query_cache import query_cache
 from app.rag.search import search_news
 
 router = APIRouter()
 
 @router.get("/healthz")
-async def health_check():
+async def health_check(response: Response):
+    # not ready until the startup warm-up has loaded the embedding model
+    if settings.EMBEDDING_WARMUP and not get_embedder().ready:
+        response.status_code = 503
+        return {"status": "starting", "service": "rag"}
     return {"status": "ok", "service": "rag"}
 
 
+@router.get("/internal/metrics")
+async def metrics():
+    return {"query_embedding_cache": query_cache.stats()}
+
+
 class SearchRequest(BaseModel):
     ticker: Optional[str] = None
     query: Optional[str] = None
@@ -38,7 +50,7 @@ class SearchRequest(BaseModel):
 
 
 @router.post("/search_news", response_model=SearchNewsResponse)
-async def post_search_news(req: SearchRequest):
+async def post_search_news(req: SearchRequest, deadline: Deadline = Depends(request_deadline)):
     try:
         resp = await search_news(
             ticker=req.ticker,
@@ -46,6 +58,7 @@ async def post_search_news(req: SearchRequest):
             since=req.since,
             as_of=req.as_of,
             top_k=req.top_k or settings.DEFAULT_TOP_K,
+            deadline=deadline,
         )
         return resp
     except ValueError as e:
@@ -55,6 +68,40 @@ async def post_search_news(req: SearchRequest):
         return SearchNewsResponse(as_of=req.as_of, query=req.query or req.ticker or "", top_k=req.top_k or settings.DEFAULT_TOP_K, results=[])
 
 
+class SearchBatchRequest(BaseModel):
+    requests: List[SearchRequest]
+
+    @validator("requests")
+    def validate_requests(cls, v):
+        if not v:
+            raise ValueError("requests must not be empty")
+        if len(v) > settings.MAX_BATCH_QUERIES:
+            raise ValueError(f"at most {settings.MAX_BATCH_QUERIES} requests per batch")
+        return v
+
+
+@router.post("/search_news_batch", response_model=SearchNewsBatchResponse)
+async def post_search_news_batch(req: SearchBatchRequest, deadline: Deadline = Depends(request_deadline)):
+    results: List[SearchNewsResponse] = []
+    for r in req.requests:
+        top_k = r.top_k or settings.DEFAULT_TOP_K
+        if deadline.expired():
+            # out of budget: answer the rest empty instead of searching for nobody
+            query = r.query or r.ticker or ""
+            results.append(SearchNewsResponse(as_of=r.as_of, query=query, top_k=top_k, results=[], partial=True))
+            continue
+        try:
+            results.append(
+                await search_news(
+                    ticker=r.ticker, query=r.query, since=r.since, as_of=r.as_of, top_k=top_k, deadline=deadline
+                )
+            )
+        except Exception:
+            # one failing query must not sink the batch
+            results.append(SearchNewsResponse(as_of=r.as_of, query=r.query or r.ticker or "", top_k=top_k, results=[]))
+    return SearchNewsBatchResponse(results=results)
+
+
 @router.post("/ingest_samples")
 async def post_ingest_samples():
     try:
@@ -0,0 +1,81 @@
+"""Recall and latency of the in-process IVF index against exact search.
+
+Builds a synthetic corpus of clustered unit vectors (news embeddings are
+topical, not uniform) with publication times spread over a year, then for
+each probe count and time window reports recall@k of the approximate search
+against the exact one and the mean latency of both. No database is needed.
+
+    python -m app.bench.ann_recall --vectors 100000 --probes 1,4,8,16,32
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+import numpy as np
+
+from app.rag.ann import IVFIndex, recall_at_k
+
+NOW = datetime(2025, 8, 26, tzinfo=timezone.utc)
+WINDOWS = {"all": None, "90d": NOW - timedelta(days=90), "7d": NOW - timedelta(days=7)}
+
+
+def synthetic_corpus(n: int, dim: int, topics: int, spread: float, rng: np.random.Generator):
+    """``n`` vectors around ``topics`` random directions and their publication times."""
+    centers = rng.normal(size=(topics, dim)).astype(np.float32)
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+    vectors = centers[rng.integers(0, topics, n)] + spread * rng.normal(size=(n, dim)).astype(np.float32) / np.sqrt(dim)
+    minutes = rng.integers(0, 365 * 24 * 60, n)
+    return centers, vectors, [NOW - timedelta(minutes=int(mi)) for mi in minutes]
+
+
+def _mean_ms(index: IVFIndex, queries: List[np.ndarray], since: Optional[datetime], k: int, exact: bool) -> float:
+    started = time.perf_counter()
+    for q in queries:
+        index.search(q, as_of=NOW, since=since, k=k, exact=exact)
+    return (time.perf_counter() - started) * 1000.0 / len(queries)
+
+
+def main(args: argparse.Namespace) -> None:
+    rng = np.random.default_rng(args.seed)
+    centers, vectors, times = synthetic_corpus(args.vectors, args.dim, args.topics, args.spread, rng)
+    index = IVFIndex(n_lists=args.lists, exact_below=args.exact_below, seed=args.seed)
+    started = time.perf_counter()
+    index.add_many(((str(i), vectors[i], times[i], times[i]) for i in range(len(vectors))), train=False)
+    index.train()
+    build_s = time.perf_counter() - started
+    print(json.dumps({"vectors": len(index), "lists": len(index._lists), "build_s": round(build_s, 2)}), flush=True)
+
+    # queries are fresh draws from the same topics, not corpus members
+    picks = centers[rng.integers(0, args.topics, args.queries)]
+    queries = list(picks + args.spread * rng.normal(size=picks.shape).astype(np.float32) / np.sqrt(args.dim))
+    for probes in (int(p) for p in args.probes.split(",")):
+        index.n_probe = probes
+        for name, since in WINDOWS.items():
+            row = {
+                "probes": probes,
+                "window": name,
+                f"recall@{args.k}": round(recall_at_k(index, queries, as_of=NOW, since=since, k=args.k), 4),
+                "ann_ms": round(_mean_ms(index, queries, since, args.k, exact=False), 3),
+                "exact_ms": round(_mean_ms(index, queries, since, args.k, exact=True), 3),
+            }
+            print(json.dumps(row), flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure IVF recall and latency against exact search")
+    parser.add_argument("--vectors", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--topics", type=int, default=500, help="cluster centres of the synthetic corpus")
+    parser.add_argument("--spread", type=float, default=2.0, help="noise norm relative to a cluster centre")
+    parser.add_argument("--lists", type=int, default=0, help="IVF lists (0: sqrt(n))")
+    parser.add_argument("--probes", default="1,4,8,16,32", help="comma separated probe counts")
+    parser.add_argument("--exact-below", type=int, default=2048)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    main(parser.parse_args())
@@ -0,0 +1,89 @@
+"""Rows per second of the bulk ingestion writes.
+
+Writes ``--articles`` synthetic articles with ``--chunks`` chunks each and
+random embeddings through ``crud.bulk_upsert_news``, ``bulk_add_chunks`` and
+``bulk_upsert_embeddings``, then replays the same rows to time the
+conflict paths (everything already exists). One JSON line per stage reports
+rows and rows/second; embedding is not part of the measurement. Needs a
+reachable database; the rows (urls under ``bench://``) are deleted afterwards.
+
+    python -m app.bench.ingest_throughput --articles 10000 --chunks 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+import numpy as np
+from sqlalchemy import delete, select
+
+from app.db import crud
+from app.db import models as m
+from app.db.session import SessionLocal
+
+URL_PREFIX = "bench://ingest/"
+
+
+def _timed(stage: str, rows: int, fn: Callable[[], object]) -> object:
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    print(json.dumps({"stage": stage, "rows": rows, "seconds": round(elapsed, 3), "rows_per_s": round(rows / elapsed, 1)}), flush=True)
+    return result
+
+
+def _cleanup(db) -> None:
+    news_ids = select(m.News.id).where(m.News.url.like(f"{URL_PREFIX}%"))
+    chunk_ids = select(m.NewsChunk.id).where(m.NewsChunk.news_id.in_(news_ids))
+    db.execute(delete(m.NewsEmbedding).where(m.NewsEmbedding.chunk_id.in_(chunk_ids)))
+    db.execute(delete(m.NewsChunk).where(m.NewsChunk.news_id.in_(news_ids)))
+    db.execute(delete(m.News).where(m.News.url.like(f"{URL_PREFIX}%")))
+    db.commit()
+
+
+def main(args: argparse.Namespace) -> None:
+    rng = np.random.default_rng(args.seed)
+    now = datetime.now(timezone.utc)
+    run = uuid.uuid4().hex[:8]
+    rows = [
+        {
+            "ticker": None,
+            "title": f"bench article {i}",
+            "url": f"{URL_PREFIX}{run}/{i}",
+            "published_at": now - timedelta(minutes=i),
+            "source": "bench",
+            "text": f"bench article {i}",
+            "first_seen_at": now - timedelta(minutes=i),
+        }
+        for i in range(args.articles)
+    ]
+    with SessionLocal() as db:
+        try:
+            for label in ("insert", "conflict"):
+                news_ids = _timed(f"news_{label}", len(rows), lambda: crud.bulk_upsert_news(db, rows, args.batch_size))
+                chunk_rows = [(news_id, idx, f"chunk {idx} of {news_id}") for news_id in news_ids for idx in range(args.chunks)]
+                created = _timed(f"chunks_{label}", len(chunk_rows), lambda: crud.bulk_add_chunks(db, chunk_rows, args.batch_size))
+                if label == "insert":
+                    chunk_ids = [chunk_id for chunk_id, _, _ in created]
+                vectors = rng.normal(size=(len(chunk_ids), args.dim)).astype(np.float32)
+                pairs = list(zip(chunk_ids, vectors))
+                _timed(f"embeddings_{label}", len(pairs), lambda: crud.bulk_upsert_embeddings(db, pairs, args.batch_size))
+                db.commit()
+        finally:
+            db.rollback()
+            _cleanup(db)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure bulk ingestion rows/second")
+    parser.add_argument("--articles", type=int, default=10_000)
+    parser.add_argument("--chunks", type=int, default=10, help="chunks per article")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    main(parser.parse_args())
@@ -0,0 +1,122 @@
+"""Recall and latency of pgvector HNSW search on a synthetic corpus.
+
+Loads the synthetic corpus of ``app.bench.ann_recall`` into a scratch table
+with COPY, builds an HNSW index like migration 0002, and for every
+``ef_search`` and time window reports recall@k against exact numpy ranking
+plus mean latency, both for the index scan and for the filter-first strategy
+``search_news`` uses on narrow windows. Needs a reachable database; the
+scratch table is dropped afterwards.
+
+    python -m app.bench.pgvector_recall --vectors 100000 --ef-search 40,100,200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import List, Optional, Set
+
+import numpy as np
+from sqlalchemy import create_engine
+
+from app.bench.ann_recall import WINDOWS, synthetic_corpus
+from app.core.config import settings
+
+TABLE = "bench_news_vectors"
+
+
+def _vec(v: np.ndarray) -> str:
+    return "[" + ",".join(f"{x:.6f}" for x in v) + "]"
+
+
+def _load(cur, vectors: np.ndarray, times: List[datetime], m: int, ef_construction: int) -> float:
+    cur.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    cur.execute(f"CREATE TABLE {TABLE} (id int PRIMARY KEY, published_at timestamptz, embedding vector({vectors.shape[1]}))")
+    with cur.copy(f"COPY {TABLE} (id, published_at, embedding) FROM STDIN") as copy:
+        for i, (v, ts) in enumerate(zip(vectors, times)):
+            copy.write_row((i, ts, _vec(v)))
+    started = time.perf_counter()
+    cur.execute(
+        f"CREATE INDEX ON {TABLE} USING hnsw (embedding vector_cosine_ops) "
+        f"WITH (m = {m}, ef_construction = {ef_construction})"
+    )
+    cur.execute(f"CREATE INDEX ON {TABLE} (published_at)")
+    cur.execute(f"ANALYZE {TABLE}")
+    return time.perf_counter() - started
+
+
+def _query(cur, q: np.ndarray, since: Optional[datetime], k: int, filtered: bool) -> Set[int]:
+    where = "published_at >= %(since)s" if since is not None else "TRUE"
+    if filtered:
+        sql = (
+            f"WITH c AS MATERIALIZED (SELECT id, embedding FROM {TABLE} WHERE {where}) "
+            f"SELECT id FROM c ORDER BY embedding <=> %(q)s::vector LIMIT {k}"
+        )
+    else:
+        sql = f"SELECT id FROM {TABLE} WHERE {where} ORDER BY embedding <=> %(q)s::vector LIMIT {k}"
+    cur.execute(sql, {"q": _vec(q), "since": since})
+    return {row[0] for row in cur.fetchall()}
+
+
+def main(args: argparse.Namespace) -> None:
+    rng = np.random.default_rng(args.seed)
+    centers, vectors, times = synthetic_corpus(args.vectors, args.dim, args.topics, args.spread, rng)
+    picks = centers[rng.integers(0, args.topics, args.queries)]
+    queries = picks + args.spread * rng.normal(size=picks.shape).astype(np.float32) / np.sqrt(args.dim)
+
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    epochs = np.array([t.timestamp() for t in times])
+
+    engine = create_engine(settings.DATABASE_URL)
+    raw = engine.raw_connection()
+    try:
+        conn = raw.driver_connection
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            build_s = _load(cur, vectors, times, args.m, args.ef_construction)
+            print(json.dumps({"vectors": len(vectors), "hnsw_build_s": round(build_s, 2)}), flush=True)
+            for name, since in WINDOWS.items():
+                visible = np.flatnonzero(epochs >= since.timestamp()) if since is not None else np.arange(len(unit))
+                truth = []
+                for q in queries:
+                    scores = unit[visible] @ (q / np.linalg.norm(q))
+                    truth.append(set(visible[np.argsort(-scores)[: args.k]].tolist()))
+                strategies = [(f"hnsw ef={ef}", ef, False) for ef in (int(e) for e in args.ef_search.split(","))]
+                strategies.append(("filtered", None, True))
+                for label, ef, filtered in strategies:
+                    if ef is not None:
+                        cur.execute(f"SET hnsw.ef_search = {ef}")
+                    found = 0
+                    started = time.perf_counter()
+                    for q, expected in zip(queries, truth):
+                        found += len(_query(cur, q, since, args.k, filtered) & expected)
+                    elapsed = time.perf_counter() - started
+                    row = {
+                        "window": name,
+                        "visible": int(visible.size),
+                        "strategy": label,
+                        f"recall@{args.k}": round(found / (args.k * len(queries)), 4),
+                        "mean_ms": round(elapsed * 1000.0 / len(queries), 3),
+                    }
+                    print(json.dumps(row), flush=True)
+            cur.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    finally:
+        raw.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure pgvector HNSW recall and latency on a synthetic corpus")
+    parser.add_argument("--vectors", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--topics", type=int, default=500)
+    parser.add_argument("--spread", type=float, default=2.0)
+    parser.add_argument("--m", type=int, default=16)
+    parser.add_argument("--ef-construction", type=int, default=64)
+    parser.add_argument("--ef-search", default="40,100,200", help="comma separated hnsw.ef_search values")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    main(parser.parse_args())
@@ -0,0 +1,88 @@
+"""Concurrent search throughput against a live database, per pool size.
+
+For every pool size a fresh async engine is created and ``search_news`` is
+driven by ``--concurrency`` workers for ``--requests`` searches; one JSON
+line per pool size reports throughput and latency percentiles. With the
+synchronous data layer throughput stayed flat whatever the concurrency;
+with the async pool it should grow with the pool until the database or the
+CPU workers saturate.
+
+    python -m app.bench.search_concurrency --pool-sizes 1,2,4,8,16 --concurrency 32 --requests 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Sequence
+
+import numpy as np
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.rag import search
+from app.rag.embed import get_embedder
+
+DEFAULT_QUERIES = ["TSM", "NVDA", "AAPL", "semiconductor demand", "AI server", "earnings guidance", "interest rates"]
+
+
+async def _run(pool_size: int, concurrency: int, requests: int, queries: Sequence[str]) -> Dict[str, float]:
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        pool_size=pool_size,
+        max_overflow=0,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS * 10,
+        connect_args={"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"},
+    )
+    search.AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+    as_of = datetime.now(timezone.utc)
+    latencies: List[float] = []
+    next_request = 0
+
+    async def worker() -> None:
+        nonlocal next_request
+        while next_request < requests:
+            q = queries[next_request % len(queries)]
+            next_request += 1
+            started = time.perf_counter()
+            await search.search_news(query=q, as_of=as_of, top_k=settings.DEFAULT_TOP_K)
+            latencies.append(time.perf_counter() - started)
+
+    try:
+        # open the pool's connections before timing
+        await asyncio.gather(*(search.search_news(query=q, as_of=as_of, top_k=1) for q in queries[:pool_size]))
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    finally:
+        await engine.dispose()
+    ms = np.array(latencies) * 1000.0
+    return {
+        "pool_size": pool_size,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "qps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(ms, 95)), 2),
+        "p99_ms": round(float(np.percentile(ms, 99)), 2),
+    }
+
+
+async def _main(args: argparse.Namespace) -> None:
+    queries = args.queries.split(",") if args.queries else DEFAULT_QUERIES
+    # query encoding is cached after the first call; load the model up front
+    await asyncio.to_thread(get_embedder().warm_up)
+    for pool_size in (int(p) for p in args.pool_sizes.split(",")):
+        print(json.dumps(await _run(pool_size, args.concurrency, args.requests, queries)), flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure concurrent search_news throughput per DB pool size")
+    parser.add_argument("--pool-sizes", default="1,2,4,8,16", help="comma separated pool sizes")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent searches in flight")
+    parser.add_argument("--requests", type=int, default=1000, help="searches per pool size")
+    parser.add_argument("--queries", default="", help="comma separated queries (default: a small built-in mix)")
+    asyncio.run(_main(parser.parse_args()))
@@ -14,8 +14,70 @@ class AppSettings(BaseSettings):
     EMBEDDING_MODEL_LOCAL: str = Field(
         default="sentence-transformers/all-MiniLM-L6-v2"
     )
+    # Load the embedding model and run one encode at startup; /healthz answers
+    # 503 until it is done so traffic only arrives once the model is hot. A
+    # failed warm-up is retried in the background every
+    # EMBEDDING_WARMUP_RETRY_SECONDS.
+    EMBEDDING_WARMUP: bool = True
+    EMBEDDING_WARMUP_RETRY_SECONDS: float = 30.0
+    # Ingestion encodes chunks from many articles together: up to
+    # EMBEDDING_BATCH_SIZE texts per local encode (EMBEDDING_OPENAI_BATCH_SIZE
+    # per API request) and EMBEDDING_BATCH_TOKENS tokens per call; pending
+    # chunks are flushed once they reach EMBEDDING_PENDING_TOKENS.
+    EMBEDDING_BATCH_SIZE: int = 64
+    EMBEDDING_OPENAI_BATCH_SIZE: int = 256
+    EMBEDDING_BATCH_TOKENS: int = 100_000
+    EMBEDDING_PENDING_TOKENS: int = 200_000
+    # Query embeddings keyed by (backend, model, normalized text); shared via
+    # REDIS_URL when set.
+    QUERY_EMBEDDING_CACHE_SIZE: int = 4096
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS: int = 7 * 86400
+    # Lexical BM25 index over news_chunks; the snapshot file is optional
+    # (empty: rebuilt from the database at startup). The lexical fallback
+    # checks for chunks ingested by other processes at most every
+    # BM25_SYNC_INTERVAL_SECONDS.
+    BM25_INDEX_PATH: str = ""
+    BM25_K1: float = 1.2
+    BM25_B: float = 0.75
+    BM25_SYNC_INTERVAL_SECONDS: float = 30.0
+    # pgvector scan settings, applied per query with SET LOCAL. Windows with
+    # at most VECTOR_EXACT_WINDOW_ROWS embedded chunks skip the vector index
+    # and are ranked exactly. VECTOR_HNSW_ITERATIVE_SCAN (pgvector >= 0.8:
+    # strict_order|relaxed_order) keeps scanning until filtered rows fill LIMIT.
+    VECTOR_HNSW_EF_SEARCH: int = 100
+    VECTOR_IVFFLAT_PROBES: int = 10
+    VECTOR_EXACT_WINDOW_ROWS: int = 5000
+    VECTOR_HNSW_ITERATIVE_SCAN: str = ""
+    # In-process IVF index over news_embeddings, used when pgvector fails or
+    # finds nothing. ANN_LISTS=0 picks sqrt(n); windows with at most
+    # ANN_EXACT_BELOW visible chunks are searched exactly.
+    ANN_INDEX_ENABLED: bool = True
+    ANN_LISTS: int = 0
+    ANN_PROBES: int = 8
+    ANN_OVERSAMPLE: int = 4
+    ANN_EXACT_BELOW: int = 2048
+    # Rows per batch streamed into the exact cosine fallback; bounds its memory
+    EXACT_SEARCH_BATCH_SIZE: int = 4096
+    # Async pool used by search; statement timeout applies per query and is
+    # lowered further to the caller's remaining deadline.
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT_SECONDS: float = 5.0
+    DB_STATEMENT_TIMEOUT_MS: int = 5000
+    # Threads for query encoding and reranking, off the event loop
+    SEARCH_CPU_WORKERS: int = 4
+    # Scheduled RSS ingestion: RSS_FEEDS is "url|seconds,url" (empty: the
+    # built-in list); each feed runs every interval +/- RSS_JITTER of it.
+    RSS_SCHEDULER_ENABLED: bool = False
+    RSS_FEEDS: str = ""
+    RSS_INTERVAL_SECONDS: float = 900.0
+    RSS_JITTER: float = 0.1
+    RSS_CONCURRENCY: int = 8
+    RSS_MAX_ENTRIES_PER_FEED: int = 20
+    RSS_FETCH_TIMEOUT_SECONDS: float = 10.0
     MAX_TOP_K: int = 10
     DEFAULT_TOP_K: int = 3
+    MAX_BATCH_QUERIES: int = 50
     REQUEST_TIMEOUT_SECONDS: int = 10
 
     class Config:
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import math
+import time
+from typing import Optional
+
+from fastapi import Header
+
+# Remaining budget of the caller in milliseconds, measured when it sent the
+# request. Relative rather than absolute so hosts need no clock agreement.
+DEADLINE_HEADER = "X-Deadline-Ms"
+
+
+class Deadline:
+    """Point in (monotonic) time after which the caller no longer waits."""
+
+    def __init__(self, budget_seconds: Optional[float] = None) -> None:
+        self._expires_at = math.inf if budget_seconds is None else time.monotonic() + max(0.0, budget_seconds)
+
+    @classmethod
+    def from_header(cls, value: Optional[str]) -> "Deadline":
+        try:
+            return cls(float(value) / 1000.0) if value not in (None, "") else cls()
+        except ValueError:
+            return cls()
+
+    @property
+    def bounded(self) -> bool:
+        return self._expires_at != math.inf
+
+    def remaining(self) -> float:
+        return self._expires_at - time.monotonic()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+
+def request_deadline(x_deadline_ms: Optional[str] = Header(None, alias=DEADLINE_HEADER)) -> Deadline:
+    return Deadline.from_header(x_deadline_ms)
@@ -1,76 +1,113 @@
 from __future__ import annotations
-from typing import Iterable, Optional, Sequence, Tuple
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from sqlalchemy import select, outerjoin
+from sqlalchemy import and_, insert, or_, select, outerjoin, tuple_
 from app.db import models as m
 
 
-def upsert_news(
-    db: Session,
-    *,
-    ticker: Optional[str],
-    title: str,
-    url: Optional[str],
-    published_at,
-    source: Optional[str],
-    text: Optional[str],
-    first_seen_at,
-):
-    # dedupe by url if provided, else by (title, published_at)
-    stmt = None
-    if url:
-        stmt = select(m.News).where(m.News.url == url)
-    else:
-        stmt = select(m.News).where(m.News.title == title, m.News.published_at == published_at)
-    existing = db.execute(stmt).scalars().first()
-    if existing:
-        return existing
-    news = m.News(
-        ticker=ticker,
-        title=title,
-        url=url,
-        published_at=published_at,
-        source=source,
-        text=text,
-        first_seen_at=first_seen_at,
+NewsRow = Dict[str, Any]
+# (news_id, chunk_idx, content)
+ChunkRow = Tuple[uuid.UUID, int, str]
+
+
+def _batches(rows: Sequence, size: int) -> Iterator[Sequence]:
+    for i in range(0, len(rows), size):
+        yield rows[i : i + size]
+
+
+def _utc(value: Any) -> Any:
+    """Aware UTC datetimes, so caller keys match what timestamptz columns return."""
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+    return value
+
+
+def _news_by_title(db: Session, keys: Sequence[Tuple[str, Any]]) -> Dict[Tuple[str, Any], uuid.UUID]:
+    """Existing news ids for (title, published_at) keys; undated keys match NULL published_at."""
+    dated = [key for key in keys if key[1] is not None]
+    undated = [title for title, published_at in keys if published_at is None]
+    conds = []
+    if dated:
+        conds.append(tuple_(m.News.title, m.News.published_at).in_(dated))
+    if undated:
+        # a NULL never matches IN (...); undated rows need their own IS NULL condition
+        conds.append(and_(m.News.title.in_(undated), m.News.published_at.is_(None)))
+    if not conds:
+        return {}
+    stmt = select(m.News.id, m.News.title, m.News.published_at).where(or_(*conds))
+    return {(title, _utc(published_at)): news_id for news_id, title, published_at in db.execute(stmt)}
+
+
+def bulk_upsert_news(db: Session, rows: Sequence[NewsRow], batch_size: int = 1000) -> List[uuid.UUID]:
+    """Insert news rows set-wise; returns each row's id (existing or new), in input order.
+
+    Rows are deduped by url (``INSERT ... ON CONFLICT (url) DO NOTHING``
+    plus one lookup for the conflicting urls), or by (title, published_at)
+    when the url is missing. Keys are columns of ``news`` minus ``id``;
+    naive ``published_at`` values are taken as UTC.
+    """
+    ids: List[Optional[uuid.UUID]] = [None] * len(rows)
+    by_url: Dict[str, List[int]] = {}
+    by_title: Dict[Tuple[str, Any], List[int]] = {}
+    rows = [{**row, "published_at": _utc(row.get("published_at"))} for row in rows]
+    for i, row in enumerate(rows):
+        if row.get("url"):
+            by_url.setdefault(row["url"], []).append(i)
+        else:
+            by_title.setdefault((row["title"], row.get("published_at")), []).append(i)
+
+    urls = list(by_url)
+    for batch in _batches(urls, batch_size):
+        values = [{"id": uuid.uuid4(), **rows[by_url[url][0]]} for url in batch]
+        stmt = pg_insert(m.News).on_conflict_do_nothing(index_elements=[m.News.url]).returning(m.News.id, m.News.url)
+        found = {url: news_id for news_id, url in db.execute(stmt, values)}
+        missing = [url for url in batch if url not in found]
+        if missing:
+            found.update({url: news_id for news_id, url in db.execute(select(m.News.id, m.News.url).where(m.News.url.in_(missing)))})
+        for url in batch:
+            for i in by_url[url]:
+                ids[i] = found[url]
+
+    keys = list(by_title)
+    for batch in _batches(keys, batch_size):
+        existing = _news_by_title(db, batch)
+        values = [{"id": uuid.uuid4(), **rows[by_title[key][0]]} for key in batch if key not in existing]
+        if values:
+            db.execute(insert(m.News), values)
+            existing.update({(v["title"], v.get("published_at")): v["id"] for v in values})
+        for key in batch:
+            for i in by_title[key]:
+                ids[i] = existing[key]
+    return ids  # type: ignore[return-value]
+
+
+def bulk_add_chunks(db: Session, rows: Sequence[ChunkRow], batch_size: int = 1000) -> List[Tuple[uuid.UUID, uuid.UUID, int]]:
+    """Insert chunks set-wise, skipping (news_id, chunk_idx) pairs that exist.
+
+    Returns (chunk_id, news_id, chunk_idx) of the chunks actually created.
+    """
+    created: List[Tuple[uuid.UUID, uuid.UUID, int]] = []
+    stmt = (
+        pg_insert(m.NewsChunk)
+        .on_conflict_do_nothing(index_elements=[m.NewsChunk.news_id, m.NewsChunk.chunk_idx])
+        .returning(m.NewsChunk.id, m.NewsChunk.news_id, m.NewsChunk.chunk_idx)
     )
-    db.add(news)
-    db.flush()
-    return news
-
-
-def add_chunks(db: Session, news: m.News, chunks: Sequence[str]):
-    # idempotent: skip if chunk_idx already exists for this news
-    existing = db.execute(
-        select(m.NewsChunk.chunk_idx, m.NewsChunk.id).where(m.NewsChunk.news_id == news.id)
-    ).all()
-    existing_idx_to_id = {row[0]: row[1] for row in existing}
-    created = []
-    for idx, content in enumerate(chunks):
-        if idx in existing_idx_to_id:
-            # optionally update content if empty; keep as is to avoid churn
-            continue
-        c = m.NewsChunk(news_id=news.id, chunk_idx=idx, content=content)
-        db.add(c)
-        created.append(c)
-    db.flush()
+    for batch in _batches(rows, batch_size):
+        values = [{"id": uuid.uuid4(), "news_id": news_id, "chunk_idx": idx, "content": content} for news_id, idx, content in batch]
+        created.extend(tuple(row) for row in db.execute(stmt, values))
     return created
 
 
-def add_embeddings(db: Session, chunks: Sequence[m.NewsChunk], vectors):
-    # vectors: ndarray num_chunks x 384
-    for chunk, vec in zip(chunks, vectors):
-        # upsert by chunk_id uniqueness
-        existing = db.execute(
-            select(m.NewsEmbedding).where(m.NewsEmbedding.chunk_id == chunk.id)
-        ).scalars().first()
-        if existing:
-            existing.embedding = vec.tolist()
-        else:
-            emb = m.NewsEmbedding(chunk_id=chunk.id, embedding=vec.tolist())
-            db.add(emb)
-    db.flush()
-    return True
+def bulk_upsert_embeddings(db: Session, rows: Sequence[Tuple[uuid.UUID, Any]], batch_size: int = 1000) -> int:
+    """Write (chunk_id, vector) pairs set-wise, replacing the vector of chunks that have one."""
+    base = pg_insert(m.NewsEmbedding)
+    stmt = base.on_conflict_do_update(index_elements=[m.NewsEmbedding.chunk_id], set_={"embedding": base.excluded.embedding})
+    for batch in _batches(rows, batch_size):
+        db.execute(stmt, [{"id": uuid.uuid4(), "chunk_id": chunk_id, "embedding": vec} for chunk_id, vec in batch])
+    return len(rows)
 
 
 def get_candidate_chunks_by_time(db: Session, *, as_of, since=None):
@@ -85,7 +122,7 @@ def get_candidate_chunks_by_time(db: Session, *, as_of, since=None):
     return db.execute(stmt).all()
 
 
-def get_chunks_without_embedding(db: Session, *, news_id=None):
+def get_chunks_without_embedding(db: Session, *, news_id=None, news_ids: Optional[Sequence] = None):
     # Return NewsChunk objects that do not have a corresponding NewsEmbedding
     chunk = m.NewsChunk
     emb = m.NewsEmbedding
@@ -93,6 +130,8 @@ def get_chunks_without_embedding(db: Session, *, news_id=None):
     stmt = select(chunk).select_from(j).where(emb.id.is_(None))
     if news_id is not None:
         stmt = stmt.where(chunk.news_id == news_id)
+    if news_ids is not None:
+        stmt = stmt.where(chunk.news_id.in_(list(news_ids)))
     return db.execute(stmt).scalars().all()
 
 
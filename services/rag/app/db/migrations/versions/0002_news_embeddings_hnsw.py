@@ -0,0 +1,55 @@
+"""hnsw index on news_embeddings
+
+Revision ID: 0002_news_embeddings_hnsw
+Revises: 0001_news_baseline
+Create Date: 2026-10-19 00:00:00
+
+The baseline ivfflat index is built on an empty table, so its list
+centroids are meaningless. HNSW needs no training and stays accurate as
+rows arrive. On pgvector < 0.5 (no HNSW) the ivfflat index is rebuilt
+instead, with lists sized from the rows present now.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0002_news_embeddings_hnsw'
+down_revision = '0001_news_baseline'
+branch_labels = None
+depends_on = None
+
+
+def _pgvector_version(bind) -> tuple:
+    version = bind.execute(sa.text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")).scalar()
+    return tuple(int(part) for part in (version or "0").split(".")[:2])
+
+
+def _ivfflat_lists(bind) -> int:
+    # pgvector guidance: rows / 1000 up to 1M rows, sqrt(rows) beyond
+    rows = bind.execute(sa.text("SELECT count(*) FROM news_embeddings")).scalar() or 0
+    return max(10, rows // 1000 if rows <= 1_000_000 else int(rows ** 0.5))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    op.execute("DROP INDEX IF EXISTS ix_news_embeddings_embedding;")
+    if _pgvector_version(bind) >= (0, 5):
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_news_embeddings_embedding_hnsw ON news_embeddings "
+            "USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);"
+        )
+    else:
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_news_embeddings_embedding ON news_embeddings "
+            f"USING ivfflat (embedding vector_cosine_ops) WITH (lists = {_ivfflat_lists(bind)});"
+        )
+    # narrow since/as_of windows are filtered before ranking; give the filter an index
+    op.create_index('ix_news_published_at_first_seen_at', 'news', ['published_at', 'first_seen_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_news_published_at_first_seen_at', table_name='news')
+    op.execute("DROP INDEX IF EXISTS ix_news_embeddings_embedding_hnsw;")
+    op.execute("DROP INDEX IF EXISTS ix_news_embeddings_embedding;")
+    op.execute("CREATE INDEX ix_news_embeddings_embedding ON news_embeddings USING ivfflat (embedding vector_cosine_ops);")
@@ -0,0 +1,26 @@
+"""unique news.url
+
+Revision ID: 0003_news_url_unique
+Revises: 0002_news_embeddings_hnsw
+Create Date: 2026-10-19 00:00:00
+
+Bulk ingestion dedupes articles with INSERT ... ON CONFLICT (url), which
+needs a unique constraint. Ingestion has always deduped by url, so existing
+rows satisfy it; NULL urls stay allowed.
+"""
+
+from alembic import op
+
+
+revision = '0003_news_url_unique'
+down_revision = '0002_news_embeddings_hnsw'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_unique_constraint('uq_news_url', 'news', ['url'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_news_url', 'news', type_='unique')
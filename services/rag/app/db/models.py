@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from pgvector.sqlalchemy import Vector
@@ -21,6 +21,13 @@ class News(Base):
 
     chunks = relationship("NewsChunk", back_populates="news", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # bulk ingestion dedupes with INSERT ... ON CONFLICT (url)
+        UniqueConstraint("url", name="uq_news_url"),
+        # narrow since/as_of windows are filtered before vector ranking
+        Index("ix_news_published_at_first_seen_at", "published_at", "first_seen_at"),
+    )
+
 
 class NewsChunk(Base):
     __tablename__ = "news_chunks"
@@ -49,6 +56,14 @@ class NewsEmbedding(Base):
 
     __table_args__ = (
         Index("ix_news_embeddings_chunk_id", "chunk_id", unique=True),
+        # same definition as migration 0002 (needs pgvector >= 0.5)
+        Index(
+            "ix_news_embeddings_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
     )
 
 
@@ -19,5 +19,10 @@ class SearchNewsResponse(BaseModel):
     query: str
     top_k: int
     results: List[SearchNewsItem]
+    # True when the caller's deadline cut stages short (rerank or fallbacks skipped)
+    partial: bool = False
 
 
+class SearchNewsBatchResponse(BaseModel):
+    results: List[SearchNewsResponse]
+
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Sequence
+
+from app.db import crud
+from app.db.session import SessionLocal
+from app.rag.ann import index_vectors
+from app.rag.batcher import EmbeddingBatcher
+from app.rag.bm25 import index_chunks
+from app.rag.chunk import split_text
+from app.rag.embed import get_embedder
+
+
+def ingest_articles(rows: Sequence[crud.NewsRow], chunk_text: Callable[[str], List[str]] = split_text) -> Dict[str, int]:
+    """Store articles, their chunks and embeddings with set-based writes, then update the indexes.
+
+    ``rows`` are ``news`` column dicts (see ``crud.bulk_upsert_news``);
+    articles already stored are matched, not duplicated, and only chunks
+    still missing an embedding are encoded, batched across articles.
+    """
+    embedder = get_embedder()
+    with SessionLocal() as db:
+        # 1) upsert 新聞（以 url 或 (title, published_at) 去重）
+        news_ids = crud.bulk_upsert_news(db, rows)
+        news_by_id = dict(zip(news_ids, rows))
+
+        # 2) 補上缺少的 chunks；已存在的 (news_id, chunk_idx) 會略過
+        contents = {}
+        for news_id, row in news_by_id.items():
+            for idx, content in enumerate(chunk_text(row.get("text") or "")):
+                contents[(news_id, idx)] = content
+        created = crud.bulk_add_chunks(db, [(news_id, idx, content) for (news_id, idx), content in contents.items()])
+
+        # 3) 所有「尚未嵌入」的 chunks（包含既有但沒有 embeddings 的）跨文章合批 encode，每次 flush 整批寫回
+        embeddings: List = []
+
+        def write_back(encoded) -> None:
+            crud.bulk_upsert_embeddings(db, encoded)
+            embeddings.extend(encoded)
+
+        batcher = EmbeddingBatcher(on_flush=write_back, embedder=embedder)
+        chunk_news = {}
+        for chunk in crud.get_chunks_without_embedding(db, news_ids=list(news_by_id)):
+            chunk_news[chunk.id] = chunk.news_id
+            batcher.add(chunk.id, chunk.content)
+        batcher.flush()
+        db.commit()
+
+    # 已 commit 的 chunks 才加入 BM25 與 ANN 索引
+    def times(news_id):
+        row = news_by_id[news_id]
+        return row.get("published_at"), row.get("first_seen_at")
+
+    index_chunks(
+        [(str(chunk_id), str(news_id), contents[(news_id, idx)], *times(news_id)) for chunk_id, news_id, idx in created]
+    )
+    index_vectors([(str(chunk_id), vec, *times(chunk_news[chunk_id])) for chunk_id, vec in embeddings])
+    return {"news": len(news_by_id), "new_chunks": len(created), "new_embeddings": len(embeddings)}
@@ -1,12 +1,6 @@
 from __future__ import annotations
-from datetime import datetime, timezone
+import asyncio
 from typing import List
-from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
-from app.db import crud
-from app.rag.chunk import split_text
-from app.rag.embed import EmbeddingBackend
-from app.rag.mapping import guess_ticker_from_text
 
 
 RSS_FEEDS: List[str] = [
@@ -15,46 +9,23 @@ RSS_FEEDS: List[str] = [
 
 
 def ingest_rss():
+    """One round over every configured feed; ``app.ingest.rss_scheduler`` runs it on a schedule."""
     try:
-        import feedparser  # type: ignore
+        import feedparser  # type: ignore  # noqa: F401
     except Exception:
         return  # no external network or package not available
 
-    embedder = EmbeddingBackend()
-    with SessionLocal() as db:
-        for feed_url in RSS_FEEDS:
-            try:
-                feed = feedparser.parse(feed_url)
-            except Exception:
-                continue
-            for entry in feed.entries[:20]:
-                title = entry.get("title") or ""
-                url = entry.get("link")
-                published = entry.get("published_parsed")
-                if published:
-                    published_at = datetime(*published[:6], tzinfo=timezone.utc)
-                else:
-                    published_at = datetime.now(timezone.utc)
-                summary = entry.get("summary") or ""
-                text = summary
-                ticker = guess_ticker_from_text(title + " " + text)
-                news = crud.upsert_news(
-                    db,
-                    ticker=ticker,
-                    title=title,
-                    url=url,
-                    published_at=published_at,
-                    source="rss",
-                    text=text,
-                    first_seen_at=published_at,
-                )
-                chunks = split_text(text)
-                if not chunks:
-                    continue
-                created_chunks = crud.add_chunks(db, news, chunks)
-                vectors = embedder.embed_chunks([c.content for c in created_chunks])
-                crud.add_embeddings(db, created_chunks, vectors)
-        db.commit()
+    asyncio.run(_ingest_once())
+
+
+async def _ingest_once() -> None:
+    from app.ingest.rss_scheduler import RSSScheduler, configured_feeds
+
+    scheduler = RSSScheduler(configured_feeds())
+    try:
+        await scheduler.run_once(only_due=False)
+    finally:
+        await scheduler.aclose()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,268 @@
+"""Scheduled RSS ingestion.
+
+Every feed has its own interval (jittered so feeds sharing one do not fire
+together). Due feeds are fetched concurrently with one async HTTP client,
+sending the ETag / Last-Modified of the previous response so unchanged
+feeds answer 304 and cost nothing further. ``file://`` feeds are re-read
+only when the file's mtime or size changes, which makes the whole path
+testable offline. Entries are deduped across feeds and against recently
+ingested ones before any database work; what remains goes to
+``ingest_articles`` in one call per round. A feed's new validators are only
+kept once that call succeeds, so a failed round is fetched again in full.
+
+    python -m app.ingest.rss_scheduler            # run until interrupted
+    python -m app.ingest.rss_scheduler --once     # one round over every feed
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import unquote, urlparse
+from urllib.request import url2pathname
+
+import httpx
+
+from app.core.config import settings
+from app.ingest.pipeline import ingest_articles
+from app.rag.mapping import guess_ticker_from_text
+
+logger = logging.getLogger(__name__)
+
+# entry keys remembered across rounds
+_SEEN_LIMIT = 50_000
+
+
+@dataclass
+class FeedState:
+    url: str
+    interval: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # (etag, last_modified) of a changed fetch, committed after a successful ingest
+    pending: Optional[Tuple[Optional[str], Optional[str]]] = None
+    next_run: float = 0.0
+    fetches: int = 0
+    not_modified: int = 0
+    errors: int = 0
+
+
+def parse_feed_specs(spec: str, default_interval: float) -> Dict[str, float]:
+    """``"url|seconds,url"`` -> {url: interval}; a missing interval uses the default."""
+    feeds: Dict[str, float] = {}
+    for part in (p.strip() for p in spec.split(",")):
+        if not part:
+            continue
+        url, _, seconds = part.partition("|")
+        feeds[url.strip()] = float(seconds) if seconds.strip() else default_interval
+    return feeds
+
+
+def entry_key(row: Dict[str, Any]) -> Tuple:
+    # the same keys crud.bulk_upsert_news dedupes by
+    return ("url", row["url"]) if row.get("url") else ("title", row["title"], row.get("published_at"))
+
+
+def entry_row(entry: Any) -> Dict[str, Any]:
+    """``news`` row for one feed entry.
+
+    An undated entry keeps ``published_at`` NULL rather than the fetch
+    time, so a linkless one has the same (title, NULL) key every round.
+    """
+    title = entry.get("title") or ""
+    published = entry.get("published_parsed")
+    published_at = datetime(*published[:6], tzinfo=timezone.utc) if published else None
+    text = entry.get("summary") or ""
+    return {
+        "ticker": guess_ticker_from_text(title + " " + text),
+        "title": title,
+        "url": entry.get("link"),
+        "published_at": published_at,
+        "source": "rss",
+        "text": text,
+        "first_seen_at": published_at or datetime.now(timezone.utc),
+    }
+
+
+def _parse(content: bytes, max_entries: int) -> List[Dict[str, Any]]:
+    import feedparser  # type: ignore
+
+    return [entry_row(entry) for entry in feedparser.parse(content).entries[:max_entries]]
+
+
+class RSSScheduler:
+    def __init__(
+        self,
+        feeds: Union[Sequence[str], Dict[str, float]],
+        *,
+        interval: float = settings.RSS_INTERVAL_SECONDS,
+        jitter: float = settings.RSS_JITTER,
+        concurrency: int = settings.RSS_CONCURRENCY,
+        max_entries: int = settings.RSS_MAX_ENTRIES_PER_FEED,
+        timeout: float = settings.RSS_FETCH_TIMEOUT_SECONDS,
+        ingest: Callable[[List[Dict[str, Any]]], Any] = ingest_articles,
+        client: Optional[httpx.AsyncClient] = None,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        intervals = feeds if isinstance(feeds, dict) else {url: interval for url in feeds}
+        self.jitter = jitter
+        self.max_entries = max_entries
+        self.ingest = ingest
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self._client = client
+        self._own_client = client is None
+        self._timeout = timeout
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._seen: "OrderedDict[Tuple, None]" = OrderedDict()
+        now = clock()
+        # first runs are spread over one jitter window instead of all at once
+        self.feeds = {
+            url: FeedState(url=url, interval=seconds, next_run=now + self.rng.uniform(0, jitter * seconds))
+            for url, seconds in intervals.items()
+        }
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self._timeout, follow_redirects=True)
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._own_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _schedule(self, state: FeedState) -> None:
+        spread = state.interval * self.jitter
+        state.next_run = self.clock() + state.interval + self.rng.uniform(-spread, spread)
+
+    # -- fetching -----------------------------------------------------------
+    async def _fetch_http(self, state: FeedState) -> Optional[bytes]:
+        headers = {}
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+        resp = await self.client.get(state.url, headers=headers)
+        if resp.status_code == 304:
+            return None
+        resp.raise_for_status()
+        state.pending = (resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        return resp.content
+
+    async def _fetch_file(self, state: FeedState) -> Optional[bytes]:
+        path = Path(url2pathname(unquote(urlparse(state.url).path)))
+        stat = await asyncio.to_thread(path.stat)
+        validator = f"{stat.st_mtime_ns}-{stat.st_size}"
+        if validator == state.etag:
+            return None
+        content = await asyncio.to_thread(path.read_bytes)
+        state.pending = (validator, None)
+        return content
+
+    async def fetch(self, state: FeedState) -> Optional[List[Dict[str, Any]]]:
+        """Parsed rows of a changed feed; None when unchanged or failed."""
+        async with self._semaphore:
+            state.fetches += 1
+            try:
+                if urlparse(state.url).scheme == "file":
+                    content = await self._fetch_file(state)
+                else:
+                    content = await self._fetch_http(state)
+                if content is None:
+                    state.not_modified += 1
+                    return None
+                return await asyncio.to_thread(_parse, content, self.max_entries)
+            except Exception as exc:
+                state.pending = None
+                state.errors += 1
+                logger.warning("[RSS] fetch %s failed: %s", state.url, exc)
+                return None
+            finally:
+                self._schedule(state)
+
+    # -- rounds -------------------------------------------------------------
+    def _dedupe(self, batches: Sequence[Optional[List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        rows: List[Dict[str, Any]] = []
+        for batch in batches:
+            for row in batch or []:
+                key = entry_key(row)
+                if key in self._seen:
+                    continue
+                self._seen[key] = None
+                rows.append(row)
+        while len(self._seen) > _SEEN_LIMIT:
+            self._seen.popitem(last=False)
+        return rows
+
+    async def run_once(self, only_due: bool = True) -> Dict[str, int]:
+        """Fetch due feeds (or all), dedupe their entries and ingest the new ones."""
+        now = self.clock()
+        due = [s for s in self.feeds.values() if not only_due or s.next_run <= now]
+        batches = await asyncio.gather(*(self.fetch(state) for state in due))
+        rows = self._dedupe(batches)
+        if rows:
+            try:
+                await asyncio.to_thread(self.ingest, rows)
+            except Exception:
+                # forget the entries and the new validators: the next fetch
+                # of these feeds downloads them again and retries
+                for row in rows:
+                    self._seen.pop(entry_key(row), None)
+                for state in due:
+                    state.pending = None
+                raise
+        for state in due:
+            if state.pending is not None:
+                state.etag, state.last_modified = state.pending
+                state.pending = None
+        return {"feeds": len(due), "changed": sum(b is not None for b in batches), "entries": len(rows)}
+
+    async def run_forever(self, stop: Optional[asyncio.Event] = None) -> None:
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            try:
+                stats = await self.run_once()
+                if stats["entries"]:
+                    logger.info("[RSS] %d feeds fetched, %d changed, %d new entries", stats["feeds"], stats["changed"], stats["entries"])
+            except Exception as exc:
+                logger.error("[RSS] ingest failed: %s", exc)
+            wake = min((s.next_run for s in self.feeds.values()), default=self.clock() + 60.0)
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=max(0.0, wake - self.clock()))
+            except asyncio.TimeoutError:
+                pass
+
+
+def configured_feeds() -> Dict[str, float]:
+    from app.ingest.rss_ingestor import RSS_FEEDS
+
+    spec = settings.RSS_FEEDS or ",".join(RSS_FEEDS)
+    return parse_feed_specs(spec, settings.RSS_INTERVAL_SECONDS)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    scheduler = RSSScheduler(configured_feeds())
+    try:
+        if args.once:
+            print(await scheduler.run_once(only_due=False))
+        else:
+            await scheduler.run_forever()
+    finally:
+        await scheduler.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scheduled RSS ingestion")
+    parser.add_argument("--once", action="store_true", help="fetch every feed once and exit")
+    asyncio.run(_main(parser.parse_args()))
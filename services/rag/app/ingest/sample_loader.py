@@ -6,9 +6,8 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.db.session import SessionLocal
-from app.db import crud
+from app.ingest.pipeline import ingest_articles
 from app.rag.chunk import split_text
-from app.rag.embed import EmbeddingBackend
 from app.rag.mapping import guess_ticker_from_text
 
 # ---- 確保 pgvector extension 在 fallback 模式也會被建立 ----
@@ -81,46 +80,28 @@ SAMPLES: List[Dict] = [
 
 
 def load_samples() -> None:
-    embedder = EmbeddingBackend()  # auto: 有 OPENAI_KEY 用 openai，否則 local ST model
-    num_news = 0
-    new_chunks = 0
-    new_embeddings = 0
-
     with SessionLocal() as db:
         # 確保 pgvector 存在（避免 Alembic 失敗時 embeddings 寫不進去）
         _ensure_vector_extension(db)
 
-        for item in SAMPLES:
-            # 1) upsert 新聞（以 url 或 (title, published_at) 去重，crud 內部負責）
-            ticker = guess_ticker_from_text(f"{item['title']} {item['text']}") or None
-            news = crud.upsert_news(
-                db,
-                ticker=ticker,
-                title=item["title"],
-                url=item["url"],
-                published_at=item["published_at"],
-                source=item["source"],
-                text=item["text"],
-                first_seen_at=item["published_at"],
-            )
-            num_news += 1
-
-            # 2) 確保有 chunks：若 add_chunks 回 0，代表已存在，就跳到找「尚未嵌入」的 chunks
-            chunks_texts = split_text(item["text"], target_tokens=600, min_tokens=200)
-            created_chunks = crud.add_chunks(db, news, chunks_texts)  # 回傳「新建的 Chunk 物件」list
-            if created_chunks:
-                new_chunks += len(created_chunks)
-
-            # 3) 找到所有「尚未嵌入」的 chunks（包含既有但沒有 embeddings 的）
-            pending_chunks = crud.get_chunks_without_embedding(db, news_id=news.id)
-            if pending_chunks:
-                vectors = embedder.embed_chunks([c.content for c in pending_chunks])
-                crud.add_embeddings(db, pending_chunks, vectors)
-                new_embeddings += len(pending_chunks)
-
-        db.commit()
-
-    print(f"[sample_loader] inserted news={num_news}, new_chunks={new_chunks}, new_embeddings={new_embeddings}")
+    rows = [
+        {
+            "ticker": guess_ticker_from_text(f"{item['title']} {item['text']}") or None,
+            "title": item["title"],
+            "url": item["url"],
+            "published_at": item["published_at"],
+            "source": item["source"],
+            "text": item["text"],
+            "first_seen_at": item["published_at"],
+        }
+        for item in SAMPLES
+    ]
+    # embedding backend auto: 有 OPENAI_KEY 用 openai，否則 local ST model
+    counts = ingest_articles(rows, chunk_text=lambda text: split_text(text, target_tokens=600, min_tokens=200))
+    print(
+        f"[sample_loader] inserted news={counts['news']}, new_chunks={counts['new_chunks']}, "
+        f"new_embeddings={counts['new_embeddings']}"
+    )
 
 
 if __name__ == "__main__":
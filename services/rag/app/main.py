@@ -1,3 +1,4 @@
+import asyncio
 import os
 import subprocess
 import logging
@@ -6,7 +7,10 @@ from pathlib import Path
 from fastapi import FastAPI
 from app.core.config import settings
 from app.api.routers import router as api_router
-from app.db.session import engine, create_all_with_extensions
+from app.db.session import async_engine, engine, create_all_with_extensions
+from app.rag.ann import load_ann_index
+from app.rag.bm25 import load_bm25_index
+from app.rag.embed import get_embedder
 
 logger = logging.getLogger(__name__)
 
@@ -46,9 +50,85 @@ def run_migrations_or_fallback() -> None:
             # 不中斷服務運行，但後續操作可能取不到表；保留錯誤日誌讓測試可定位
 
 
+async def warm_up_embedder() -> bool:
+    """載入 embedding 模型並做一次 encode；失敗時 /healthz 維持 503 並回傳 False。"""
+    try:
+        await asyncio.to_thread(get_embedder().warm_up)
+        logger.info("[EMBEDDING] model warmed up")
+        return True
+    except Exception as exc:
+        logger.error("[EMBEDDING] warm-up failed: %s", exc)
+        return False
+
+
+async def retry_warm_up_embedder() -> None:
+    """背景每隔 `EMBEDDING_WARMUP_RETRY_SECONDS` 重試預熱，成功後 /healthz 轉為 200。"""
+    while not get_embedder().ready:
+        await asyncio.sleep(settings.EMBEDDING_WARMUP_RETRY_SECONDS)
+        if not get_embedder().ready:
+            await warm_up_embedder()
+
+
+async def build_bm25_index() -> None:
+    """載入 BM25 快照並補上資料庫中尚未索引的 chunks；失敗時 lexical 檢索暫時為空。"""
+    try:
+        await asyncio.to_thread(load_bm25_index)
+    except Exception as exc:
+        logger.error("[BM25] index build failed: %s", exc)
+
+
+async def build_ann_index() -> None:
+    """從 news_embeddings 批次匯出建立 ANN 索引；失敗時向量 fallback 改走精確搜尋。"""
+    try:
+        await asyncio.to_thread(load_ann_index)
+    except Exception as exc:
+        logger.error("[ANN] index build failed: %s", exc)
+
+
+_rss_scheduler = None
+_rss_stop = asyncio.Event()
+_rss_task = None
+_warmup_task = None
+
+
+def start_rss_scheduler() -> None:
+    """背景定時抓取 RSS（`RSS_SCHEDULER_ENABLED`）。"""
+    global _rss_scheduler, _rss_task
+    from app.ingest.rss_scheduler import RSSScheduler, configured_feeds
+
+    _rss_scheduler = RSSScheduler(configured_feeds())
+    _rss_task = asyncio.create_task(_rss_scheduler.run_forever(_rss_stop))
+
+
+def start_warm_up_retry() -> None:
+    global _warmup_task
+    _warmup_task = asyncio.create_task(retry_warm_up_embedder())
+
+
 @app.on_event("startup")
 async def on_startup():
     run_migrations_or_fallback()
+    await build_bm25_index()
+    if settings.ANN_INDEX_ENABLED:
+        await build_ann_index()
+    if settings.EMBEDDING_WARMUP and not await warm_up_embedder():
+        start_warm_up_retry()
+    if settings.RSS_SCHEDULER_ENABLED:
+        start_rss_scheduler()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    global _warmup_task
+    if _warmup_task is not None:
+        _warmup_task.cancel()
+        await asyncio.gather(_warmup_task, return_exceptions=True)
+        _warmup_task = None
+    if _rss_task is not None:
+        _rss_stop.set()
+        await _rss_task
+        await _rss_scheduler.aclose()
+    await async_engine.dispose()
 
 
 # 路由
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import models as m
+from app.rag.bm25 import _epoch, _Growable
+
+logger = logging.getLogger(__name__)
+
+# (chunk_id, vector, published_at, first_seen_at)
+VectorEntry = Tuple[str, Any, Optional[datetime], Optional[datetime]]
+
+# k-means trains on at most this many vectors per list
+_TRAIN_PER_LIST = 64
+# rows per matmul when assigning vectors to lists
+_ASSIGN_BATCH = 65536
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the most similar centroid for each (unit) vector."""
+    out = np.empty(len(vectors), dtype=np.int32)
+    for i in range(0, len(vectors), _ASSIGN_BATCH):
+        out[i : i + _ASSIGN_BATCH] = np.argmax(vectors[i : i + _ASSIGN_BATCH] @ centroids.T, axis=1)
+    return out
+
+
+def _group(assign: np.ndarray, n_lists: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(rows ordered by list, start offset of each list) for a list assignment."""
+    counts = np.bincount(assign, minlength=n_lists)
+    order = np.argsort(assign, kind="stable").astype(np.int32)
+    return order, np.concatenate([[0], np.cumsum(counts)])
+
+
+class IVFIndex:
+    """In-process IVF-flat approximate nearest neighbour index over chunk embeddings.
+
+    Vectors are kept unit-normalized in one float32 matrix, so cosine
+    similarity is a dot product. Once the index holds ``exact_below`` vectors
+    it trains spherical k-means centroids (``n_lists``; 0 means sqrt(n)) and
+    files every row under its nearest centroid; a query scores only the rows
+    of its ``n_probe`` closest lists. Time filters are applied to those
+    candidates afterwards; when fewer than ``k * oversample`` survive, the
+    probe count doubles until enough do. Windows with at most
+    ``exact_below`` visible rows are searched exactly instead, which is both
+    faster and lossless for narrow ``since``/``as_of`` ranges.
+    """
+
+    def __init__(
+        self, n_lists: int = 0, n_probe: int = 8, oversample: int = 4, exact_below: int = 2048, seed: int = 0
+    ) -> None:
+        self.n_lists = n_lists
+        self.n_probe = max(1, n_probe)
+        self.oversample = max(1, oversample)
+        self.exact_below = exact_below
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.RLock()
+        self.dim: Optional[int] = None
+        self.chunk_ids: List[str] = []
+        self._row_by_chunk: Dict[str, int] = {}
+        self._vectors: Optional[_Growable] = None
+        self._published = _Growable(np.float64)
+        self._first_seen = _Growable(np.float64)
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[_Growable] = []
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        return len(self.chunk_ids)
+
+    def __contains__(self, chunk_id: str) -> bool:
+        return str(chunk_id) in self._row_by_chunk
+
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+
+    # -- updates --------------------------------------------------------------
+    def add_many(self, entries: Iterable[VectorEntry], train: bool = True) -> int:
+        """Index new chunks; returns how many were added.
+
+        With ``train`` the lists are (re)trained once the index reaches
+        ``exact_below`` rows and again whenever it has grown fourfold, so
+        centroids keep up with the corpus. Bulk loads pass False and call
+        :meth:`train` once at the end.
+        """
+        with self._lock:
+            vecs = []
+            for chunk_id, vector, published_at, first_seen_at in entries:
+                chunk_id = str(chunk_id)
+                if chunk_id in self._row_by_chunk:
+                    continue
+                v = np.asarray(vector, dtype=np.float32).ravel()
+                if self.dim is None:
+                    self.dim = v.size
+                    self._vectors = _Growable(np.float32, row_shape=(self.dim,))
+                norm = float(np.linalg.norm(v))
+                if v.size != self.dim or not norm:
+                    continue  # another model's vector, or nothing to rank by
+                self._row_by_chunk[chunk_id] = len(self.chunk_ids)
+                self.chunk_ids.append(chunk_id)
+                self._published.append(_epoch(published_at))
+                self._first_seen.append(_epoch(first_seen_at))
+                vecs.append(v / norm)
+            if not vecs:
+                return 0
+            start = len(self._vectors.view)
+            block = np.stack(vecs)
+            self._vectors.extend(block)
+            if self.trained:
+                for row, c in zip(range(start, start + len(block)), _nearest(block, self._centroids)):
+                    self._lists[c].append(row)
+            if train and len(self) >= self.exact_below and len(self) >= 4 * self._trained_size:
+                self.train()
+            return len(block)
+
+    def train(self, iterations: int = 10) -> None:
+        """Fit spherical k-means centroids on a sample and rebuild the lists."""
+        with self._lock:
+            n = len(self)
+            if not n:
+                return
+            vectors = self._vectors.view
+            n_lists = max(1, min(self.n_lists or int(round(math.sqrt(n))), n))
+            sample = vectors[self._rng.choice(n, size=min(n, n_lists * _TRAIN_PER_LIST), replace=False)]
+            centroids = sample[self._rng.choice(len(sample), size=n_lists, replace=False)].copy()
+            for _ in range(iterations):
+                order, offsets = _group(_nearest(sample, centroids), n_lists)
+                counts = np.diff(offsets)
+                nonempty = counts > 0
+                sums = np.add.reduceat(sample[order], offsets[:-1][nonempty], axis=0)
+                centroids[nonempty] = sums
+                # an empty list restarts from a random sample vector
+                empty = int((~nonempty).sum())
+                if empty:
+                    centroids[~nonempty] = sample[self._rng.choice(len(sample), size=empty)]
+                centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+            order, offsets = _group(_nearest(vectors, centroids), n_lists)
+            self._centroids = centroids
+            self._lists = [_Growable(np.int32, order[offsets[c] : offsets[c + 1]]) for c in range(n_lists)]
+            self._trained_size = n
+
+    # -- queries --------------------------------------------------------------
+    def _visible(self, as_of: datetime, since: Optional[datetime]) -> np.ndarray:
+        published = self._published.view
+        mask = (self._first_seen.view <= _epoch(as_of)) & (published <= _epoch(as_of))
+        if since is not None:
+            mask &= published >= _epoch(since)
+        return mask
+
+    def _candidates(self, q: np.ndarray, mask: np.ndarray, want: int) -> np.ndarray:
+        order = np.argsort(-(self._centroids @ q))
+        probes = min(self.n_probe, len(order))
+        while True:
+            rows = np.concatenate([self._lists[c].view for c in order[:probes]])
+            rows = rows[mask[rows]]
+            if rows.size >= want or probes == len(order):
+                return rows
+            probes = min(probes * 2, len(order))
+
+    def search(
+        self, q: np.ndarray, *, as_of: datetime, since: Optional[datetime] = None, k: int = 50, exact: bool = False
+    ) -> List[Tuple[str, float]]:
+        """Top-``k`` (chunk_id, cosine similarity) visible at ``as_of`` (and published since ``since``).
+
+        ``exact`` scores every visible row; it is what recall is measured against.
+        """
+        q = np.asarray(q, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(q))
+        with self._lock:
+            if not len(self) or q.size != self.dim or not norm:
+                return []
+            q = q / norm
+            mask = self._visible(as_of, since)
+            visible = int(mask.sum())
+            if not visible:
+                return []
+            if visible == len(self):
+                # nothing filtered out: score the matrix in place instead of gathering a copy
+                rows = None if exact or not self.trained else self._candidates(q, mask, k * self.oversample)
+            elif exact or not self.trained or visible <= self.exact_below:
+                rows = np.flatnonzero(mask)
+            else:
+                rows = self._candidates(q, mask, k * self.oversample)
+            if rows is None:
+                scores = self._vectors.view @ q
+                rows = np.arange(len(scores))
+            else:
+                scores = self._vectors.view[rows] @ q
+            if rows.size > k:
+                top = np.argpartition(-scores, k - 1)[:k]
+                rows, scores = rows[top], scores[top]
+            order = np.argsort(-scores, kind="stable")
+            return [(self.chunk_ids[r], float(s)) for r, s in zip(rows[order], scores[order])]
+
+
+def recall_at_k(
+    index: IVFIndex, queries: Sequence[np.ndarray], *, as_of: datetime, since: Optional[datetime] = None, k: int = 10
+) -> float:
+    """Mean fraction of the exact top-``k`` that the approximate search returns."""
+    found = wanted = 0
+    for q in queries:
+        truth = {c for c, _ in index.search(q, as_of=as_of, since=since, k=k, exact=True)}
+        found += len(truth & {c for c, _ in index.search(q, as_of=as_of, since=since, k=k)})
+        wanted += len(truth)
+    return found / wanted if wanted else 1.0
+
+
+def sync_from_db(index: IVFIndex, db: Session, batch_size: int = 5000) -> int:
+    """Stream every stored embedding into ``index`` in batches, then train it."""
+    stmt = (
+        select(m.NewsEmbedding.chunk_id, m.NewsEmbedding.embedding, m.News.published_at, m.News.first_seen_at)
+        .join(m.NewsChunk, m.NewsEmbedding.chunk_id == m.NewsChunk.id)
+        .join(m.News, m.NewsChunk.news_id == m.News.id)
+        .where(m.NewsEmbedding.embedding.isnot(None))
+        .execution_options(yield_per=batch_size)
+    )
+    added = 0
+    for part in db.execute(stmt).partitions():
+        added += index.add_many((tuple(row) for row in part), train=False)
+    if len(index) >= index.exact_below:
+        index.train()
+    return added
+
+
+_index = IVFIndex(
+    n_lists=settings.ANN_LISTS,
+    n_probe=settings.ANN_PROBES,
+    oversample=settings.ANN_OVERSAMPLE,
+    exact_below=settings.ANN_EXACT_BELOW,
+)
+
+
+def get_ann_index() -> IVFIndex:
+    return _index
+
+
+def load_ann_index() -> IVFIndex:
+    """Fill the index from a bulk export of news_embeddings; used at startup."""
+    from app.db.session import SessionLocal
+
+    index = _index
+    with SessionLocal() as db:
+        added = sync_from_db(index, db)
+    logger.info("[ANN] %d vectors indexed (%d new, %d lists)", len(index), added, len(index._lists))
+    return index
+
+
+def index_vectors(entries: Sequence[VectorEntry]) -> int:
+    """Add freshly committed embeddings to this process's index.
+
+    The index lives in memory only: a running server does not see embeddings
+    ingested by another process (the ingest CLIs) until it restarts or calls
+    ``load_ann_index`` again, which picks up the rows it is missing.
+    """
+    return _index.add_many(entries)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.rag.chunk import count_tokens
+from app.rag.embed import EmbeddingBackend, get_embedder
+
+# (key, vector) pairs handed to the write-back callback
+Encoded = List[Tuple[Any, np.ndarray]]
+
+
+class EmbeddingBatcher:
+    """Collects chunk texts across articles and encodes them in large batches.
+
+    Texts wait until ``pending_tokens`` accumulate (or :meth:`flush` is
+    called), then go to the embedder in calls of at most ``batch_size`` texts
+    and ``batch_tokens`` tokens. For the local model, pending texts are sorted
+    by length first so each batch pads to similar lengths. Every flush hands
+    all of its (key, vector) pairs to ``on_flush`` at once, so the caller can
+    write them back in one bulk statement.
+    """
+
+    def __init__(
+        self,
+        on_flush: Callable[[Encoded], None],
+        embedder: Optional[EmbeddingBackend] = None,
+        batch_size: Optional[int] = None,
+        batch_tokens: int = settings.EMBEDDING_BATCH_TOKENS,
+        pending_tokens: int = settings.EMBEDDING_PENDING_TOKENS,
+    ) -> None:
+        self.on_flush = on_flush
+        self.embedder = embedder or get_embedder()
+        # None: per backend, EMBEDDING_BATCH_SIZE locally or EMBEDDING_OPENAI_BATCH_SIZE
+        self.batch_size = batch_size
+        self.batch_tokens = batch_tokens
+        self.pending_tokens = pending_tokens
+        self._pending: List[Tuple[Any, str, int]] = []
+        self._tokens = 0
+        self.calls = 0
+        self.encoded = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, key: Any, text: str) -> None:
+        tokens = count_tokens(text)
+        self._pending.append((key, text, tokens))
+        self._tokens += tokens
+        if self._tokens >= self.pending_tokens:
+            self.flush()
+
+    def add_many(self, items: Sequence[Tuple[Any, str]]) -> None:
+        for key, text in items:
+            self.add(key, text)
+
+    def _batches(self, items: List[Tuple[Any, str, int]], batch_size: int) -> List[List[Tuple[Any, str, int]]]:
+        batches: List[List[Tuple[Any, str, int]]] = []
+        current: List[Tuple[Any, str, int]] = []
+        tokens = 0
+        for item in items:
+            if current and (len(current) >= batch_size or tokens + item[2] > self.batch_tokens):
+                batches.append(current)
+                current, tokens = [], 0
+            current.append(item)
+            tokens += item[2]
+        if current:
+            batches.append(current)
+        return batches
+
+    def flush(self) -> int:
+        """Encode everything pending and pass it to ``on_flush``; returns how many texts."""
+        if not self._pending:
+            return 0
+        items, self._pending, self._tokens = self._pending, [], 0
+        backend = self.embedder.active_backend
+        if backend == "local":
+            items.sort(key=lambda item: item[2])
+        batch_size = self.batch_size or (
+            settings.EMBEDDING_BATCH_SIZE if backend == "local" else settings.EMBEDDING_OPENAI_BATCH_SIZE
+        )
+        encoded: Encoded = []
+        for batch in self._batches(items, max(1, batch_size)):
+            vectors = self.embedder.embed_chunks([text for _, text, _ in batch])
+            encoded.extend(zip((key for key, _, _ in batch), vectors))
+            self.calls += 1
+        self.encoded += len(encoded)
+        self.on_flush(encoded)
+        return len(encoded)
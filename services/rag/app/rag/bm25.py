@@ -0,0 +1,366 @@
+from __future__ import annotations
+
+import logging
+import math
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import models as m
+
+logger = logging.getLogger(__name__)
+
+# Same tokens TfidfVectorizer used: lowercase runs of 2+ word characters
+# (a run of CJK characters is one token).
+TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+
+# (chunk_id, news_id, content, published_at, first_seen_at)
+Entry = Tuple[str, str, str, Optional[datetime], Optional[datetime]]
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall((text or "").lower())
+
+
+def _epoch(dt: Optional[datetime]) -> float:
+    if dt is None:
+        return math.nan  # NULL never passes a time filter, as in SQL
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class _Growable:
+    """Numpy array with amortized O(1) appends along the first axis.
+
+    ``row_shape`` is the shape of one element (``()`` for a 1-D array,
+    ``(dim,)`` for a matrix of vectors).
+    """
+
+    def __init__(self, dtype, data: Optional[np.ndarray] = None, row_shape: Tuple[int, ...] = ()) -> None:
+        data = np.empty((0, *row_shape), dtype=dtype) if data is None else np.asarray(data, dtype=dtype)
+        self._n = len(data)
+        self._data = data if self._n else np.empty((16, *data.shape[1:]), dtype=dtype)
+
+    def _reserve(self, n: int) -> None:
+        if n > len(self._data):
+            grown = np.empty((max(n, len(self._data) * 2), *self._data.shape[1:]), dtype=self._data.dtype)
+            grown[: self._n] = self._data[: self._n]
+            self._data = grown
+
+    def append(self, value) -> None:
+        self._reserve(self._n + 1)
+        self._data[self._n] = value
+        self._n += 1
+
+    def extend(self, values: np.ndarray) -> None:
+        self._reserve(self._n + len(values))
+        self._data[self._n : self._n + len(values)] = values
+        self._n += len(values)
+
+    @property
+    def view(self) -> np.ndarray:
+        return self._data[: self._n]
+
+
+class BM25Index:
+    """Incremental BM25 inverted index over news chunks.
+
+    Each term keeps a postings list of (row, term frequency) in numpy
+    arrays; rows also carry the chunk length and the news timestamps, so a
+    query with ``since``/``as_of`` touches only the postings of its own terms
+    and never refits anything. Chunks are immutable once ingested, so the
+    index only ever appends.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self.chunk_ids: List[str] = []
+        self.news_ids: List[str] = []
+        self._row_by_chunk: Dict[str, int] = {}
+        self._length = _Growable(np.float32)
+        self._published = _Growable(np.float64)
+        self._first_seen = _Growable(np.float64)
+        self._postings: Dict[str, Tuple[_Growable, _Growable]] = {}
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self.chunk_ids)
+
+    def __contains__(self, chunk_id: str) -> bool:
+        return str(chunk_id) in self._row_by_chunk
+
+    # -- updates --------------------------------------------------------------
+    def add(
+        self,
+        chunk_id: str,
+        news_id: str,
+        text: str,
+        published_at: Optional[datetime],
+        first_seen_at: Optional[datetime],
+    ) -> bool:
+        """Index one chunk; False if it is already indexed."""
+        chunk_id = str(chunk_id)
+        counts: Dict[str, int] = {}
+        for token in tokenize(text):
+            counts[token] = counts.get(token, 0) + 1
+        with self._lock:
+            if chunk_id in self._row_by_chunk:
+                return False
+            row = len(self.chunk_ids)
+            self.chunk_ids.append(chunk_id)
+            self.news_ids.append(str(news_id))
+            self._row_by_chunk[chunk_id] = row
+            length = sum(counts.values())
+            self._length.append(length)
+            self._total_length += length
+            self._published.append(_epoch(published_at))
+            self._first_seen.append(_epoch(first_seen_at))
+            for term, tf in counts.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = (_Growable(np.int32), _Growable(np.float32))
+                postings[0].append(row)
+                postings[1].append(tf)
+        return True
+
+    def add_many(self, entries: Iterable[Entry]) -> int:
+        return sum(self.add(*entry) for entry in entries)
+
+    # -- queries --------------------------------------------------------------
+    def _accumulate(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(sorted rows, BM25 scores) for every row containing a query term."""
+        n = len(self.chunk_ids)
+        if not n:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64)
+        avgdl = self._total_length / n or 1.0
+        lengths = self._length.view
+        rows_parts, score_parts = [], []
+        for term in dict.fromkeys(tokenize(query)):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            rows, tfs = postings[0].view, postings[1].view
+            df = rows.size
+            idf = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1.0 - self.b + self.b * lengths[rows] / avgdl)
+            rows_parts.append(rows)
+            score_parts.append(idf * tfs * (self.k1 + 1.0) / (tfs + norm))
+        if not rows_parts:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64)
+        rows, inverse = np.unique(np.concatenate(rows_parts), return_inverse=True)
+        return rows, np.bincount(inverse, weights=np.concatenate(score_parts))
+
+    def search(
+        self, query: str, *, as_of: datetime, since: Optional[datetime] = None, k: int = 50
+    ) -> List[Tuple[str, float]]:
+        """Top-``k`` (chunk_id, score) visible at ``as_of`` (and published since ``since``)."""
+        with self._lock:
+            rows, scores = self._accumulate(query)
+            if not rows.size:
+                return []
+            published = self._published.view[rows]
+            visible = (self._first_seen.view[rows] <= _epoch(as_of)) & (published <= _epoch(as_of))
+            if since is not None:
+                visible &= published >= _epoch(since)
+            rows, scores = rows[visible], scores[visible]
+            if rows.size > k:
+                top = np.argpartition(-scores, k - 1)[:k]
+                rows, scores = rows[top], scores[top]
+            order = np.argsort(-scores, kind="stable")
+            return [(self.chunk_ids[r], float(s)) for r, s in zip(rows[order], scores[order])]
+
+    def _score_text(self, terms: Sequence[str], text: str) -> float:
+        """BM25 score of an unindexed text against the index's df and avgdl."""
+        counts: Dict[str, int] = {}
+        for token in tokenize(text):
+            counts[token] = counts.get(token, 0) + 1
+        n = len(self.chunk_ids)
+        avgdl = self._total_length / n if n else 0.0
+        norm = self.k1 * (1.0 - self.b + self.b * sum(counts.values()) / (avgdl or 1.0))
+        score = 0.0
+        for term in terms:
+            tf = counts.get(term)
+            if not tf:
+                continue
+            postings = self._postings.get(term)
+            df = postings[0].view.size if postings is not None else 0
+            idf = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+            score += idf * tf * (self.k1 + 1.0) / (tf + norm)
+        return score
+
+    def score_chunks(
+        self, query: str, chunk_ids: Sequence[str], texts: Optional[Sequence[str]] = None
+    ) -> np.ndarray:
+        """BM25 score of ``query`` for each given chunk.
+
+        Chunks the index does not have yet (ingested by another process) are
+        scored from ``texts`` against the index's statistics, or 0 without.
+        """
+        out = np.zeros(len(chunk_ids), dtype=np.float64)
+        with self._lock:
+            wanted = np.array([self._row_by_chunk.get(str(c), -1) for c in chunk_ids], dtype=np.int64)
+            rows, scores = self._accumulate(query)
+            if rows.size:
+                pos = np.clip(np.searchsorted(rows, wanted), 0, rows.size - 1)
+                hit = (wanted >= 0) & (rows[pos] == wanted)
+                out[hit] = scores[pos[hit]]
+            if texts is not None:
+                terms = list(dict.fromkeys(tokenize(query)))
+                for i in np.flatnonzero(wanted < 0):
+                    out[i] = self._score_text(terms, texts[i])
+        return out
+
+    # -- persistence ----------------------------------------------------------
+    def save(self, path: Path) -> None:
+        """Write a snapshot atomically (tmp file + rename)."""
+        path = Path(path)
+        with self._lock:
+            terms = list(self._postings)
+            sizes = np.fromiter((self._postings[t][0].view.size for t in terms), dtype=np.int64, count=len(terms))
+            offsets = np.concatenate([[0], np.cumsum(sizes)])
+            empty_rows, empty_tfs = np.empty(0, np.int32), np.empty(0, np.float32)
+            arrays = {
+                "params": np.array([self.k1, self.b]),
+                "chunk_ids": np.array(self.chunk_ids, dtype=str),
+                "news_ids": np.array(self.news_ids, dtype=str),
+                "length": self._length.view,
+                "published": self._published.view,
+                "first_seen": self._first_seen.view,
+                "terms": np.array(terms, dtype=str),
+                "offsets": offsets,
+                "post_rows": np.concatenate([self._postings[t][0].view for t in terms]) if terms else empty_rows,
+                "post_tfs": np.concatenate([self._postings[t][1].view for t in terms]) if terms else empty_tfs,
+            }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as fh:
+            np.savez(fh, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "BM25Index":
+        with np.load(Path(path), allow_pickle=False) as data:
+            k1, b = (float(x) for x in data["params"])
+            index = cls(k1=k1, b=b)
+            index.chunk_ids = data["chunk_ids"].tolist()
+            index.news_ids = data["news_ids"].tolist()
+            index._row_by_chunk = {c: i for i, c in enumerate(index.chunk_ids)}
+            index._length = _Growable(np.float32, data["length"])
+            index._published = _Growable(np.float64, data["published"])
+            index._first_seen = _Growable(np.float64, data["first_seen"])
+            index._total_length = float(data["length"].sum())
+            offsets, rows, tfs = data["offsets"], data["post_rows"], data["post_tfs"]
+            for i, term in enumerate(data["terms"].tolist()):
+                lo, hi = offsets[i], offsets[i + 1]
+                index._postings[term] = (_Growable(np.int32, rows[lo:hi].copy()), _Growable(np.float32, tfs[lo:hi].copy()))
+        return index
+
+
+def sync_from_db(index: BM25Index, db: Session, batch_size: int = 1000) -> int:
+    """Index every chunk in the database that the index does not have yet."""
+    missing = [cid for cid in db.execute(select(m.NewsChunk.id)).scalars() if str(cid) not in index]
+    added = 0
+    for i in range(0, len(missing), batch_size):
+        stmt = (
+            select(m.NewsChunk.id, m.NewsChunk.news_id, m.NewsChunk.content, m.News.published_at, m.News.first_seen_at)
+            .join(m.News, m.NewsChunk.news_id == m.News.id)
+            .where(m.NewsChunk.id.in_(missing[i : i + batch_size]))
+        )
+        added += index.add_many(tuple(row) for row in db.execute(stmt))
+    return added
+
+
+_index = BM25Index(k1=settings.BM25_K1, b=settings.BM25_B)
+# set once _index holds the snapshot plus the database; only then may it be saved
+_loaded = False
+_load_lock = threading.RLock()
+# monotonic time of the last catch-up check against the database
+_synced_at = -math.inf
+
+
+def get_bm25_index() -> BM25Index:
+    return _index
+
+
+def load_bm25_index() -> BM25Index:
+    """Load the snapshot (if any), catch up with the database and save.
+
+    Used at startup; calling it again picks up chunks other processes
+    ingested since.
+    """
+    global _index, _loaded
+    from app.db.session import SessionLocal
+
+    with _load_lock:
+        path = Path(settings.BM25_INDEX_PATH) if settings.BM25_INDEX_PATH else None
+        index = _index
+        if path is not None and path.exists() and not len(index):
+            try:
+                index = BM25Index.load(path)
+            except Exception as exc:
+                logger.warning("[BM25] snapshot %s unreadable, rebuilding: %s", path, exc)
+        with SessionLocal() as db:
+            added = sync_from_db(index, db)
+        _index = index
+        _loaded = True
+        if path is not None and added:
+            index.save(path)
+    logger.info("[BM25] %d chunks indexed (%d new)", len(index), added)
+    return index
+
+
+def _count_chunks() -> int:
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        return db.execute(select(func.count(m.NewsChunk.id))).scalar_one()
+
+
+def catch_up_bm25_index() -> BM25Index:
+    """Index chunks other processes ingested, at most once per ``BM25_SYNC_INTERVAL_SECONDS``.
+
+    A count query decides whether the database is ahead of the index; only
+    then does the full catch-up (``load_bm25_index``) run.
+    """
+    global _synced_at
+    now = time.monotonic()
+    if now - _synced_at < settings.BM25_SYNC_INTERVAL_SECONDS:
+        return _index
+    with _load_lock:
+        if now - _synced_at < settings.BM25_SYNC_INTERVAL_SECONDS:
+            return _index
+        _synced_at = now
+        if _count_chunks() != len(_index):
+            return load_bm25_index()
+    return _index
+
+
+def index_chunks(entries: Sequence[Entry]) -> int:
+    """Add freshly committed chunks to this process's index and persist the snapshot when configured.
+
+    A process that never loaded the index (the ingest CLIs) loads the
+    snapshot and the database first, so the save never replaces the snapshot
+    with only this run's chunks. A running server picks up chunks ingested
+    by another process through ``catch_up_bm25_index``.
+    """
+    if not _loaded and settings.BM25_INDEX_PATH:
+        with _load_lock:
+            if not _loaded:
+                load_bm25_index()
+    index = _index
+    added = index.add_many(entries)
+    if added and settings.BM25_INDEX_PATH:
+        index.save(Path(settings.BM25_INDEX_PATH))
+    return added
@@ -1,8 +1,12 @@
 from __future__ import annotations
-from typing import List
+from typing import List, Optional, Tuple
 import os
+import threading
 import numpy as np
 from app.core.config import settings
+from app.rag.query_cache import normalize_query, query_cache
+
+OPENAI_EMBEDDING_MODEL = "text-embedding-3-small"
 
 
 class EmbeddingBackend:
@@ -10,8 +14,19 @@ class EmbeddingBackend:
         self.backend = (settings.EMBEDDING_BACKEND or "auto").lower()
         self.local_model_name = settings.EMBEDDING_MODEL_LOCAL
         self._local_model = None
+        self._openai = None
+        self._load_lock = threading.Lock()
+        # True once an encode has succeeded (warm_up() or a lazy first call)
+        self.ready = False
 
     def _ensure_local(self):
+        if self._local_model is not None:
+            return
+        # concurrent first callers must not each load the model
+        with self._load_lock:
+            self._load_local()
+
+    def _load_local(self):
         if self._local_model is None:
             try:
                 from sentence_transformers import SentenceTransformer  # type: ignore
@@ -41,24 +56,37 @@ class EmbeddingBackend:
         key = settings.OPENAI_API_KEY or os.getenv("OPENAI_API_KEY")
         return bool(key)
 
-    def embed_chunks(self, chunk_texts: List[str]):
-        if not chunk_texts:
-            return np.zeros((0, 384), dtype=float)
+    def _openai_client(self):
+        # one client (and its connection pool) for the whole process
+        if self._openai is None:
+            with self._load_lock:
+                if self._openai is None:
+                    from openai import OpenAI  # type: ignore
 
-        backend = self.backend
-        if backend == "auto":
-            backend = "openai" if self._openai_available() else "local"
+                    self._openai = OpenAI(api_key=settings.OPENAI_API_KEY or os.getenv("OPENAI_API_KEY"))
+        return self._openai
 
-        if backend == "openai" and self._openai_available():
-            try:
-                from openai import OpenAI  # type: ignore
+    def _resolve_backend(self) -> str:
+        """Backend a call would use: openai only when configured and a key is present."""
+        if self.backend in ("auto", "openai") and self._openai_available():
+            return "openai"
+        return "local"
+
+    @property
+    def active_backend(self) -> str:
+        return self._resolve_backend()
 
-                client = OpenAI(api_key=settings.OPENAI_API_KEY or os.getenv("OPENAI_API_KEY"))
-                model = "text-embedding-3-small"
-                resp = client.embeddings.create(input=chunk_texts, model=model)
+    def _model_for(self, backend: str) -> str:
+        return OPENAI_EMBEDDING_MODEL if backend == "openai" else self.local_model_name
+
+    def _encode(self, chunk_texts: List[str]) -> Tuple[str, np.ndarray]:
+        """(backend actually used, vectors); openai failures fall back to local."""
+        if self._resolve_backend() == "openai":
+            try:
+                resp = self._openai_client().embeddings.create(input=chunk_texts, model=OPENAI_EMBEDDING_MODEL)
                 data = [d.embedding for d in resp.data]
-                arr = np.array(data, dtype=float)
-                return arr
+                self.ready = True
+                return "openai", np.array(data, dtype=float)
             except Exception:
                 # fallback to local
                 pass
@@ -66,6 +94,41 @@ class EmbeddingBackend:
         # local backend
         self._ensure_local()
         vecs = self._local_model.encode(chunk_texts, normalize_embeddings=True)
-        return np.array(vecs, dtype=float)
+        self.ready = True
+        return "local", np.array(vecs, dtype=float)
+
+    def embed_chunks(self, chunk_texts: List[str]):
+        if not chunk_texts:
+            return np.zeros((0, 384), dtype=float)
+        return self._encode(chunk_texts)[1]
+
+    def embed_query(self, text: str) -> np.ndarray:
+        """float32 embedding of one query string, served from the query cache when warm."""
+        text = normalize_query(text)
+        backend = self._resolve_backend()
+        cached = query_cache.get((backend, self._model_for(backend), text))
+        if cached is not None:
+            return cached
+        # cache under the backend that actually answered (openai may fall back to local)
+        used, vecs = self._encode([text])
+        if vecs.shape[0] == 0:
+            return np.zeros(0, dtype=np.float32)
+        return query_cache.put((used, self._model_for(used), text), vecs[0])
+
+    def warm_up(self) -> None:
+        """Load the model and run one dummy encode so the first query does not pay for it."""
+        self.embed_chunks(["warm up"])
+
+
+_embedder: Optional[EmbeddingBackend] = None
+_embedder_lock = threading.Lock()
 
 
+def get_embedder() -> EmbeddingBackend:
+    """Process-wide embedding backend shared by search and ingestion."""
+    global _embedder
+    if _embedder is None:
+        with _embedder_lock:
+            if _embedder is None:
+                _embedder = EmbeddingBackend()
+    return _embedder
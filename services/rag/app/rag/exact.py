@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Any, List, Sequence, Tuple
+
+import numpy as np
+
+
+class StreamingTopK:
+    """Exact top-``k`` cosine similarity over vectors that arrive in batches.
+
+    Each batch is copied into one preallocated float32 matrix, scored with a
+    single matmul against the normalized query and merged into the running
+    top-``k`` with ``argpartition``; nothing else is kept, so memory stays at
+    one batch plus ``k`` scores however many rows are streamed through.
+    """
+
+    def __init__(self, q: np.ndarray, k: int, batch_size: int) -> None:
+        q = np.asarray(q, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(q))
+        self.q = q / norm if norm else q
+        self.k = k
+        self._buf = np.empty((batch_size, q.size), dtype=np.float32)
+        self._ids: List[Any] = []
+        self._scores = np.empty(0, dtype=np.float32)
+
+    def add_batch(self, ids: Sequence[Any], vectors: Sequence[Any]) -> None:
+        n = 0
+        for v in vectors:
+            if n == len(self._buf):
+                raise ValueError("batch larger than batch_size")
+            self._buf[n] = v
+            n += 1
+        if not n:
+            return
+        block = self._buf[:n]
+        norms = np.linalg.norm(block, axis=1)
+        scores = np.divide(block @ self.q, norms, out=np.zeros(n, dtype=np.float32), where=norms > 0)
+        merged_ids = self._ids + list(ids)
+        merged = np.concatenate([self._scores, scores])
+        if merged.size > self.k:
+            top = np.argpartition(-merged, self.k - 1)[: self.k]
+            self._ids, self._scores = [merged_ids[i] for i in top], merged[top]
+        else:
+            self._ids, self._scores = merged_ids, merged
+
+    def result(self) -> List[Tuple[Any, float]]:
+        order = np.argsort(-self._scores, kind="stable")
+        return [(self._ids[i], float(self._scores[i])) for i in order]
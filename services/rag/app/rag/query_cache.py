@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str, str]
+
+
+def normalize_query(text: str) -> str:
+    """Collapse whitespace so equivalent query strings share one entry."""
+    return " ".join((text or "").split())
+
+
+class QueryEmbeddingCache:
+    """Bounded LRU of query embeddings keyed by (backend, model, normalized text).
+
+    Vectors are stored as float32. With ``redis_url`` set, misses fall back
+    to Redis and new vectors are written there as well, so restarts and
+    replicas share warm entries; Redis problems only disable that tier.
+    """
+
+    def __init__(self, max_entries: int = 4096, redis_url: str = "", ttl_seconds: int = 7 * 86400) -> None:
+        self.max_entries = max(1, max_entries)
+        self.redis_url = redis_url
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[CacheKey, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis: Any = None
+        self._redis_disabled = not redis_url
+        self.hits = 0
+        self.misses = 0
+        self.redis_hits = 0
+        self.redis_errors = 0
+
+    def get(self, key: CacheKey) -> Optional[np.ndarray]:
+        with self._lock:
+            vec = self._entries.get(key)
+            if vec is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return vec
+        vec = self._lookup_redis(key)
+        with self._lock:
+            if vec is None:
+                self.misses += 1
+                return None
+            self.redis_hits += 1
+            self._insert(key, vec)
+        return vec
+
+    def put(self, key: CacheKey, vec: np.ndarray) -> np.ndarray:
+        vec = np.ascontiguousarray(vec, dtype=np.float32)
+        vec.flags.writeable = False  # shared between callers
+        with self._lock:
+            self._insert(key, vec)
+        self._store_redis(key, vec)
+        return vec
+
+    def _insert(self, key: CacheKey, vec: np.ndarray) -> None:
+        self._entries[key] = vec
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "redis_enabled": not self._redis_disabled,
+            "redis_hits": self.redis_hits,
+            "redis_errors": self.redis_errors,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.redis_hits = self.redis_errors = 0
+
+    # -- redis tier ---------------------------------------------------------
+    @staticmethod
+    def _redis_key(key: CacheKey) -> str:
+        backend, model, text = key
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        return f"rag:qemb:{backend}:{model}:{digest}"
+
+    def _client(self) -> Any:
+        if self._redis_disabled:
+            return None
+        if self._redis is None:
+            try:
+                import redis  # type: ignore
+
+                self._redis = redis.Redis.from_url(self.redis_url)
+            except Exception as exc:
+                logger.warning("query embedding cache redis tier disabled: %s", exc)
+                self._redis_disabled = True
+                return None
+        return self._redis
+
+    def _lookup_redis(self, key: CacheKey) -> Optional[np.ndarray]:
+        client = self._client()
+        if client is None:
+            return None
+        try:
+            raw = client.get(self._redis_key(key))
+        except Exception:
+            self.redis_errors += 1
+            return None
+        if not raw:
+            return None
+        vec = np.frombuffer(raw, dtype="<f4")
+        vec.flags.writeable = False
+        return vec
+
+    def _store_redis(self, key: CacheKey, vec: np.ndarray) -> None:
+        client = self._client()
+        if client is None:
+            return
+        try:
+            client.set(self._redis_key(key), vec.astype("<f4").tobytes(), ex=self.ttl_seconds)
+        except Exception:
+            self.redis_errors += 1
+
+
+query_cache = QueryEmbeddingCache(
+    max_entries=settings.QUERY_EMBEDDING_CACHE_SIZE,
+    redis_url=settings.REDIS_URL,
+    ttl_seconds=settings.QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+)
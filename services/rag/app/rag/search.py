@@ -1,16 +1,92 @@
 from __future__ import annotations
-from typing import List, Optional
+import asyncio
+import functools
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, TypeVar
 from datetime import datetime
 import numpy as np
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import and_, bindparam, or_, select
 from sqlalchemy import text as sql_text
-from sqlalchemy.orm import Session
-from sklearn.feature_extraction.text import TfidfVectorizer
-from app.db.session import SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import AsyncSessionLocal
 from app.db import models as m
 from app.domain.schemas import SearchNewsItem, SearchNewsResponse
-from app.rag.embed import EmbeddingBackend
+from app.rag.ann import get_ann_index
+from app.rag.bm25 import catch_up_bm25_index, get_bm25_index
+from app.rag.embed import get_embedder
+from app.rag.exact import StreamingTopK
 from app.rag.mapping import aliases_for_ticker
 from app.core.config import settings
+from app.core.deadline import Deadline
+
+T = TypeVar("T")
+
+# candidates ranked by vector similarity before the hybrid rerank
+_VECTOR_CANDIDATES = 50
+
+# CPU-bound work (query encoding, exact cosine batches, rerank) runs here so the
+# event loop keeps serving other searches meanwhile.
+_cpu_pool = ThreadPoolExecutor(max_workers=settings.SEARCH_CPU_WORKERS, thread_name_prefix="rag-search")
+
+
+def _expired(deadline: Optional[Deadline]) -> bool:
+    return deadline is not None and deadline.expired()
+
+
+async def _offload(fn: Callable[..., T], *args: Any) -> T:
+    return await asyncio.get_running_loop().run_in_executor(_cpu_pool, functools.partial(fn, *args))
+
+
+async def _begin(db: AsyncSession, deadline: Optional[Deadline]) -> None:
+    """Start the transaction, capping its statements by the caller's remaining budget."""
+    if deadline is not None and deadline.bounded:
+        ms = int(max(1.0, min(settings.DB_STATEMENT_TIMEOUT_MS, deadline.remaining() * 1000.0)))
+        # SET takes no bind parameters; ms is an int we computed
+        await db.execute(sql_text(f"SET LOCAL statement_timeout = {ms}"))
+
+
+def _item(r: Dict[str, Any], score: float) -> SearchNewsItem:
+    return SearchNewsItem(
+        doc_id=f"news:{r['news_id']}",
+        title=r.get("title") or "",
+        url=r.get("url"),
+        published_at=r.get("published_at"),
+        snippet=(r.get("content") or "")[:240],
+        score=float(score),
+        ticker=r.get("ticker"),
+    )
+
+
+def _rerank_scores(qtext: str, rows: List[Dict[str, Any]], partial: bool) -> np.ndarray:
+    """BM25 scores for a rerank; zeros (keep the incoming order) when out of budget."""
+    if partial:
+        return np.zeros(len(rows), dtype=float)
+    try:
+        return _lexical_scores(qtext, rows)
+    except Exception:
+        return np.zeros(len(rows), dtype=float)
+
+
+def _rank_metadata(qtext: str, meta_rows: List[Dict[str, Any]], top_k: int, partial: bool) -> List[SearchNewsItem]:
+    # optional rerank by BM25 on meta candidates; out of budget keeps recency order
+    scores = _rerank_scores(qtext, meta_rows, partial)
+    ranked = sorted(zip(meta_rows, scores), key=lambda x: float(x[1]), reverse=True)[:top_k]
+    return [_item(r, s) for r, s in ranked]
+
+
+def _rank_hybrid(qtext: str, rows: List[Dict[str, Any]], top_k: int, partial: bool) -> List[SearchNewsItem]:
+    # Hybrid rerank with BM25 over candidates; out of budget keeps vector order
+    bm25_scores = _rerank_scores(qtext, rows, partial)
+
+    # Blend scores: alpha * vector + (1-alpha) * bm25
+    alpha = 0.7
+    vec_scores = np.array([r.get("score", 0.0) for r in rows])
+    scores = alpha * vec_scores + (1 - alpha) * bm25_scores
+
+    ranked = sorted(zip(rows, scores), key=lambda x: float(x[1]), reverse=True)[:top_k]
+    return [_item(r, s) for r, s in ranked]
 
 
 async def search_news(
@@ -20,226 +96,225 @@ async def search_news(
     since: Optional[datetime] = None,
     as_of: datetime,
     top_k: int,
+    deadline: Optional[Deadline] = None,
 ):
+    """Hybrid news search.
+
+    ``deadline`` is checked between stages; once it has passed, remaining
+    stages (rerank, further fallbacks) are skipped and whatever is ranked so
+    far is returned with ``partial=True``. It also caps the statement
+    timeout of the queries issued for this search.
+    """
     # Build textual query
     aliases = aliases_for_ticker(ticker)
     qtext = " ".join(aliases + ([query] if query else [])) or (ticker or "")
 
     # 0) Metadata-first cheap candidates to guarantee non-empty results
-    with SessionLocal() as db:
-        meta_rows = _metadata_fallback(db, ticker=ticker, qtext=qtext, since=since, as_of=as_of)
-        if meta_rows:
-            # optional rerank by TF-IDF on meta candidates
-            texts = [r.get("content") or "" for r in meta_rows]
-            try:
-                tfidf = TfidfVectorizer(max_features=20000)
-                X = tfidf.fit_transform(texts)
-                qX = tfidf.transform([qtext])
-                scores = (X @ qX.T).toarray().ravel()
-            except Exception:
-                scores = np.zeros(len(texts), dtype=float)
-            ranked = sorted(
-                zip(meta_rows, scores), key=lambda x: float(x[1]), reverse=True
-            )[: top_k]
-            results: List[SearchNewsItem] = []
-            for r, s in ranked:
-                snippet = (r.get("content") or "")[:240]
-                results.append(
-                    SearchNewsItem(
-                        doc_id=f"news:{r['news_id']}",
-                        title=r.get("title") or "",
-                        url=r.get("url"),
-                        published_at=r.get("published_at"),
-                        snippet=snippet,
-                        score=float(s),
-                        ticker=r.get("ticker"),
-                    )
-                )
-            return SearchNewsResponse(as_of=as_of, query=qtext, top_k=top_k, results=results)
+    async with AsyncSessionLocal() as db:
+        await _begin(db, deadline)
+        meta_rows = await _metadata_fallback(db, ticker=ticker, qtext=qtext, since=since, as_of=as_of)
+    if meta_rows:
+        partial = _expired(deadline)
+        results = await _offload(_rank_metadata, qtext, meta_rows, top_k, partial)
+        return SearchNewsResponse(as_of=as_of, query=qtext, top_k=top_k, results=results, partial=partial)
+
+    if _expired(deadline):
+        return SearchNewsResponse(as_of=as_of, query=qtext, top_k=top_k, results=[], partial=True)
 
     # 1) Embed query
-    embedder = EmbeddingBackend()
-    qvec = embedder.embed_chunks([qtext])
-    if qvec.shape[0] == 0:
+    embedder = get_embedder()
+    q = await _offload(embedder.embed_query, qtext)
+    if q.shape[0] == 0:
         return SearchNewsResponse(as_of=as_of, query=qtext, top_k=top_k, results=[])
-    q = qvec[0]
 
     # Candidate retrieval by vector similarity using pgvector cosine
-    # Limit initial candidates to 50
-    with SessionLocal() as db:
-        # Join embeddings -> chunk -> news with time filters
-        params = {"as_of": as_of}
-        time_filter = "news.first_seen_at <= :as_of AND news.published_at <= :as_of"
-        if since is not None:
-            params["since"] = since
-            time_filter += " AND news.published_at >= :since"
-
-        dim = len(q)
-        # Use cosine distance: 1 - cos_sim. Order by increasing distance.
-        sql = f"""
-        SELECT
-            nc.id AS chunk_id,
-            n.id AS news_id,
-            n.title AS title,
-            n.url AS url,
-            n.published_at AS published_at,
-            n.ticker AS ticker,
-            nc.content AS content,
-            1 - (ne.embedding <=> :qvec) AS score
-        FROM news_embeddings ne
-        JOIN news_chunks nc ON ne.chunk_id = nc.id
-        JOIN news n ON nc.news_id = n.id
-        WHERE {time_filter}
-        ORDER BY ne.embedding <=> :qvec
-        LIMIT 50
-        """
+    async with AsyncSessionLocal() as db:
+        await _begin(db, deadline)
         try:
-            rows = db.execute(sql_text(sql), {**params, "qvec": q.tolist()}).mappings().all()
+            rows = await _pgvector_search(db, q, since=since, as_of=as_of)
         except Exception:
             rows = []
+            # a failed statement aborts the transaction; start a fresh one for the fallbacks
+            await db.rollback()
+            await _begin(db, deadline)
+
+        partial = _expired(deadline)
+        if partial and not rows:
+            return SearchNewsResponse(as_of=as_of, query=qtext, top_k=top_k, results=[], partial=True)
 
-        # Fallback to python cosine search if SQL returned no rows or failed
+        # Fallback to the in-process ANN index, then exact streamed cosine
+        # search, if SQL returned no rows or failed
         if not rows:
-            rows = _fallback_vector_search_python(db, q, since=since, as_of=as_of)
+            rows = await _ann_search(db, q, since=since, as_of=as_of)
+        if not rows:
+            rows = await _exact_vector_search(db, q, since=since, as_of=as_of)
             if not rows:
-                # final fallback: TF-IDF only over chunks
-                rows = _tfidf_only_search(db, qtext, since=since, as_of=as_of)
+                # final fallback: BM25 only over chunks
+                rows = await _lexical_search(db, qtext, since=since, as_of=as_of)
                 if not rows:
                     # ultimate fallback: simple metadata query by ticker/aliases or LIKE
-                    rows = _metadata_fallback(db, ticker=ticker, qtext=qtext, since=since, as_of=as_of)
+                    rows = await _metadata_fallback(db, ticker=ticker, qtext=qtext, since=since, as_of=as_of)
                     if not rows:
                         # last resort: return latest news chunks by time only
-                        rows = _latest_news_fallback(db, since=since, as_of=as_of)
+                        rows = await _latest_news_fallback(db, since=since, as_of=as_of)
                         if not rows:
                             return SearchNewsResponse(as_of=as_of, query=qtext, top_k=top_k, results=[])
 
-        # Hybrid rerank with TF-IDF over candidates
-        texts = [r["content"] or "" for r in rows]
-        tfidf = TfidfVectorizer(max_features=20000)
-        try:
-            X = tfidf.fit_transform(texts)
-            qX = tfidf.transform([qtext])
-            import numpy as _np
+    partial = partial or _expired(deadline)
+    results = await _offload(_rank_hybrid, qtext, rows, top_k, partial)
+    return SearchNewsResponse(as_of=as_of, query=qtext, top_k=top_k, results=results, partial=partial)
 
-            bm25_scores = (X @ qX.T).toarray().ravel()
-        except Exception:
-            bm25_scores = np.zeros(len(texts), dtype=float)
 
-        # Blend scores: alpha * vector + (1-alpha) * tfidf
-        alpha = 0.7
-        vec_scores = np.array([r.get("score", 0.0) for r in rows])
-        scores = alpha * vec_scores + (1 - alpha) * bm25_scores
+async def _pgvector_search(db: AsyncSession, q: np.ndarray, *, since, as_of) -> List[Dict[str, Any]]:
+    """Top candidates by pgvector cosine distance.
 
-        ranked = sorted(
-            zip(rows, scores), key=lambda x: float(x[1]), reverse=True
+    Narrow ``since``/``as_of`` windows (at most VECTOR_EXACT_WINDOW_ROWS
+    embedded chunks) are filtered first and ranked exactly; an approximate
+    index scan would drop most of its candidates to the time filter. Wider
+    windows use the HNSW (or ivfflat) index with per-query recall settings.
+    """
+    params: Dict[str, Any] = {"as_of": as_of}
+    time_filter = "n.first_seen_at <= :as_of AND n.published_at <= :as_of"
+    if since is not None:
+        params["since"] = since
+        time_filter += " AND n.published_at >= :since"
+    joins = """
+        FROM news_embeddings ne
+        JOIN news_chunks nc ON ne.chunk_id = nc.id
+        JOIN news n ON nc.news_id = n.id
+    """
+    columns = "nc.id AS chunk_id, n.id AS news_id, n.title AS title, n.url AS url, n.published_at AS published_at, n.ticker AS ticker, nc.content AS content"
+
+    cap = settings.VECTOR_EXACT_WINDOW_ROWS
+    window_rows = (
+        await db.execute(
+            sql_text(f"SELECT count(*) FROM (SELECT 1 {joins} WHERE {time_filter} LIMIT :cap) w"),
+            {**params, "cap": cap + 1},
         )
-        ranked = ranked[: top_k]
-
-        results: List[SearchNewsItem] = []
-        for r, s in ranked:
-            snippet = (r["content"] or "")[:240]
-            results.append(
-                SearchNewsItem(
-                    doc_id=f"news:{r['news_id']}",
-                    title=r["title"] or "",
-                    url=r.get("url"),
-                    published_at=r.get("published_at"),
-                    snippet=snippet,
-                    score=float(s),
-                    ticker=r.get("ticker"),
-                )
-            )
+    ).scalar_one()
+    if window_rows <= cap:
+        # MATERIALIZED keeps the planner from ranking through the vector index
+        sql = f"""
+        WITH candidates AS MATERIALIZED (
+            SELECT {columns}, ne.embedding AS embedding {joins} WHERE {time_filter}
+        )
+        SELECT chunk_id, news_id, title, url, published_at, ticker, content,
+               1 - (embedding <=> :qvec) AS score
+        FROM candidates
+        ORDER BY embedding <=> :qvec
+        LIMIT {_VECTOR_CANDIDATES}
+        """
+    else:
+        await _tune_vector_scan(db)
+        # Use cosine distance: 1 - cos_sim. Order by increasing distance.
+        sql = f"""
+        SELECT {columns}, 1 - (ne.embedding <=> :qvec) AS score
+        {joins}
+        WHERE {time_filter}
+        ORDER BY ne.embedding <=> :qvec
+        LIMIT {_VECTOR_CANDIDATES}
+        """
+    stmt = sql_text(sql).bindparams(bindparam("qvec", type_=Vector()))
+    return [dict(r) for r in (await db.execute(stmt, {**params, "qvec": q})).mappings()]
 
-        return SearchNewsResponse(as_of=as_of, query=qtext, top_k=top_k, results=results)
 
+async def _tune_vector_scan(db: AsyncSession) -> None:
+    # SET takes no bind parameters; the values are ints/identifiers from settings
+    ef_search = max(settings.VECTOR_HNSW_EF_SEARCH, _VECTOR_CANDIDATES)
+    await db.execute(sql_text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+    await db.execute(sql_text(f"SET LOCAL ivfflat.probes = {int(settings.VECTOR_IVFFLAT_PROBES)}"))
+    if settings.VECTOR_HNSW_ITERATIVE_SCAN:
+        await db.execute(sql_text(f"SET LOCAL hnsw.iterative_scan = {settings.VECTOR_HNSW_ITERATIVE_SCAN}"))
 
-def _fallback_vector_search_python(db: Session, q: np.ndarray, *, since, as_of):
-    # Load all candidate chunks by time and compute cosine similarity in Python
-    from sqlalchemy import and_, select
-    import numpy as _np
 
-    stmt = (
-        select(m.NewsChunk, m.News, m.NewsEmbedding)
-        .join(m.News, m.NewsChunk.news_id == m.News.id)
-        .join(m.NewsEmbedding, m.NewsEmbedding.chunk_id == m.NewsChunk.id)
-    )
+def _chunk_row(chunk: m.NewsChunk, news: m.News, score: float = 0.0) -> Dict[str, Any]:
+    return {
+        "chunk_id": str(chunk.id),
+        "news_id": str(news.id),
+        "title": news.title,
+        "url": news.url,
+        "published_at": news.published_at,
+        "ticker": news.ticker,
+        "content": chunk.content,
+        "score": score,
+    }
+
+
+def _time_conds(since, as_of) -> list:
     conds = [m.News.first_seen_at <= as_of, m.News.published_at <= as_of]
     if since is not None:
         conds.append(m.News.published_at >= since)
-    stmt = stmt.where(and_(*conds))
-    rows = db.execute(stmt).all()
-    def cos_sim(a, b):
-        a = _np.array(a)
-        b = _np.array(b)
-        denom = (np.linalg.norm(a) * np.linalg.norm(b))
-        return float(a.dot(b) / denom) if denom else 0.0
-    out = []
-    for chunk, news, emb in rows:
-        out.append(
-            {
-                "chunk_id": str(chunk.id),
-                "news_id": str(news.id),
-                "title": news.title,
-                "url": news.url,
-                "published_at": news.published_at,
-                "ticker": news.ticker,
-                "content": chunk.content,
-                "score": cos_sim(q, emb.embedding),
-            }
-        )
-    # sort descending by score and return top 50
-    out = sorted(out, key=lambda x: float(x["score"]), reverse=True)[:50]
-    return out
+    return conds
 
 
-def _tfidf_only_search(db: Session, qtext: str, *, since, as_of):
-    from sqlalchemy import and_, select
-    # pull chunks with time filters only (no embeddings)
+async def _rows_for_hits(db: AsyncSession, hits) -> List[Dict[str, Any]]:
+    """Chunk rows for ranked (chunk_id, score) hits, in hit order."""
+    ids = [uuid.UUID(chunk_id) for chunk_id, _ in hits]
     stmt = (
         select(m.NewsChunk, m.News)
         .join(m.News, m.NewsChunk.news_id == m.News.id)
+        .where(m.NewsChunk.id.in_(ids))
     )
-    conds = [m.News.first_seen_at <= as_of, m.News.published_at <= as_of]
-    if since is not None:
-        conds.append(m.News.published_at >= since)
-    stmt = stmt.where(and_(*conds))
-    rows = db.execute(stmt).all()
-    if not rows:
+    by_id = {str(chunk.id): (chunk, news) for chunk, news in (await db.execute(stmt)).all()}
+    return [_chunk_row(*by_id[chunk_id], score) for chunk_id, score in hits if chunk_id in by_id]
+
+
+async def _ann_search(db: AsyncSession, q: np.ndarray, *, since, as_of):
+    # approximate top chunks from the in-process IVF index (time filters applied there)
+    index = get_ann_index()
+    if not settings.ANN_INDEX_ENABLED or not len(index):
         return []
-    texts = [(chunk.content or "") for chunk, news in rows]
-    try:
-        tfidf = TfidfVectorizer(max_features=20000)
-        X = tfidf.fit_transform(texts)
-        qX = tfidf.transform([qtext])
-        scores = (X @ qX.T).toarray().ravel()
-    except Exception:
-        scores = np.zeros(len(texts), dtype=float)
-    out = []
-    for (chunk, news), s in zip(rows, scores):
-        out.append(
-            {
-                "chunk_id": str(chunk.id),
-                "news_id": str(news.id),
-                "title": news.title,
-                "url": news.url,
-                "published_at": news.published_at,
-                "ticker": news.ticker,
-                "content": chunk.content,
-                "score": float(s),
-            }
-        )
-    out = sorted(out, key=lambda x: float(x["score"]), reverse=True)[:50]
-    return out
+    hits = await _offload(functools.partial(index.search, q, as_of=as_of, since=since, k=_VECTOR_CANDIDATES))
+    if not hits:
+        return []
+    return await _rows_for_hits(db, hits)
+
+
+async def _exact_vector_search(db: AsyncSession, q: np.ndarray, *, since, as_of):
+    # Exact cosine search: stream only (chunk_id, embedding) in batches through
+    # a running top-50, then load title/content for the winners alone
+    batch_size = settings.EXACT_SEARCH_BATCH_SIZE
+    stmt = (
+        select(m.NewsEmbedding.chunk_id, m.NewsEmbedding.embedding)
+        .join(m.NewsChunk, m.NewsEmbedding.chunk_id == m.NewsChunk.id)
+        .join(m.News, m.NewsChunk.news_id == m.News.id)
+        .where(and_(m.NewsEmbedding.embedding.isnot(None), *_time_conds(since, as_of)))
+        .execution_options(yield_per=batch_size)
+    )
+    top = StreamingTopK(q, _VECTOR_CANDIDATES, batch_size)
+    result = await db.stream(stmt)
+    async for part in result.partitions():
+        await _offload(top.add_batch, [str(chunk_id) for chunk_id, _ in part], [vec for _, vec in part])
+    hits = top.result()
+    if not hits:
+        return []
+    return await _rows_for_hits(db, hits)
+
+
+def _lexical_scores(qtext: str, rows) -> np.ndarray:
+    """BM25 scores of candidate rows from the shared index, scaled to [0, 1] for blending.
+
+    Rows the index does not have yet are scored from their content.
+    """
+    scores = get_bm25_index().score_chunks(qtext, [r["chunk_id"] for r in rows], [r.get("content") or "" for r in rows])
+    top = float(scores.max()) if scores.size else 0.0
+    return scores / top if top > 0 else scores
+
+
+async def _lexical_search(db: AsyncSession, qtext: str, *, since, as_of):
+    # top chunks straight from the BM25 index (time filters applied there),
+    # then one query for their rows; catch up with other processes' ingests first
+    index = await _offload(catch_up_bm25_index)
+    hits = index.search(qtext, as_of=as_of, since=since, k=50)
+    if not hits:
+        return []
+    return await _rows_for_hits(db, hits)
 
 
-def _metadata_fallback(db: Session, *, ticker: Optional[str], qtext: str, since, as_of):
-    from sqlalchemy import and_, select, or_
+async def _metadata_fallback(db: AsyncSession, *, ticker: Optional[str], qtext: str, since, as_of):
     # Try to find recent news by ticker first, else simple LIKE match on title/text
-    conds_time = [m.News.first_seen_at <= as_of, m.News.published_at <= as_of]
-    if since is not None:
-        conds_time.append(m.News.published_at >= since)
+    conds_time = _time_conds(since, as_of)
 
-    results = []
     if ticker:
         stmt = (
             select(m.NewsChunk, m.News)
@@ -248,20 +323,7 @@ def _metadata_fallback(db: Session, *, ticker: Optional[str], qtext: str, since,
             .order_by(m.News.published_at.desc(), m.NewsChunk.chunk_idx.asc())
             .limit(50)
         )
-        rows = db.execute(stmt).all()
-        for chunk, news in rows:
-            results.append(
-                {
-                    "chunk_id": str(chunk.id),
-                    "news_id": str(news.id),
-                    "title": news.title,
-                    "url": news.url,
-                    "published_at": news.published_at,
-                    "ticker": news.ticker,
-                    "content": chunk.content,
-                    "score": 0.0,
-                }
-            )
+        results = [_chunk_row(chunk, news) for chunk, news in (await db.execute(stmt)).all()]
         if results:
             return results
 
@@ -279,48 +341,15 @@ def _metadata_fallback(db: Session, *, ticker: Optional[str], qtext: str, since,
         .order_by(m.News.published_at.desc(), m.NewsChunk.chunk_idx.asc())
         .limit(50)
     )
-    rows = db.execute(stmt).all()
-    for chunk, news in rows:
-        results.append(
-            {
-                "chunk_id": str(chunk.id),
-                "news_id": str(news.id),
-                "title": news.title,
-                "url": news.url,
-                "published_at": news.published_at,
-                "ticker": news.ticker,
-                "content": chunk.content,
-                "score": 0.0,
-            }
-        )
-    return results
+    return [_chunk_row(chunk, news) for chunk, news in (await db.execute(stmt)).all()]
 
 
-def _latest_news_fallback(db: Session, *, since, as_of):
-    from sqlalchemy import and_, select
+async def _latest_news_fallback(db: AsyncSession, *, since, as_of):
     stmt = (
         select(m.NewsChunk, m.News)
         .join(m.News, m.NewsChunk.news_id == m.News.id)
+        .where(and_(*_time_conds(since, as_of)))
+        .order_by(m.News.published_at.desc(), m.NewsChunk.chunk_idx.asc())
+        .limit(50)
     )
-    conds = [m.News.first_seen_at <= as_of, m.News.published_at <= as_of]
-    if since is not None:
-        conds.append(m.News.published_at >= since)
-    stmt = stmt.where(and_(*conds)).order_by(m.News.published_at.desc(), m.NewsChunk.chunk_idx.asc()).limit(50)
-    rows = db.execute(stmt).all()
-    results = []
-    for chunk, news in rows:
-        results.append(
-            {
-                "chunk_id": str(chunk.id),
-                "news_id": str(news.id),
-                "title": news.title,
-                "url": news.url,
-                "published_at": news.published_at,
-                "ticker": news.ticker,
-                "content": chunk.content,
-                "score": 0.0,
-            }
-        )
-    return results
-
-
+    return [_chunk_row(chunk, news) for chunk, news in (await db.execute(stmt)).all()]
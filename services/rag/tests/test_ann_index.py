@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from app.rag.ann import IVFIndex, recall_at_k
+
+NOW = datetime(2025, 8, 26, tzinfo=timezone.utc)
+
+
+def corpus(n=4000, dim=32, topics=40, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(topics, dim))
+    vectors = centers[rng.integers(0, topics, n)] + 0.3 * rng.normal(size=(n, dim))
+    # row i is published i hours ago
+    entries = [(f"c{i}", vectors[i], NOW - timedelta(hours=i), NOW - timedelta(hours=i)) for i in range(n)]
+    return rng, vectors, entries
+
+
+def test_small_index_is_exact_and_normalizes():
+    index = IVFIndex(exact_below=100)
+    index.add_many([("a", [1.0, 0.0], NOW, NOW), ("b", [3.0, 3.0], NOW, NOW), ("c", [0.0, -2.0], NOW, NOW)])
+    assert not index.trained
+    hits = index.search(np.array([2.0, 0.0]), as_of=NOW, k=2)
+    assert [c for c, _ in hits] == ["a", "b"]
+    assert np.isclose(hits[0][1], 1.0) and np.isclose(hits[1][1], np.sqrt(0.5))
+    # duplicates, zero vectors and other dimensions are ignored
+    assert index.add_many([("a", [0.0, 1.0], NOW, NOW), ("z", [0.0, 0.0], NOW, NOW), ("w", [1.0, 0.0, 0.0], NOW, NOW)]) == 0
+    assert len(index) == 3
+
+
+def test_trained_index_recall_and_incremental_adds():
+    rng, vectors, entries = corpus()
+    index = IVFIndex(n_probe=4, exact_below=1000)
+    index.add_many(entries[:3000])
+    assert index.trained
+    index.add_many(entries[3000:])
+    assert len(index) == 4000 and sum(len(lst.view) for lst in index._lists) == 4000
+    queries = list(vectors[rng.integers(0, len(vectors), 50)] + 0.1 * rng.normal(size=(50, vectors.shape[1])))
+    assert recall_at_k(index, queries, as_of=NOW, k=10) >= 0.9
+    # an indexed vector finds itself, including one added after training
+    assert index.search(vectors[3500], as_of=NOW, k=1)[0][0] == "c3500"
+
+
+def test_time_window_post_filter():
+    rng, vectors, entries = corpus()
+    index = IVFIndex(n_probe=1, exact_below=50)
+    index.add_many(entries)
+    q = vectors[0]
+    # last 100 hours: rows 0..100; probes widen until enough of them are found
+    since = NOW - timedelta(hours=100)
+    hits = index.search(q, as_of=NOW, since=since, k=20)
+    assert len(hits) == 20
+    assert all(int(c[1:]) <= 100 for c, _ in hits)
+    assert recall_at_k(index, [q], as_of=NOW, since=since, k=20) >= 0.9
+    # nothing is visible before the oldest row
+    assert index.search(q, as_of=NOW - timedelta(hours=5000), k=5) == []
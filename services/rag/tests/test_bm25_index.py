@@ -0,0 +1,125 @@
+import math
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from app.rag import bm25, search
+from app.rag.bm25 import BM25Index, tokenize
+
+NOW = datetime(2025, 8, 26, tzinfo=timezone.utc)
+
+DOCS = [
+    "TSMC sees robust CoWoS demand 先進封裝",
+    "Apple unveils new neural engine",
+    "TSMC capex rises on AI demand demand",
+    "NVIDIA data center revenue beats",
+    "Advanced packaging capacity at TSMC doubles",
+]
+
+
+def build():
+    index = BM25Index()
+    ids = []
+    for i, text in enumerate(DOCS):
+        chunk_id = str(uuid.uuid4())
+        ids.append(chunk_id)
+        ts = NOW - timedelta(days=i * 5)
+        index.add(chunk_id, str(uuid.uuid4()), text, ts, ts)
+    return index, ids
+
+
+def brute_force(query, k1=1.2, b=0.75):
+    docs = [tokenize(d) for d in DOCS]
+    avgdl = sum(map(len, docs)) / len(docs)
+    scores = []
+    for doc in docs:
+        s = 0.0
+        for term in dict.fromkeys(tokenize(query)):
+            df = sum(1 for d in docs if term in d)
+            if not df:
+                continue
+            tf = doc.count(term)
+            idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+            s += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(doc) / avgdl))
+        scores.append(s)
+    return scores
+
+
+def test_scores_match_bm25_definition():
+    index, ids = build()
+    query = "TSMC demand 先進封裝"
+    expected = brute_force(query)
+    assert np.allclose(index.score_chunks(query, ids), expected)
+    hits = index.search(query, as_of=NOW, k=3)
+    ranked = sorted(range(len(DOCS)), key=lambda i: -expected[i])[:3]
+    assert [c for c, _ in hits] == [ids[i] for i in ranked]
+
+
+def test_time_filters_and_unknown_chunks():
+    index, ids = build()
+    # doc i is published i * 5 days ago
+    visible = index.search("tsmc", as_of=NOW - timedelta(days=7), k=10)
+    assert {c for c, _ in visible} == {ids[2], ids[4]}
+    since = index.search("tsmc", as_of=NOW, since=NOW - timedelta(days=12), k=10)
+    assert {c for c, _ in since} == {ids[0], ids[2]}
+    assert index.score_chunks("tsmc", [str(uuid.uuid4()), ids[1]]).tolist() == [0.0, 0.0]
+    assert not index.add(ids[0], "x", "duplicate", NOW, NOW)
+
+
+def test_snapshot_round_trip(tmp_path):
+    index, ids = build()
+    path = tmp_path / "bm25.npz"
+    index.save(path)
+    loaded = BM25Index.load(path)
+    assert len(loaded) == len(index)
+    for query in ("tsmc demand", "neural engine", "先進封裝"):
+        assert loaded.search(query, as_of=NOW) == index.search(query, as_of=NOW)
+    # still incremental after loading
+    new_id = str(uuid.uuid4())
+    loaded.add(new_id, "n", "TSMC TSMC TSMC", NOW, NOW)
+    assert loaded.search("tsmc", as_of=NOW, k=1)[0][0] == new_id
+
+
+def test_hybrid_rerank_skips_bm25_when_partial(monkeypatch):
+    index, ids = build()
+    monkeypatch.setattr(bm25, "_index", index)
+    # vector order: Apple first; BM25 on "tsmc demand" prefers the TSMC chunk
+    rows = [
+        {"chunk_id": ids[i], "news_id": "n", "title": DOCS[i], "content": DOCS[i], "score": score}
+        for i, score in ((1, 0.50), (2, 0.45))
+    ]
+    assert [r.title for r in search._rank_hybrid("tsmc demand", rows, 2, False)] == [DOCS[2], DOCS[1]]
+    assert [r.title for r in search._rank_hybrid("tsmc demand", rows, 2, True)] == [DOCS[1], DOCS[2]]
+
+
+def test_unindexed_candidates_are_scored_from_their_text(monkeypatch):
+    index, ids = build()
+    fresh = str(uuid.uuid4())
+    text = "TSMC demand outlook"
+    scores = index.score_chunks("tsmc demand", [ids[1], fresh], ["", text])
+    assert scores[0] == 0.0 and scores[1] > 0
+    monkeypatch.setattr(bm25, "_index", index)
+    rows = [
+        {"chunk_id": chunk_id, "news_id": "n", "title": title, "content": title, "score": 0.5}
+        for chunk_id, title in ((ids[1], DOCS[1]), (fresh, text))
+    ]
+    assert [r.title for r in search._rank_hybrid("tsmc demand", rows, 2, False)] == [text, DOCS[1]]
+
+
+def test_catch_up_reloads_only_when_the_database_is_ahead(monkeypatch):
+    index, _ = build()
+    monkeypatch.setattr(bm25, "_index", index)
+    monkeypatch.setattr(bm25, "_synced_at", -math.inf)
+    reloads = []
+    monkeypatch.setattr(bm25, "load_bm25_index", lambda: reloads.append(1) or index)
+    monkeypatch.setattr(bm25, "_count_chunks", lambda: len(index))
+    bm25.catch_up_bm25_index()
+    assert reloads == []
+    # within the interval the database is not asked again
+    monkeypatch.setattr(bm25, "_count_chunks", lambda: len(index) + 1)
+    bm25.catch_up_bm25_index()
+    assert reloads == []
+    monkeypatch.setattr(bm25, "_synced_at", -math.inf)
+    bm25.catch_up_bm25_index()
+    assert reloads == [1]
@@ -0,0 +1,30 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.db import models as m
+from app.db.session import SessionLocal
+from app.ingest.sample_loader import load_samples
+from app.rag import bm25
+
+NOW = datetime(2025, 8, 26, tzinfo=timezone.utc)
+
+
+def test_out_of_process_ingest_keeps_the_full_snapshot(tmp_path, monkeypatch):
+    load_samples()
+    path = tmp_path / "bm25.npz"
+    monkeypatch.setattr(settings, "BM25_INDEX_PATH", str(path))
+    # a fresh ingest process: nothing loaded yet
+    monkeypatch.setattr(bm25, "_index", bm25.BM25Index())
+    monkeypatch.setattr(bm25, "_loaded", False)
+
+    chunk_id = str(uuid.uuid4())
+    assert bm25.index_chunks([(chunk_id, str(uuid.uuid4()), "TSMC new fab", NOW, NOW)]) == 1
+
+    with SessionLocal() as db:
+        stored = db.execute(select(func.count(m.NewsChunk.id))).scalar()
+    snapshot = bm25.BM25Index.load(path)
+    # the run's chunk plus everything already in the database, not just the former
+    assert chunk_id in snapshot and len(snapshot) == stored + 1
@@ -0,0 +1,36 @@
+import uuid
+from datetime import datetime, timezone
+
+from app.db import crud
+from app.db.session import SessionLocal
+
+
+def news(title, published_at, url=None):
+    return {"title": title, "url": url, "published_at": published_at, "source": "test", "ticker": "TSM", "text": title}
+
+
+def test_undated_news_without_url_is_not_duplicated():
+    title = f"undated {uuid.uuid4()}"
+    with SessionLocal() as db:
+        try:
+            first = crud.bulk_upsert_news(db, [news(title, None)])
+            again = crud.bulk_upsert_news(db, [news(title, None), news(title, None)])
+            assert again == first * 2
+            # a dated article with the same title is a different row
+            dated = crud.bulk_upsert_news(db, [news(title, datetime(2025, 8, 25, 8, tzinfo=timezone.utc))])
+            assert dated != first
+        finally:
+            db.rollback()
+
+
+def test_naive_published_at_matches_stored_row():
+    title = f"naive {uuid.uuid4()}"
+    with SessionLocal() as db:
+        try:
+            first = crud.bulk_upsert_news(db, [news(title, datetime(2025, 8, 25, 8, 0))])
+            # stored as timestamptz; the naive value is read back as UTC and matched
+            again = crud.bulk_upsert_news(db, [news(title, datetime(2025, 8, 25, 8, 0))])
+            aware = crud.bulk_upsert_news(db, [news(title, datetime(2025, 8, 25, 8, 0, tzinfo=timezone.utc))])
+            assert again == first and aware == first
+        finally:
+            db.rollback()
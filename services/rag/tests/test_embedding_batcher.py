@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from app.rag import batcher as batcher_module
+from app.rag.batcher import EmbeddingBatcher
+
+
+@pytest.fixture(autouse=True)
+def four_chars_per_token(monkeypatch):
+    # keep budgets independent of whether tiktoken is installed
+    monkeypatch.setattr(batcher_module, "count_tokens", lambda text: len(text) // 4)
+
+
+class RecordingEmbedder:
+    def __init__(self, backend="local"):
+        self.active_backend = backend
+        self.calls = []
+
+    def embed_chunks(self, texts):
+        self.calls.append(list(texts))
+        return np.array([[float(len(t)), 1.0] for t in texts])
+
+
+def make(backend="local", **kwargs):
+    embedder = RecordingEmbedder(backend)
+    flushed = []
+    batcher = EmbeddingBatcher(on_flush=flushed.append, embedder=embedder, **kwargs)
+    return batcher, embedder, flushed
+
+
+def test_local_batches_sorted_by_length_across_articles():
+    batcher, embedder, flushed = make(batch_size=2, pending_tokens=10**9)
+    texts = {"a": "x" * 40, "b": "x" * 4, "c": "x" * 80, "d": "x" * 12, "e": "x" * 8}
+    batcher.add_many(texts.items())
+    assert embedder.calls == [] and len(batcher) == 5
+    assert batcher.flush() == 5
+    assert [len(t) for call in embedder.calls for t in call] == [4, 8, 12, 40, 80]
+    assert [len(call) for call in embedder.calls] == [2, 2, 1]
+    # one write-back per flush, each key paired with its own vector
+    assert len(flushed) == 1
+    assert {key: vec[0] for key, vec in flushed[0]} == {k: float(len(t)) for k, t in texts.items()}
+    assert batcher.flush() == 0 and len(flushed) == 1
+
+
+def test_token_budgets_and_remote_order():
+    # 10 tokens per text
+    batcher, embedder, flushed = make(backend="openai", batch_size=100, batch_tokens=25, pending_tokens=50)
+    for i in range(6):
+        batcher.add(i, str(i) * 40)
+    # pending budget reached after the fifth text: flushed without an explicit call
+    assert [key for key, _ in flushed[0]] == [0, 1, 2, 3, 4]
+    assert [len(call) for call in embedder.calls] == [2, 2, 1]
+    batcher.flush()
+    assert [key for key, _ in flushed[1]] == [5]
+    assert batcher.calls == 4 and batcher.encoded == 6
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from app.rag.exact import StreamingTopK
+
+
+def test_streamed_batches_match_full_sort():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(1000, 16))
+    vectors[7] = 0.0  # no direction: scores 0 instead of nan
+    q = rng.normal(size=16)
+    top = StreamingTopK(q * 3.0, k=10, batch_size=128)
+    for i in range(0, len(vectors), 128):
+        top.add_batch(list(range(i, min(i + 128, len(vectors)))), vectors[i : i + 128])
+
+    norms = np.linalg.norm(vectors, axis=1)
+    expected = np.divide(vectors @ q / np.linalg.norm(q), norms, out=np.zeros(len(vectors)), where=norms > 0)
+    ranked = np.argsort(-expected)[:10]
+    hits = top.result()
+    assert [i for i, _ in hits] == ranked.tolist()
+    assert np.allclose([s for _, s in hits], expected[ranked], atol=1e-5)
+
+
+def test_fewer_rows_than_k_and_oversized_batch():
+    top = StreamingTopK(np.array([1.0, 0.0]), k=5, batch_size=2)
+    top.add_batch(["a", "b"], [np.array([0.0, 1.0]), np.array([2.0, 0.0])])
+    assert [c for c, _ in top.result()] == ["b", "a"]
+    with pytest.raises(ValueError):
+        top.add_batch(["x", "y", "z"], [np.ones(2)] * 3)
@@ -0,0 +1,57 @@
+import numpy as np
+
+from app.rag.embed import EmbeddingBackend
+from app.rag.query_cache import QueryEmbeddingCache, query_cache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+def test_lru_evicts_and_counts():
+    cache = QueryEmbeddingCache(max_entries=2)
+    key = ("local", "m", "TSM 台積電")
+    assert cache.get(key) is None
+    stored = cache.put(key, np.arange(4, dtype=float))
+    assert stored.dtype == np.float32
+    cache.put(("local", "m", "b"), np.zeros(4))
+    assert cache.get(key) is stored  # refreshes recency
+    cache.put(("local", "m", "c"), np.zeros(4))
+    assert cache.get(("local", "m", "b")) is None
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (2, 1, 2)
+
+
+def test_redis_tier_shares_entries_between_caches():
+    shared = FakeRedis()
+    first, second = QueryEmbeddingCache(redis_url="redis://x"), QueryEmbeddingCache(redis_url="redis://x")
+    first._redis = second._redis = shared
+    vec = first.put(("local", "m", "q"), np.array([0.5, 0.25]))
+    warm = second.get(("local", "m", "q"))
+    assert np.array_equal(warm, vec) and warm.dtype == np.float32
+    assert second.stats()["redis_hits"] == 1
+
+
+def test_embed_query_encodes_each_normalized_text_once(monkeypatch):
+    query_cache.clear()
+    backend = EmbeddingBackend()
+    calls = []
+    real_encode = backend._encode
+
+    def counting_encode(texts):
+        calls.append(list(texts))
+        return real_encode(texts)
+
+    monkeypatch.setattr(backend, "_encode", counting_encode)
+    first = backend.embed_query("TSM  台積電 ")
+    second = backend.embed_query("TSM 台積電")
+    assert calls == [["TSM 台積電"]]
+    assert second is first and first.dtype == np.float32
+    assert query_cache.stats()["hits"] == 1
@@ -8,3 +8,68 @@ def test_health_check():
     assert response.status_code == 200
     assert response.json() == {"status": "ok", "service": "rag"}
 
+
+
+def test_health_check_not_ready_until_warmed_up(monkeypatch):
+    from app.rag.embed import get_embedder
+
+    embedder = get_embedder()
+    monkeypatch.setattr(embedder, "ready", False)
+    with TestClient(app) as client:
+        # startup warm-up runs again and flips the embedder to ready
+        assert client.get("/healthz").status_code == 200
+        embedder.ready = False
+        response = client.get("/healthz")
+    assert response.status_code == 503
+    assert response.json() == {"status": "starting", "service": "rag"}
+
+
+def test_embedder_is_process_wide():
+    from app.rag.embed import get_embedder
+
+    embedder = get_embedder()
+    assert get_embedder() is embedder
+    embedder.warm_up()
+    assert embedder.ready and embedder._local_model is not None
+
+
+def test_failed_warm_up_is_retried_until_ready(monkeypatch):
+    import threading
+    import time
+
+    from app.core.config import settings
+    from app.rag.embed import get_embedder
+
+    embedder = get_embedder()
+    monkeypatch.setattr(embedder, "ready", False)
+    monkeypatch.setattr(settings, "EMBEDDING_WARMUP_RETRY_SECONDS", 0.01)
+    attempts = []
+    checked = threading.Event()
+    warm_up = embedder.warm_up
+
+    def flaky_warm_up():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("model download failed")
+        checked.wait(5)
+        warm_up()
+
+    monkeypatch.setattr(embedder, "warm_up", flaky_warm_up)
+    with TestClient(app) as client:
+        assert client.get("/healthz").status_code == 503
+        checked.set()
+        for _ in range(500):
+            if client.get("/healthz").status_code == 200:
+                break
+            time.sleep(0.01)
+        assert client.get("/healthz").status_code == 200
+    assert len(attempts) == 2
+
+
+def test_lazy_encode_marks_embedder_ready(monkeypatch):
+    from app.rag.embed import get_embedder
+
+    embedder = get_embedder()
+    monkeypatch.setattr(embedder, "ready", False)
+    embedder.embed_chunks(["first query"])
+    assert embedder.ready
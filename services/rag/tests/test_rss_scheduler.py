@@ -0,0 +1,168 @@
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.ingest.rss_scheduler import RSSScheduler, parse_feed_specs
+
+
+def rss(*items):
+    body = "".join(
+        f"<item><title>{title}</title><link>{link}</link>"
+        f"<pubDate>Mon, 25 Aug 2025 08:00:00 GMT</pubDate><description>{title} news</description></item>"
+        for title, link in items
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>{body}</channel></rss>'.encode()
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, rows):
+        self.calls.append([row["url"] for row in rows])
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_file_feeds_dedupe_and_skip_unchanged(tmp_path):
+    a, b = tmp_path / "a.xml", tmp_path / "b.xml"
+    a.write_bytes(rss(("TSMC capex", "https://n/1"), ("Apple chip", "https://n/2")))
+    b.write_bytes(rss(("Apple chip", "https://n/2"), ("NVIDIA revenue", "https://n/3")))
+    ingest = Recorder()
+    scheduler = RSSScheduler([a.as_uri(), b.as_uri()], ingest=ingest)
+
+    stats = await scheduler.run_once(only_due=False)
+    assert stats == {"feeds": 2, "changed": 2, "entries": 3}
+    assert sorted(ingest.calls[0]) == ["https://n/1", "https://n/2", "https://n/3"]
+
+    # unchanged files are not re-read, so nothing reaches the database
+    stats = await scheduler.run_once(only_due=False)
+    assert stats == {"feeds": 2, "changed": 0, "entries": 0}
+    assert len(ingest.calls) == 1
+
+    # a changed feed only contributes entries not ingested before
+    a.write_bytes(rss(("TSMC capex", "https://n/1"), ("TSMC 2nm", "https://n/4"), ("x", "https://n/5")))
+    stats = await scheduler.run_once(only_due=False)
+    assert stats["changed"] == 1
+    assert ingest.calls[1] == ["https://n/4", "https://n/5"]
+
+
+@pytest.mark.asyncio
+async def test_failed_ingest_is_retried_on_the_next_fetch(tmp_path):
+    feed = tmp_path / "a.xml"
+    feed.write_bytes(rss(("TSMC capex", "https://n/1"), ("Apple chip", "https://n/2")))
+    calls = []
+
+    def flaky_ingest(rows):
+        calls.append(sorted(row["url"] for row in rows))
+        if len(calls) == 1:
+            raise RuntimeError("database unavailable")
+
+    scheduler = RSSScheduler([feed.as_uri()], ingest=flaky_ingest)
+    with pytest.raises(RuntimeError):
+        await scheduler.run_once(only_due=False)
+    state = scheduler.feeds[feed.as_uri()]
+    assert state.etag is None and state.pending is None
+
+    # the file is unchanged, but its validator was never committed: fetched and ingested again
+    assert await scheduler.run_once(only_due=False) == {"feeds": 1, "changed": 1, "entries": 2}
+    assert calls == [["https://n/1", "https://n/2"]] * 2
+    assert (await scheduler.run_once(only_due=False))["changed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_local_http_feed_conditional_requests():
+    seen_headers = []
+    body = rss(("TSMC capex", "https://n/1"))
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            seen_headers.append(self.headers.get("If-None-Match"))
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    ingest = Recorder()
+    scheduler = RSSScheduler([f"http://127.0.0.1:{server.server_port}/feed.xml"], ingest=ingest)
+    try:
+        assert (await scheduler.run_once(only_due=False))["entries"] == 1
+        assert (await scheduler.run_once(only_due=False))["changed"] == 0
+    finally:
+        await scheduler.aclose()
+        server.shutdown()
+        server.server_close()
+    assert seen_headers == [None, '"v1"']
+    state = next(iter(scheduler.feeds.values()))
+    assert (state.fetches, state.not_modified, state.errors) == (2, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_per_feed_intervals_with_jitter(tmp_path):
+    fast, slow = tmp_path / "fast.xml", tmp_path / "slow.xml"
+    fast.write_bytes(rss())
+    slow.write_bytes(rss())
+    clock = FakeClock()
+    feeds = parse_feed_specs(f"{fast.as_uri()}|60, {slow.as_uri()}|600", default_interval=900)
+    assert list(feeds.values()) == [60.0, 600.0]
+    scheduler = RSSScheduler(feeds, jitter=0.1, ingest=Recorder(), clock=clock, rng=random.Random(0))
+    fast_state, slow_state = scheduler.feeds[fast.as_uri()], scheduler.feeds[slow.as_uri()]
+    # first runs spread over one jitter window
+    assert 1000 <= fast_state.next_run <= 1006 and 1000 <= slow_state.next_run <= 1060
+
+    clock.now = 1100.0
+    assert (await scheduler.run_once())["feeds"] == 2
+    assert 1154 <= fast_state.next_run <= 1166 and 1640 <= slow_state.next_run <= 1760
+    clock.now = 1170.0
+    assert (await scheduler.run_once())["feeds"] == 1
+    assert slow_state.fetches == 1 and fast_state.fetches == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_fetch_is_counted_and_rescheduled(tmp_path):
+    clock = FakeClock()
+    scheduler = RSSScheduler([(tmp_path / "missing.xml").as_uri()], ingest=Recorder(), clock=clock)
+    assert await scheduler.run_once(only_due=False) == {"feeds": 1, "changed": 0, "entries": 0}
+    state = next(iter(scheduler.feeds.values()))
+    assert state.errors == 1 and state.next_run > clock.now
+
+
+@pytest.mark.asyncio
+async def test_undated_linkless_entries_are_ingested_once(tmp_path):
+    def feed(*titles):
+        items = "".join(f"<item><title>{t}</title><description>{t} news</description></item>" for t in titles)
+        return f'<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>{items}</channel></rss>'.encode()
+
+    path = tmp_path / "a.xml"
+    path.write_bytes(feed("TSMC capex"))
+    batches = []
+    scheduler = RSSScheduler([path.as_uri()], ingest=batches.append)
+    await scheduler.run_once(only_due=False)
+    (row,) = batches[0]
+    assert row["url"] is None and row["published_at"] is None and row["first_seen_at"] is not None
+
+    # the feed changes; the undated entry keeps its key and is not sent again
+    path.write_bytes(feed("TSMC capex", "Apple chip"))
+    assert (await scheduler.run_once(only_due=False))["entries"] == 1
+    assert [r["title"] for r in batches[1]] == ["Apple chip"]
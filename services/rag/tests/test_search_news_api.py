@@ -84,3 +84,33 @@ def test_query_without_ticker():
     assert len(data.get("results", [])) >= 1
 
 
+def test_search_news_batch():
+    load_samples()
+    as_of = datetime.now(timezone.utc)
+    with TestClient(app) as client:
+        resp = client.post("/search_news_batch", json={
+            "requests": [
+                {"ticker": "TSM", "as_of": as_of.isoformat(), "top_k": 1},
+                {"query": "Apple", "as_of": as_of.isoformat(), "top_k": 2},
+            ],
+        })
+    assert resp.status_code == 200
+    data = resp.json()
+    assert len(data["results"]) == 2
+    assert len(data["results"][0]["results"]) <= 1
+    assert len(data["results"][1]["results"]) <= 2
+
+
+
+def test_search_news_batch_expired_deadline():
+    as_of = datetime.now(timezone.utc)
+    with TestClient(app) as client:
+        resp = client.post(
+            "/search_news_batch",
+            json={"requests": [{"ticker": "TSM", "as_of": as_of.isoformat()}]},
+            headers={"X-Deadline-Ms": "0"},
+        )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["results"][0]["partial"] is True
+    assert data["results"][0]["results"] == []
@@ -0,0 +1 @@
+"""Load-generation harness; see ``python -m tools.loadtest --help``."""
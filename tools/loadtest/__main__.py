@@ -0,0 +1,157 @@
+"""Load-test the stack and print p50/p95/p99, error rate and throughput as JSON.
+
+    python -m tools.loadtest --rps 100 --duration 20 --out before.json
+    python -m tools.loadtest --stack url --gateway-url http://localhost:8000 \\
+        --market-data-url http://localhost:8001 --rag-url http://localhost:8002
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import subprocess
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+import httpx
+
+from .driver import Send, run_scenario
+from .stack import REPO_ROOT, Stack, inprocess_stack, url_stack
+from .standins import LatencyProfile
+
+SCENARIOS = ("report", "bars", "news")
+DEFAULT_TICKERS = "TSM,NVDA,AMD,INTC,AVGO,QCOM,AAPL,MSFT,GOOGL,AMZN,META,JPM,XOM,JNJ"
+
+
+def _past_weekdays(count: int, today: date) -> List[date]:
+    days: List[date] = []
+    day = today - timedelta(days=1)
+    while len(days) < max(1, count):
+        if day.weekday() < 5:
+            days.append(day)
+        day -= timedelta(days=1)
+    return days
+
+
+def _senders(stack: Stack, tickers: List[str], days: List[date]) -> Dict[str, Send]:
+    """One request factory per scenario; request ``i`` always asks for the same thing."""
+
+    def pick(i: int):
+        return tickers[i % len(tickers)], days[(i * 7) % len(days)]
+
+    async def report(i: int) -> httpx.Response:
+        ticker, day = pick(i)
+        return await stack.gateway.get("/report", params={"ticker": ticker, "as_of": f"{day.isoformat()}T00:00:00Z"})
+
+    async def bars(i: int) -> httpx.Response:
+        ticker, day = pick(i)
+        params = {
+            "ticker": ticker,
+            "start": (day - timedelta(days=90)).isoformat(),
+            "end": day.isoformat(),
+            "tf": "1d",
+            "adjust": "adj",
+        }
+        return await stack.market_data.get("/internal/bars", params=params)
+
+    async def news(i: int) -> httpx.Response:
+        ticker, day = pick(i)
+        return await stack.rag.post(
+            "/search_news", json={"query": ticker, "as_of": f"{day.isoformat()}T00:00:00Z", "top_k": 1}
+        )
+
+    return {"report": report, "bars": bars, "news": news}
+
+
+def _commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _build_stack(args: argparse.Namespace) -> Stack:
+    if args.stack == "url":
+        return url_stack(args.gateway_url, args.market_data_url, args.rag_url, timeout=args.timeout)
+    return inprocess_stack(
+        LatencyProfile(args.md_latency_ms, args.md_jitter_ms, args.error_rate),
+        LatencyProfile(args.rag_latency_ms, args.rag_jitter_ms, args.error_rate),
+        timeout=args.timeout,
+        seed=args.seed,
+        market_data_impl=args.market_data,
+    )
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    tickers = [t.strip().upper() for t in args.tickers.split(",") if t.strip()]
+    days = _past_weekdays(args.as_of_days, datetime.now(timezone.utc).date())
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    stack = _build_stack(args)
+    results: Dict[str, Any] = {}
+    try:
+        senders = _senders(stack, tickers, days)
+        for name in scenarios:
+            result = await run_scenario(name, senders[name], args.rps, args.duration, args.max_inflight)
+            results[name] = result.summary()
+    finally:
+        await stack.aclose()
+
+    config = {k: v for k, v in vars(args).items() if k != "out"}
+    return {
+        "commit": _commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "config": config,
+        "scenarios": results,
+    }
+
+
+def parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="python -m tools.loadtest", description=__doc__.splitlines()[0])
+    p.add_argument("--stack", choices=("inprocess", "url"), default="inprocess")
+    p.add_argument("--gateway-url", default="http://localhost:8000")
+    p.add_argument("--market-data-url", default="http://localhost:8001")
+    p.add_argument("--rag-url", default="http://localhost:8002")
+    p.add_argument(
+        "--market-data",
+        choices=("service", "standin"),
+        default="service",
+        help="inprocess: real market_data app over the sample parquet, or the synthetic stand-in",
+    )
+    p.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma separated: report,bars,news")
+    p.add_argument("--rps", type=float, default=50.0, help="target requests per second per scenario")
+    p.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    p.add_argument("--max-inflight", type=int, default=1000)
+    p.add_argument("--timeout", type=float, default=30.0)
+    p.add_argument("--tickers", default=DEFAULT_TICKERS)
+    p.add_argument("--as-of-days", type=int, default=20, help="distinct past weekdays used as as_of")
+    p.add_argument("--md-latency-ms", type=float, default=15.0, help="market_data base latency (fetch time)")
+    p.add_argument("--md-jitter-ms", type=float, default=5.0)
+    p.add_argument("--rag-latency-ms", type=float, default=25.0, help="stand-in rag base latency")
+    p.add_argument("--rag-jitter-ms", type=float, default=10.0)
+    p.add_argument("--error-rate", type=float, default=0.0, help="injected 503 probability")
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--out", help="also write the JSON report to this file")
+    return p
+
+
+def main(argv: Any = None, write: Callable[[str], Any] = print) -> Dict[str, Any]:
+    args = parser().parse_args(argv)
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    write(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
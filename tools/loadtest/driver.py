@@ -0,0 +1,108 @@
+"""Open-loop asyncio load driver.
+
+Requests are started on a fixed schedule (``i / rps`` seconds after the
+start) whether or not earlier ones have finished, and latency is measured
+from the scheduled time, so a slow server cannot hide its queueing delay by
+slowing the client down (coordinated omission).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+# Called with the request number; returns the response.
+Send = Callable[[int], Awaitable[httpx.Response]]
+
+
+def _quantile(ordered: List[float], q: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000.0, 3)
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    target_rps: float
+    duration_s: float
+    latencies: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+    dropped: int = 0
+    elapsed_s: float = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+        sent = len(self.latencies)
+        return {
+            "target_rps": self.target_rps,
+            "duration_s": self.duration_s,
+            "requests": sent,
+            "achieved_rps": round(sent / self.elapsed_s, 2) if self.elapsed_s else 0.0,
+            "ok_rps": round((sent - self.errors) / self.elapsed_s, 2) if self.elapsed_s else 0.0,
+            "errors": self.errors,
+            "error_rate": round(self.errors / sent, 4) if sent else 0.0,
+            "dropped": self.dropped,
+            "status": {str(k): v for k, v in sorted(self.statuses.items(), key=lambda kv: str(kv[0]))},
+            "p50_ms": _ms(_quantile(ordered, 0.50)),
+            "p95_ms": _ms(_quantile(ordered, 0.95)),
+            "p99_ms": _ms(_quantile(ordered, 0.99)),
+            "max_ms": _ms(ordered[-1] if ordered else None),
+        }
+
+
+async def run_scenario(
+    name: str, send: Send, rps: float, duration_s: float, max_inflight: int = 1000
+) -> ScenarioResult:
+    """Drive ``send`` at ``rps`` for ``duration_s`` seconds.
+
+    A request that would exceed ``max_inflight`` concurrent requests is not
+    sent and is counted as ``dropped``; it means the system (or the client)
+    could not keep up with the target rate.
+    """
+    result = ScenarioResult(name=name, target_rps=rps, duration_s=duration_s)
+    total = max(1, int(rps * duration_s))
+    interval = 1.0 / rps
+    inflight = 0
+    tasks: List["asyncio.Task[None]"] = []
+    started = time.perf_counter()
+
+    async def one(i: int, scheduled: float) -> None:
+        nonlocal inflight
+        try:
+            resp = await send(i)
+            status: Any = resp.status_code
+            if resp.status_code >= 400:
+                result.errors += 1
+        except Exception as exc:  # transport errors count as errors, not crashes
+            status = type(exc).__name__
+            result.errors += 1
+        finally:
+            inflight -= 1
+        result.latencies.append(time.perf_counter() - scheduled)
+        result.statuses[status] += 1
+
+    for i in range(total):
+        scheduled = started + i * interval
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if inflight >= max_inflight:
+            result.dropped += 1
+            continue
+        inflight += 1
+        tasks.append(asyncio.create_task(one(i, scheduled)))
+
+    await asyncio.gather(*tasks)
+    result.elapsed_s = time.perf_counter() - started
+    return result
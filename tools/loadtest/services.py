@@ -0,0 +1,52 @@
+"""The real market_data app, mounted in-process for ``inprocess`` runs.
+
+``/internal/bars`` runs the checked-out handler end to end: ticker and
+window validation, the adapter's parquet store (files under the service's
+``data/sample``, or its in-memory synthetic bars for symbols without one),
+indicators and serialization. yfinance is switched off so runs are offline and
+repeatable; in its place every request first waits one ``LatencyProfile``
+service time, which stands for the remote fetch the store would make.
+
+rag has no in-process counterpart: its package is also named ``app`` and
+cannot be imported next to the gateway, and it needs Postgres. Its
+stand-in stays synthetic; drive a real rag with ``--stack url``.
+"""
+
+from __future__ import annotations
+
+import random
+from types import SimpleNamespace
+from typing import Optional
+
+from fastapi.responses import JSONResponse
+
+from .standins import LatencyProfile
+
+
+def _offline_download(*args, **kwargs):
+    raise RuntimeError("yfinance disabled for the load test")
+
+
+class _FetchLatency:
+    """ASGI wrapper: one synthetic fetch time (or a 503) before each request."""
+
+    def __init__(self, app, profile: LatencyProfile, rng: random.Random) -> None:
+        self.app = app
+        self.profile = profile
+        self.rng = rng
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"] != "/healthz":
+            if not await self.profile.wait(self.rng):
+                response = JSONResponse(status_code=503, content={"detail": "synthetic error"})
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+def market_data_service(profile: LatencyProfile, seed: Optional[int] = None):
+    from services.market_data.app.adapters import free_source
+    from services.market_data.app.main import app
+
+    free_source.yf = SimpleNamespace(download=_offline_download)
+    return _FetchLatency(app, profile, random.Random(seed))
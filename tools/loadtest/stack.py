@@ -0,0 +1,83 @@
+"""Clients for the stack under test.
+
+``inprocess`` runs the real gateway app in this process and points its
+upstream clients through ASGI transports at the real market_data app (or
+its stand-in) and the rag stand-in: no sockets, no containers, and the
+code under test is exactly what is checked out.
+``url`` drives services already listening somewhere, e.g. local uvicorn
+workers or ``make up``.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import httpx
+
+from .services import market_data_service
+from .standins import LatencyProfile, market_data_app, rag_app
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+@dataclass
+class Stack:
+    gateway: httpx.AsyncClient
+    market_data: httpx.AsyncClient
+    rag: httpx.AsyncClient
+    # closed on exit besides the three above (the gateway's own upstream clients)
+    extra: Optional[List[httpx.AsyncClient]] = None
+
+    async def aclose(self) -> None:
+        for client in [self.gateway, self.market_data, self.rag, *(self.extra or [])]:
+            await client.aclose()
+
+
+def _asgi(app, base_url: str, timeout: float) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url=base_url, timeout=timeout)
+
+
+def inprocess_stack(
+    market_data: LatencyProfile,
+    rag: LatencyProfile,
+    timeout: float = 30.0,
+    seed: Optional[int] = None,
+    market_data_impl: str = "service",
+) -> Stack:
+    """``market_data_impl``: ``service`` mounts the real app, ``standin`` the synthetic one."""
+    gateway_root = str(REPO_ROOT / "gateway")
+    if gateway_root not in sys.path:
+        sys.path.insert(0, gateway_root)
+    from app.core.http import market_data_client, rag_client  # gateway package
+    from app.main import app as gateway_app
+
+    # httpx logs every request at INFO; under load that is mostly harness overhead
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    if market_data_impl == "service":
+        md_app = market_data_service(market_data, seed=seed)
+    else:
+        md_app = market_data_app(market_data, seed=seed)
+    rag_standin = rag_app(rag, seed=seed)
+    # the gateway's pooled clients keep their retry, hedging and admission
+    # logic; only the transport underneath is swapped
+    market_data_client._client = _asgi(md_app, market_data_client.base_url, market_data_client.timeout)
+    rag_client._client = _asgi(rag_standin, rag_client.base_url, rag_client.timeout)
+    return Stack(
+        gateway=_asgi(gateway_app, "http://gateway", timeout),
+        market_data=_asgi(md_app, "http://market_data", timeout),
+        rag=_asgi(rag_standin, "http://rag", timeout),
+        extra=[market_data_client._client, rag_client._client],
+    )
+
+
+def url_stack(gateway_url: str, market_data_url: str, rag_url: str, timeout: float = 30.0) -> Stack:
+    limits = httpx.Limits(max_connections=1000, max_keepalive_connections=200)
+
+    def client(url: str) -> httpx.AsyncClient:
+        return httpx.AsyncClient(base_url=url.rstrip("/"), timeout=timeout, limits=limits)
+
+    return Stack(gateway=client(gateway_url), market_data=client(market_data_url), rag=client(rag_url))
@@ -0,0 +1,148 @@
+"""In-memory stand-ins for market_data and rag with synthetic latency.
+
+They answer with the same shapes as the real services, so the gateway runs
+its full code path (fan-out, caching, percentiles, admission) without
+network sources, parquet files or Postgres. Only the gateway's code is
+measured through them: in-process runs use the real market_data app by
+default (``services.py``), and the rag stand-in is the one part that is
+always synthetic. Latency is ``base + jitter``
+with exponentially distributed jitter, which gives the long tail real
+upstreams have; ``error_rate`` answers 503 at random.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import JSONResponse
+
+
+@dataclass
+class LatencyProfile:
+    base_ms: float = 10.0
+    jitter_ms: float = 5.0
+    error_rate: float = 0.0
+
+    async def wait(self, rng: random.Random) -> bool:
+        """Sleep one synthetic service time; False means answer with an error."""
+        delay = self.base_ms + (rng.expovariate(1.0 / self.jitter_ms) if self.jitter_ms > 0 else 0.0)
+        await asyncio.sleep(delay / 1000.0)
+        return rng.random() >= self.error_rate
+
+
+def _seed(symbol: str) -> int:
+    return int(hashlib.sha1(symbol.encode()).hexdigest()[:8], 16)
+
+
+def synthetic_bars(symbol: str, start: date, end: date) -> List[Dict[str, Any]]:
+    """Deterministic weekday bars for any symbol, so repeated runs compare equal work."""
+    seed = _seed(symbol)
+    drift = ((seed % 21) - 10) / 1000.0
+    bars = []
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            n = day.toordinal()
+            close = 50.0 + seed % 200 + (n % 97) * (1.0 + drift) + (n * seed % 13) / 10.0
+            bars.append(
+                {
+                    "ts": f"{day.isoformat()}T00:00:00Z",
+                    "open": close - 0.5,
+                    "high": close + 1.0,
+                    "low": close - 1.0,
+                    "close": close,
+                    "volume": 1_000_000 + n % 5000,
+                    "rsi14": 30.0 + (n * 7 + seed) % 40,
+                    "macd_signal": ("bullish", "neutral", "bearish")[(n + seed) % 3],
+                    "ma20_trend": ("up", "flat", "down")[(n + seed) % 3],
+                    "vol_vs_avg20": 0.5 + ((n + seed) % 10) / 10.0,
+                }
+            )
+        day += timedelta(days=1)
+    return bars
+
+
+def _as_of(value: Any) -> datetime:
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).astimezone(timezone.utc)
+
+
+def _news(query: str, as_of: datetime, top_k: int) -> Dict[str, Any]:
+    items = [
+        {
+            "doc_id": f"{query}:{as_of.date().isoformat()}:{i}",
+            "title": f"{query} headline {i}",
+            "url": None,
+            "published_at": (as_of - timedelta(hours=6 * (i + 1))).isoformat(),
+            "snippet": "",
+            "score": 1.0 / (i + 1),
+            "ticker": query,
+        }
+        for i in range(top_k)
+    ]
+    return {"as_of": as_of.isoformat(), "query": query, "top_k": top_k, "results": items, "partial": False}
+
+
+def market_data_app(profile: LatencyProfile, seed: Optional[int] = None) -> FastAPI:
+    app = FastAPI()
+    rng = random.Random(seed)
+
+    @app.get("/internal/bars")
+    async def bars(
+        ticker: str = Query(...), start: str = Query(...), end: str = Query(...), tf: str = "1d", adjust: str = "raw"
+    ):
+        if not await profile.wait(rng):
+            return JSONResponse(status_code=503, content={"detail": "synthetic error"})
+        lo, hi = date.fromisoformat(start[:10]), date.fromisoformat(end[:10])
+        symbols = [t.strip().upper() for t in ticker.split(",") if t.strip()]
+        return {
+            "as_of": f"{hi.isoformat()}T00:00:00Z",
+            "timeframe": tf,
+            "adjust": adjust,
+            "results": {s: synthetic_bars(s, lo, hi) for s in symbols},
+            "corporate_actions": [],
+            "partial": False,
+            "skipped": [],
+        }
+
+    @app.get("/healthz")
+    async def healthz():
+        return {"status": "ok", "service": "market_data-standin"}
+
+    return app
+
+
+def rag_app(profile: LatencyProfile, seed: Optional[int] = None) -> FastAPI:
+    app = FastAPI()
+    rng = random.Random(seed)
+
+    @app.post("/search_news")
+    async def search_news(request: Request):
+        body = await request.json()
+        if not await profile.wait(rng):
+            return JSONResponse(status_code=503, content={"detail": "synthetic error"})
+        query = body.get("query") or body.get("ticker") or ""
+        return _news(query, _as_of(body["as_of"]), int(body.get("top_k") or 1))
+
+    @app.post("/search_news_batch")
+    async def search_news_batch(request: Request):
+        body = await request.json()
+        if not await profile.wait(rng):
+            return JSONResponse(status_code=503, content={"detail": "synthetic error"})
+        return {
+            "results": [
+                _news(r.get("query") or r.get("ticker") or "", _as_of(r["as_of"]), int(r.get("top_k") or 1))
+                for r in body.get("requests", [])
+            ]
+        }
+
+    @app.get("/healthz")
+    async def healthz():
+        return {"status": "ok", "service": "rag-standin"}
+
+    return app
@@ -0,0 +1,69 @@
+import asyncio
+import json
+from datetime import date, datetime, timezone
+
+import httpx
+
+from tools.loadtest.__main__ import main
+from tools.loadtest.driver import run_scenario
+from tools.loadtest.stack import REPO_ROOT
+from tools.loadtest.standins import synthetic_bars
+
+
+def test_synthetic_bars_are_deterministic_weekdays():
+    first = synthetic_bars("TSM", date(2024, 1, 1), date(2024, 1, 31))
+    assert first == synthetic_bars("TSM", date(2024, 1, 1), date(2024, 1, 31))
+    assert len(first) == 23 and first != synthetic_bars("NVDA", date(2024, 1, 1), date(2024, 1, 31))
+
+
+def test_driver_counts_errors_and_drops():
+    async def send(i):
+        await asyncio.sleep(0.05)
+        return httpx.Response(503 if i % 4 == 0 else 200)
+
+    result = asyncio.run(run_scenario("x", send, rps=200, duration_s=0.2, max_inflight=5))
+    summary = result.summary()
+    assert summary["requests"] + summary["dropped"] == 40
+    assert summary["dropped"] > 0
+    assert summary["status"]["503"] == summary["errors"] > 0
+    assert summary["p50_ms"] >= 50
+
+
+def test_inprocess_run_reports_every_scenario(tmp_path):
+    out = tmp_path / "run.json"
+    report = main(
+        ["--rps", "20", "--duration", "0.5", "--seed", "1", "--md-latency-ms", "1", "--rag-latency-ms", "1",
+         "--out", str(out)],
+        write=lambda _: None,
+    )
+    assert json.loads(out.read_text()) == report
+    assert set(report["scenarios"]) == {"report", "bars", "news"}
+    for summary in report["scenarios"].values():
+        assert summary["requests"] == 10 and summary["error_rate"] == 0.0
+        assert summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"]
+
+
+def test_inprocess_market_data_is_the_real_service():
+    from services.market_data.app.adapters.free_source import FreeSourceAdapter
+    from tools.loadtest.stack import inprocess_stack
+    from tools.loadtest.standins import LatencyProfile
+
+    async def fetch():
+        stack = inprocess_stack(LatencyProfile(1, 0), LatencyProfile(1, 0), seed=1)
+        try:
+            return await stack.market_data.get(
+                "/internal/bars", params={"ticker": "AAPL", "start": "2024-01-01", "end": "2024-01-31"}
+            )
+        finally:
+            await stack.aclose()
+
+    resp = asyncio.run(fetch())
+    assert resp.status_code == 200
+    bars = resp.json()["results"]["AAPL"]
+    # served by the checked-out handler from the adapter's store, indicators included
+    sample_dir = REPO_ROOT / "services/market_data/app/data/sample"
+    stored = FreeSourceAdapter(sample_dir)._read_parquet_fallback(
+        "AAPL", "1d", start=datetime(2024, 1, 1, tzinfo=timezone.utc), end=datetime(2024, 1, 31, tzinfo=timezone.utc)
+    )
+    assert [bar["close"] for bar in bars] == stored["close"].tolist()
+    assert bars and any(bar["ma20_trend"] for bar in bars)